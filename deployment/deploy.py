@@ -32,6 +32,7 @@ def create() -> None:
             "google-adk (>=0.0.2)",
             "google-cloud-aiplatform[agent_engines] (>=1.91.0,!=1.92.0)",
             "google-genai (>=1.5.0,<2.0.0)",
+            "orjson (>=3.9.0,<4.0.0)",
             "pydantic (>=2.10.6,<3.0.0)",
             "absl-py (>=2.2.1,<3.0.0)",
             "python-dotenv (>=1.0.0,<2.0.0)",
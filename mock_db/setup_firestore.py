@@ -5,6 +5,7 @@ This creates employees, departments, leave requests, and health trends data.
 """
 
 from google.cloud import firestore
+import argparse
 import datetime
 import random
 import uuid
@@ -123,6 +124,14 @@ def create_department_stats():
     
     print(f"Created department statistics for {len(departments)} departments over 12 months")
 
+def create_latest_department_stats():
+    """Create the per-department latest stats read by get_department_leave_rates"""
+    print("Creating latest department statistics...")
+    from wellness_agent.services.db.firestore_service import FirestoreService
+    
+    count = FirestoreService().rebuild_latest_department_stats()
+    print(f"Created latest statistics for {count} departments")
+
 def create_leave_requests():
     """Create anonymized leave request data"""
     print("Creating leave requests...")
@@ -162,6 +171,7 @@ def create_leave_requests():
             "request_id": request_id,
             "department": department,
             "request_date": request_date,
+            "request_month": request_date.strftime("%Y-%m"),
             "leave_type": leave_type,
             "duration_days": duration,
             "status": random.choice(["Approved", "Pending", "Rejected"]),
@@ -172,6 +182,14 @@ def create_leave_requests():
     
     print(f"Created {300} anonymized leave requests")
 
+def create_leave_trend_summaries():
+    """Create the monthly leave trend summaries read by get_leave_trends"""
+    print("Creating leave trend summaries...")
+    from wellness_agent.services.db.firestore_service import FirestoreService
+    
+    count = FirestoreService().rebuild_leave_trend_summaries()
+    print(f"Created {count} leave trend summaries")
+
 def create_health_trends():
     """Create aggregated health trend data"""
     print("Creating health trends...")
@@ -295,13 +313,44 @@ def create_wellness_programs():
     
     print(f"Created {len(programs)} wellness programs")
 
-if __name__ == "__main__":
-    print("Setting up mock data in Firestore...")
+def backfill_existing_data():
+    """Update documents written by older versions to the fields newer queries rely on"""
+    print("Backfilling existing documents...")
+    from wellness_agent.services.db.firestore_service import FirestoreService
+    from wellness_agent.services.db.memory_service import MemoryService
+    
+    count = FirestoreService().backfill_request_months()
+    print(f"Added request_month to {count} leave requests")
     
-    create_employee_profiles()
-    create_department_stats()
-    create_leave_requests()
-    create_health_trends()
-    create_wellness_programs()
+    memory_service = MemoryService()
+    count = memory_service.backfill_session_user_id_active()
+    print(f"Added user_id_active to {count} sessions")
     
-    print("Mock data setup complete!") 
\ No newline at end of file
+    count = memory_service.backfill_symptom_log_timestamps()
+    print(f"Converted the timestamps of {count} symptom logs")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="only backfill existing documents, e.g. after upgrading; no mock data is created"
+    )
+    args = parser.parse_args()
+    
+    if args.backfill:
+        backfill_existing_data()
+        print("Backfill complete!")
+    else:
+        print("Setting up mock data in Firestore...")
+        
+        create_employee_profiles()
+        create_department_stats()
+        create_latest_department_stats()
+        create_leave_requests()
+        create_leave_trend_summaries()
+        create_health_trends()
+        create_wellness_programs()
+        backfill_existing_data()
+        
+        print("Mock data setup complete!") 
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""In-memory stand-ins for the Firestore client used by the service tests."""
+
+from datetime import datetime
+
+# Firestore orders values of different types by type; timestamps sort
+# before strings
+_TYPE_ORDER = {datetime: 0, str: 1}
+
+
+def _sort_key(value):
+    return (_TYPE_ORDER.get(type(value), -1), value)
+
+
+def _matches(value, op, expected):
+    if op == "==":
+        return value == expected
+    if op == "array_contains_any":
+        return any(item in (value or ()) for item in expected)
+    # Range filters only match values of the filter value's type
+    if type(value) is not type(expected):
+        return False
+    return value >= expected if op == ">=" else value <= expected
+
+
+class FakeSnapshot:
+    """Snapshot of a fake document."""
+
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return self._data[field]
+
+
+class FakeDocument:
+    """Document reference reading and writing a dictionary."""
+
+    def __init__(self, store, doc_id):
+        self.store = store
+        self.id = doc_id
+
+    def get(self):
+        return FakeSnapshot(self, self.store.get(self.id))
+
+    def set(self, data):
+        self.store[self.id] = dict(data)
+
+    def update(self, data):
+        self.store[self.id].update(data)
+
+
+class FakeQuery:
+    """Query supporting the filters, ordering and cursors the services use."""
+
+    def __init__(self, collection, filters=(), order=None, cursor=None, limit=None, fields=None):
+        self.collection = collection
+        self.filters = filters
+        self.order = order
+        self.cursor = cursor
+        self.count = limit
+        self.fields = fields
+
+    def _copy(self, **changes):
+        query = FakeQuery(self.collection, self.filters, self.order, self.cursor, self.count, self.fields)
+        query.__dict__.update(changes)
+        return query
+
+    def where(self, field, op, value):
+        return self._copy(filters=self.filters + ((field, op, value),))
+
+    def order_by(self, field, direction="ASCENDING"):
+        return self._copy(order=(field, direction == "DESCENDING"))
+
+    def start_after(self, snapshot):
+        return self._copy(cursor=snapshot)
+
+    def limit(self, count):
+        return self._copy(count=count)
+
+    def select(self, fields):
+        return self._copy(fields=fields)
+
+    def stream(self):
+        documents = self.collection.documents
+        doc_ids = [
+            doc_id for doc_id, data in documents.items()
+            if all(_matches(data.get(field), op, value) for field, op, value in self.filters)
+        ]
+        if self.order:
+            field, descending = self.order
+            doc_ids.sort(key=lambda doc_id: _sort_key(documents[doc_id][field]), reverse=descending)
+        if self.cursor is not None:
+            doc_ids = doc_ids[doc_ids.index(self.cursor.id) + 1:]
+        if self.count is not None:
+            doc_ids = doc_ids[:self.count]
+
+        for doc_id in doc_ids:
+            data = documents[doc_id]
+            if self.fields is not None:
+                data = {field: data[field] for field in self.fields if field in data}
+            yield FakeSnapshot(self.collection.document(doc_id), data)
+
+
+class FakeCollection(FakeQuery):
+    """Collection keeping its documents in a dictionary."""
+
+    def __init__(self):
+        super().__init__(self)
+        self.documents = {}
+
+    def document(self, doc_id):
+        return FakeDocument(self.documents, doc_id)
+
+
+class FakeBatch:
+    """Write batch applying its writes on commit."""
+
+    def __init__(self, client):
+        self.client = client
+        self.writes = []
+
+    def set(self, reference, data):
+        self.writes.append((reference.set, data))
+
+    def update(self, reference, data):
+        self.writes.append((reference.update, data))
+
+    def commit(self):
+        self.client.commits.append(len(self.writes))
+        for write, data in self.writes:
+            write(data)
+
+
+class FakeClient:
+    """Firestore client with fake collections, recording its batch commits and reads."""
+
+    def __init__(self):
+        self.collections = {}
+        self.commits = []
+        self.get_all_calls = []
+
+    def collection(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, references):
+        self.get_all_calls.append([reference.id for reference in references])
+        return [reference.get() for reference in references]
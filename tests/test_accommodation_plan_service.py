@@ -0,0 +1,119 @@
+"""Tests for the accommodation plan service."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fake_firestore import FakeClient
+from wellness_agent.services.db import accommodation_plan_service
+from wellness_agent.services.db.accommodation_plan_service import AccommodationPlanService
+
+
+class TestMockAccommodationPlans(unittest.TestCase):
+    """Test suite for the mock accommodation plan store."""
+
+    def setUp(self):
+        """Point the mock store at an empty temporary file."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "accommodation_plans.json")
+        patches = [
+            patch.dict(os.environ, {"USE_MOCK_SERVICES": "true"}),
+            patch.object(accommodation_plan_service, "_MOCK_DB_PATH", self.db_path),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        AccommodationPlanService._mock_cache = None
+        AccommodationPlanService._mock_log_entries = 0
+        self.service = AccommodationPlanService()
+
+    def tearDown(self):
+        """Drop the shared mock store so the exit-time compaction skips it."""
+        AccommodationPlanService._mock_cache = None
+        self.tmp_dir.cleanup()
+
+    def _create_plan(self):
+        return self.service.create_accommodation_plan(
+            employee_id="emp-1",
+            accommodation_types=["remote_work"],
+            duration="3 months",
+            frequency="weekly"
+        )
+
+    def test_in_place_edits_do_not_change_the_store(self):
+        """Test that plans returned by the service do not share the stored lists."""
+        plan = self._create_plan()
+        plan.accommodation_types.append("flexible_schedule")
+
+        stored = self.service.get_accommodation_plan(plan.plan_id)
+        self.assertEqual(stored.accommodation_types, ["remote_work"])
+
+        stored.accommodation_types.append("flexible_schedule")
+        self.assertEqual(
+            self.service.get_accommodation_plan(plan.plan_id).accommodation_types,
+            ["remote_work"]
+        )
+
+    def test_update_fields_and_reload(self):
+        """Test that updates survive reloading the store from its log."""
+        plan = self._create_plan()
+        self.assertTrue(self.service.update_accommodation_plan_status(plan.plan_id, "approved"))
+
+        AccommodationPlanService._mock_cache = None
+        self.assertEqual(self.service.get_accommodation_plan(plan.plan_id).status, "approved")
+
+    def test_log_is_compacted(self):
+        """Test that the write-ahead log is compacted after enough entries."""
+        with patch.object(accommodation_plan_service, "_MOCK_LOG_COMPACT_EVERY", 3):
+            plans = [self._create_plan() for _ in range(3)]
+
+        self.assertFalse(os.path.exists(self.db_path + ".wal"))
+        AccommodationPlanService._mock_cache = None
+        self.assertEqual(
+            [plan.plan_id for plan in self.service.get_accommodation_plans([p.plan_id for p in plans])],
+            [plan.plan_id for plan in plans]
+        )
+
+
+class TestFirestoreAccommodationPlans(unittest.TestCase):
+    """Test suite for accommodation plan writes to Firestore."""
+
+    def setUp(self):
+        """Create a service on a fake Firestore client."""
+        self.client = FakeClient()
+        self.plans = self.client.collection("accommodation_plans")
+        patches = [
+            patch.dict(os.environ, {"USE_MOCK_SERVICES": "false"}),
+            patch.object(accommodation_plan_service, "get_client", return_value=self.client),
+            patch.object(AccommodationPlanService, "_save_to_mock_db", side_effect=AssertionError("fell back to the mock store")),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.service = AccommodationPlanService()
+
+    def test_create_writes_to_firestore(self):
+        """Test that a created plan is written to Firestore under its ID."""
+        plan = self.service.create_accommodation_plan(
+            employee_id="emp-1",
+            accommodation_types=["remote_work"],
+            duration="3 months",
+            frequency="weekly"
+        )
+
+        self.assertEqual(list(self.plans.documents), [plan.plan_id])
+        self.assertEqual(self.plans.documents[plan.plan_id]["employee_id"], "emp-1")
+
+    def test_bulk_create_writes_to_firestore(self):
+        """Test that bulk-created plans are all written to Firestore."""
+        plans = self.service.create_accommodation_plans_bulk([
+            {"employee_id": f"emp-{i}", "accommodation_types": [], "duration": "1 month", "frequency": "daily"}
+            for i in range(3)
+        ])
+
+        self.assertEqual(sorted(self.plans.documents), sorted(plan.plan_id for plan in plans))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Tests for the in-process caching helpers."""
+
+import unittest
+
+from wellness_agent.shared_libraries.cache import TTLCache, ttl_cache
+
+
+class FakeTimer:
+    """Clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test suite for TTLCache."""
+
+    def test_expiry(self):
+        """Test that entries expire after the TTL."""
+        timer = FakeTimer()
+        cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+        cache.set("key", "value")
+        timer.now = 4.9
+        self.assertEqual(cache.get("key"), "value")
+        timer.now = 5.0
+        self.assertIsNone(cache.get("key"))
+        self.assertNotIn("key", cache)
+
+    def test_eviction(self):
+        """Test that the least recently written entry is evicted when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 3)
+        cache.set("c", 4)
+        self.assertEqual(cache.get("a"), 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 4)
+        self.assertEqual(len(cache), 2)
+
+    def test_pop_and_clear(self):
+        """Test removing entries."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.pop("a"), 1)
+        self.assertEqual(cache.pop("a", "missing"), "missing")
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class TestTTLCacheDecorator(unittest.TestCase):
+    """Test suite for the ttl_cache decorator."""
+
+    def test_results_cached_per_arguments(self):
+        """Test that results are reused for the same arguments until they expire."""
+        calls = []
+
+        @ttl_cache(maxsize=10, ttl=5)
+        def double(value, factor=2):
+            calls.append(value)
+            return value * factor
+
+        timer = FakeTimer()
+        double.cache.timer = timer
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(2, factor=3), 6)
+        self.assertEqual(calls, [2, 2])
+
+        timer.now = 5.0
+        self.assertEqual(double(2), 4)
+        self.assertEqual(calls, [2, 2, 2])
+
+        double.cache_clear()
+        double(2)
+        self.assertEqual(len(calls), 4)
+
+    def test_cache_if(self):
+        """Test that results rejected by cache_if are returned but not cached."""
+        results = [{"error": "unavailable"}, {"data": 1}, {"data": 2}]
+
+        @ttl_cache(maxsize=10, ttl=60, cache_if=lambda result: "error" not in result)
+        def fetch():
+            return results.pop(0)
+
+        self.assertEqual(fetch(), {"error": "unavailable"})
+        self.assertEqual(fetch(), {"data": 1})
+        self.assertEqual(fetch(), {"data": 1})
+
+    def test_exceptions_not_cached(self):
+        """Test that a raising call is retried and does not leave the key locked."""
+        attempts = []
+
+        @ttl_cache(maxsize=10, ttl=60)
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("transient")
+            return "ok"
+
+        with self.assertRaises(RuntimeError):
+            flaky()
+        self.assertEqual(flaky(), "ok")
+        self.assertEqual(flaky(), "ok")
+        self.assertEqual(len(attempts), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
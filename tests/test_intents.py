@@ -0,0 +1,56 @@
+"""Tests for chat intent routing."""
+
+import unittest
+
+from wellness_agent.intents import classify_confirmation, classify_intent
+
+
+class TestIntents(unittest.TestCase):
+    """Test suite for intent classification."""
+
+    def test_no_intent(self):
+        """Test that unrelated messages don't trigger a data tool."""
+        self.assertEqual(classify_intent("hello there"), (None, None))
+
+    def test_department_leave_rates(self):
+        """Test that leave rate questions route to department leave rates."""
+        self.assertEqual(
+            classify_intent("which department has the highest leave rate?"),
+            ("department_leave_rates", None)
+        )
+
+    def test_policy_type_inference(self):
+        """Test that the policy type is inferred from the message."""
+        self.assertEqual(
+            classify_intent("how many mental health days am i entitled to?"),
+            ("policy_document", "mental_health_leave")
+        )
+        self.assertEqual(
+            classify_intent("what is the remote work policy?"),
+            ("policy_document", "remote_work")
+        )
+
+    def test_table_order(self):
+        """Test that earlier intents win when several match."""
+        self.assertEqual(
+            classify_intent("show the roi in the annual wellness report"),
+            ("wellness_report", "wellness")
+        )
+
+    def test_wellness_guide(self):
+        """Test that tracking requests route to the work-life balance guide."""
+        self.assertEqual(
+            classify_intent("how can i track my work-life balance?"),
+            ("wellness_guide", "work_life_balance")
+        )
+
+    def test_confirmation(self):
+        """Test detection of confirmations of earlier suggestions."""
+        previous = "would you like me to share our stress management guide?"
+        self.assertEqual(classify_confirmation("yes please", previous), "stress")
+        self.assertIsNone(classify_confirmation("tell me something else entirely", previous))
+        self.assertIsNone(classify_confirmation("yes", "how are you feeling today?"))
+
+
+if __name__ == "__main__":
+    unittest.main()
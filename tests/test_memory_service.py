@@ -0,0 +1,258 @@
+"""Tests for the memory service."""
+
+import os
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from fake_firestore import FakeClient
+from wellness_agent.db.models import Session, SymptomsLog, User, WellnessTip
+from wellness_agent.services.db import memory_service
+from wellness_agent.services.db.memory_service import MemoryService
+
+
+class FirestoreTestCase(unittest.TestCase):
+    """Base class creating a service on a fake Firestore client."""
+
+    def setUp(self):
+        """Create a service on a fake Firestore client."""
+        self.client = FakeClient()
+        patches = [
+            patch.dict(os.environ, {"USE_MOCK_SERVICES": "false"}),
+            patch.object(memory_service, "get_client", return_value=self.client),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for cache in MemoryService._read_caches.values():
+            cache.clear()
+        self.service = MemoryService()
+
+
+class TestQueuedSessionStates(FirestoreTestCase):
+    """Test suite for session states queued by sync_state_to_database."""
+
+    def setUp(self):
+        """Create a service on a fake Firestore client with one saved session."""
+        super().setUp()
+        self.addCleanup(self.service.flush_session_states)
+        self.session = Session(session_id="session-1", user_id="user-1", user_role="employee")
+        self.session.state = {"session_id": "session-1", "step": "start"}
+        self.assertTrue(self.service.save_session(self.session))
+
+    def _stored_state(self):
+        return self.client.collection("sessions").documents["session-1"]["state"]
+
+    def test_queued_state_is_read_and_flushed(self):
+        """Test that a queued state is returned right away and written on flush."""
+        self.service.sync_state_to_database({"session_id": "session-1", "step": "queued"})
+        self.assertEqual(self.service.get_session("session-1").state["step"], "queued")
+        self.assertEqual(self._stored_state()["step"], "start")
+
+        self.assertTrue(self.service.flush_session_states())
+        self.assertEqual(self._stored_state()["step"], "queued")
+
+    def test_saved_session_replaces_queued_state(self):
+        """Test that saving a session drops the state queued before it."""
+        self.service.sync_state_to_database({"session_id": "session-1", "step": "queued"})
+        session = self.service.get_session("session-1")
+        session.state = {"session_id": "session-1", "step": "saved"}
+        self.assertTrue(self.service.save_session(session))
+
+        self.assertEqual(self.service.get_session("session-1").state["step"], "saved")
+        self.service.flush_session_states()
+        self.assertEqual(self._stored_state()["step"], "saved")
+
+    def test_appended_messages_replace_queued_state(self):
+        """Test that appending messages writes the session's state over the queued one."""
+        self.service.sync_state_to_database({"session_id": "session-1", "step": "queued"})
+        self.assertTrue(self.service.append_session_messages(self.session, []))
+
+        self.assertEqual(self.service.get_session("session-1").state["step"], "start")
+        self.service.flush_session_states()
+        self.assertEqual(self._stored_state()["step"], "start")
+
+    def test_state_queued_during_flush_is_kept(self):
+        """Test that a state queued while a flush writes is written by the next flush."""
+        self.service.sync_state_to_database({"session_id": "session-1", "step": "first"})
+        write_entities = self.service._write_entities
+
+        def write_and_queue(entities):
+            write_entities(entities)
+            self.service.sync_state_to_database({"session_id": "session-1", "step": "second"})
+
+        with patch.object(self.service, "_write_entities", side_effect=write_and_queue):
+            self.service.flush_session_states()
+        self.assertEqual(self._stored_state()["step"], "first")
+        self.assertEqual(self.service.get_session("session-1").state["step"], "second")
+
+        self.service.flush_session_states()
+        self.assertEqual(self._stored_state()["step"], "second")
+
+    def test_save_without_queued_state_skips_flush_lock(self):
+        """Test that saving a session with no queued state does not wait for a flush."""
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_flush_lock():
+            with self.service._session_flush_lock:
+                locked.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold_flush_lock)
+        holder.start()
+        self.addCleanup(holder.join)
+        self.addCleanup(release.set)
+        locked.wait(5)
+
+        saver = threading.Thread(target=self.service.save_session, args=(self.session,))
+        saver.start()
+        saver.join(1)
+        self.assertFalse(saver.is_alive())
+
+
+
+class TestFirestoreBatching(FirestoreTestCase):
+    """Test suite for batched Firestore reads and writes."""
+
+    def test_bulk_save_splits_batches(self):
+        """Test that bulk saves commit at most 500 writes per batch."""
+        tips = [WellnessTip(tip_id=f"tip-{i}", title="Tip", description="") for i in range(1201)]
+        self.assertTrue(self.service.bulk_save(tips))
+
+        self.assertEqual(self.client.commits, [500, 500, 201])
+        self.assertEqual(len(self.client.collection("wellness_tips").documents), 1201)
+
+    def test_get_users_reads_once(self):
+        """Test that several users are read with one get_all call and then cached."""
+        self.service.bulk_save([
+            User(user_id=user_id, role="employee", email=f"{user_id}@example.com", organization_id="org")
+            for user_id in ("user-1", "user-2")
+        ])
+
+        users = self.service.get_users(["user-2", "missing", "user-1"])
+        self.assertEqual([user.user_id for user in users], ["user-2", "user-1"])
+        self.assertEqual(self.client.get_all_calls, [["user-2", "missing", "user-1"]])
+
+        self.service.get_users(["user-1", "user-2"])
+        self.assertEqual(len(self.client.get_all_calls), 1)
+
+    def test_tips_by_category(self):
+        """Test matching tips on any category, then on symptom tags."""
+        self.service.bulk_save([
+            WellnessTip(tip_id="stretch", title="", description="", categories=["ergonomics"], symptom_tags=["back_pain"]),
+            WellnessTip(tip_id="breathe", title="", description="", categories=["stress"], symptom_tags=["anxiety"]),
+            WellnessTip(tip_id="walk", title="", description="", categories=["energy", "stress"], symptom_tags=["fatigue"]),
+        ])
+
+        tips = self.service.get_wellness_tips_by_category(["stress", "ergonomics"], limit=5)
+        self.assertEqual(sorted(tip.tip_id for tip in tips), ["breathe", "stretch", "walk"])
+
+        tips = self.service.get_wellness_tips_by_category(["stress"], symptom_tags=["fatigue"])
+        self.assertEqual([tip.tip_id for tip in tips], ["walk"])
+        self.assertEqual(self.service.get_wellness_tips_by_category([]), [])
+
+
+class TestFirestoreSymptomLogPages(FirestoreTestCase):
+    """Test suite for symptom log pages mixing string and native timestamps."""
+
+    def setUp(self):
+        """Store three logs with ISO string timestamps and three with native ones."""
+        super().setUp()
+        self.start = datetime(2024, 1, 1)
+        logs = self.client.collection("symptom_logs").documents
+        for day in range(3):
+            log = SymptomsLog(log_id=f"old-{day}", user_id="user-1", timestamp=self.start + timedelta(days=day))
+            logs[log.log_id] = log.to_dict()
+        self.service.bulk_save([
+            SymptomsLog(log_id=f"new-{day}", user_id="user-1", timestamp=self.start + timedelta(days=10 + day))
+            for day in range(3)
+        ])
+
+    def _log_ids(self, **kwargs):
+        return [log.log_id for log in self.service.get_user_symptom_logs("user-1", **kwargs)]
+
+    def test_newest_first_across_formats(self):
+        """Test that native logs come first, followed by the older string ones."""
+        self.assertEqual(
+            self._log_ids(),
+            ["new-2", "new-1", "new-0", "old-2", "old-1", "old-0"]
+        )
+
+    def test_pages_continue_across_formats(self):
+        """Test paging with after_log_id from native into string timestamps."""
+        self.assertEqual(self._log_ids(limit=2), ["new-2", "new-1"])
+        self.assertEqual(self._log_ids(limit=2, after_log_id="new-1"), ["new-0", "old-2"])
+        self.assertEqual(self._log_ids(limit=2, after_log_id="old-2"), ["old-1", "old-0"])
+        self.assertEqual(self._log_ids(limit=2, after_log_id="old-0"), [])
+
+    def test_date_range_across_formats(self):
+        """Test that date ranges match logs in both formats."""
+        self.assertEqual(
+            self._log_ids(start_date=self.start + timedelta(days=1), end_date=self.start + timedelta(days=10)),
+            ["new-0", "old-2", "old-1"]
+        )
+
+    def test_dicts_use_iso_timestamps(self):
+        """Test that dictionaries carry ISO string timestamps in both formats."""
+        log_dicts = self.service.get_user_symptom_logs("user-1", limit=4, as_dicts=True)
+        self.assertEqual(
+            [log_dict["timestamp"] for log_dict in log_dicts],
+            [(self.start + timedelta(days=day)).isoformat() for day in (12, 11, 10, 2)]
+        )
+
+    def test_backfill_converts_string_timestamps(self):
+        """Test that the backfill leaves only native timestamps, keeping the order."""
+        self.assertEqual(self.service.backfill_symptom_log_timestamps(), 3)
+        self.assertTrue(all(
+            isinstance(data["timestamp"], datetime)
+            for data in self.client.collection("symptom_logs").documents.values()
+        ))
+        self.assertEqual(self._log_ids(limit=4), ["new-2", "new-1", "new-0", "old-2"])
+
+
+class TestMockSymptomLogPages(unittest.TestCase):
+    """Test suite for symptom log pages in the mock store."""
+
+    def setUp(self):
+        """Create a mock service with five logs saved out of order."""
+        patcher = patch.dict(os.environ, {"USE_MOCK_SERVICES": "true"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = MemoryService()
+        self.start = datetime(2024, 1, 1)
+        self.service.bulk_save([
+            SymptomsLog(log_id=f"log-{day}", user_id="user-1", timestamp=self.start + timedelta(days=day))
+            for day in (3, 0, 4, 1, 2)
+        ])
+
+    def _log_ids(self, **kwargs):
+        return [log.log_id for log in self.service.get_user_symptom_logs("user-1", **kwargs)]
+
+    def test_pages(self):
+        """Test paging newest first with after_log_id."""
+        self.assertEqual(self._log_ids(limit=2), ["log-4", "log-3"])
+        self.assertEqual(self._log_ids(limit=2, after_log_id="log-3"), ["log-2", "log-1"])
+        self.assertEqual(self._log_ids(limit=2, after_log_id="log-1"), ["log-0"])
+
+    def test_date_range(self):
+        """Test that date ranges are inclusive and combine with paging."""
+        start_date = self.start + timedelta(days=1)
+        end_date = self.start + timedelta(days=3)
+        self.assertEqual(self._log_ids(start_date=start_date, end_date=end_date), ["log-3", "log-2", "log-1"])
+        self.assertEqual(
+            self._log_ids(start_date=start_date, end_date=end_date, after_log_id="log-3", limit=1),
+            ["log-2"]
+        )
+
+    def test_resaved_log_moves(self):
+        """Test that saving a log with a new timestamp updates the index."""
+        self.service.save_symptom_log(
+            SymptomsLog(log_id="log-0", user_id="user-1", timestamp=self.start + timedelta(days=5))
+        )
+        self.assertEqual(self._log_ids(), ["log-0", "log-4", "log-3", "log-2", "log-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for the ASGI middleware."""
+
+import asyncio
+import unittest
+
+from wellness_agent.middleware import PureCORSMiddleware
+
+
+async def _app(scope, receive, send):
+    """ASGI app answering every request with an empty 204."""
+    await send({"type": "http.response.start", "status": 204, "headers": [(b"x-app", b"1")]})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _request(middleware, method, headers):
+    """Send a request through the middleware and return its response start message."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "headers": headers}
+    asyncio.run(middleware(scope, receive, send))
+    return messages[0]
+
+
+class TestPureCORSMiddleware(unittest.TestCase):
+    """Test suite for PureCORSMiddleware."""
+
+    def setUp(self):
+        """Allow one origin with credentials."""
+        self.middleware = PureCORSMiddleware(
+            _app,
+            allow_origins=["http://localhost:3000"],
+            allow_credentials=True,
+            allow_methods=["GET", "POST"],
+            allow_headers=["Authorization"],
+            max_age=300
+        )
+
+    def test_allowed_preflight(self):
+        """Test that an allowed preflight is answered without reaching the app."""
+        start = _request(self.middleware, "OPTIONS", [
+            (b"origin", b"http://localhost:3000"),
+            (b"access-control-request-method", b"POST"),
+        ])
+        headers = dict(start["headers"])
+
+        self.assertEqual(start["status"], 200)
+        self.assertNotIn(b"x-app", headers)
+        self.assertEqual(headers[b"access-control-allow-methods"], b"GET, POST")
+        self.assertEqual(headers[b"access-control-allow-headers"], b"Authorization")
+        self.assertEqual(headers[b"access-control-max-age"], b"300")
+
+    def test_credentials_echo_origin(self):
+        """Test that credentialed responses echo the origin and vary on it."""
+        start = _request(self.middleware, "GET", [(b"origin", b"http://localhost:3000")])
+        headers = dict(start["headers"])
+
+        self.assertEqual(headers[b"access-control-allow-origin"], b"http://localhost:3000")
+        self.assertEqual(headers[b"vary"], b"Origin")
+        self.assertEqual(headers[b"access-control-allow-credentials"], b"true")
+
+    def test_simple_request(self):
+        """Test that CORS headers are added to the app's own response."""
+        middleware = PureCORSMiddleware(_app, allow_origins=["*"])
+        start = _request(middleware, "POST", [(b"origin", b"http://example.com")])
+        headers = dict(start["headers"])
+
+        self.assertEqual(start["status"], 204)
+        self.assertEqual(headers[b"x-app"], b"1")
+        self.assertEqual(headers[b"access-control-allow-origin"], b"*")
+        self.assertNotIn(b"vary", headers)
+
+    def test_disallowed_origin(self):
+        """Test that requests from other origins reach the app without CORS headers."""
+        for method, headers in [
+            ("GET", [(b"origin", b"http://evil.example")]),
+            ("OPTIONS", [(b"origin", b"http://evil.example"), (b"access-control-request-method", b"POST")]),
+        ]:
+            start = _request(self.middleware, method, headers)
+            self.assertEqual(start["status"], 204)
+            self.assertFalse(any(name.startswith(b"access-control-") for name, _ in start["headers"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -60,6 +60,12 @@ class AccommodationPlan:
         self.approved_by = approved_by
         self.notes = notes
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Reassigning any field invalidates the cached to_dict() result
+        if name != '_dict_cache':
+            object.__setattr__(self, '_dict_cache', None)
+        object.__setattr__(self, name, value)
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AccommodationPlan':
         """Create an AccommodationPlan instance from a dictionary."""
@@ -82,21 +88,28 @@ class AccommodationPlan:
         )
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert the AccommodationPlan instance to a dictionary."""
-        return {
-            'plan_id': self.plan_id,
-            'employee_id': self.employee_id,
-            'accommodation_types': self.accommodation_types,
-            'duration': self.duration,
-            'frequency': self.frequency,
-            'specific_days': self.specific_days,
-            'functional_limitations': self.functional_limitations,
-            'privacy_level': self.privacy_level,
-            'manager_notes': self.manager_notes,
-            'status': self.status,
-            'created_at': self.created_at,
-            'review_date': self.review_date,
-            'approved_at': self.approved_at,
-            'approved_by': self.approved_by,
-            'notes': self.notes
-        } 
\ No newline at end of file
+        """
+        Convert the AccommodationPlan instance to a dictionary.
+        
+        The dictionary is cached until a field is reassigned, so callers must
+        treat it as read-only.
+        """
+        if self._dict_cache is None:
+            self._dict_cache = {
+                'plan_id': self.plan_id,
+                'employee_id': self.employee_id,
+                'accommodation_types': self.accommodation_types,
+                'duration': self.duration,
+                'frequency': self.frequency,
+                'specific_days': self.specific_days,
+                'functional_limitations': self.functional_limitations,
+                'privacy_level': self.privacy_level,
+                'manager_notes': self.manager_notes,
+                'status': self.status,
+                'created_at': self.created_at,
+                'review_date': self.review_date,
+                'approved_at': self.approved_at,
+                'approved_by': self.approved_by,
+                'notes': self.notes
+            }
+        return self._dict_cache
@@ -4,6 +4,23 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List
 
 
+# Attribute values used for fields missing from a stored leave request
+_FIELD_DEFAULTS = {
+    'request_id': None,
+    'employee_id': None,
+    'request_type': None,
+    'start_date': None,
+    'end_date': None,
+    'disclosure_level': 'no_reason',
+    'work_impact_notes': None,
+    'status': 'pending',
+    'submitted_at': None,
+    'processed_at': None,
+    'processed_by': None,
+    'notes': None
+}
+
+
 class LeaveRequest:
     """
     Model representing a leave request in the database.
@@ -69,6 +86,21 @@ class LeaveRequest:
             notes=data.get('notes')
         )
     
+    @classmethod
+    def from_firestore_snapshot(cls, snapshot: Any) -> 'LeaveRequest':
+        """
+        Create a LeaveRequest instance from a Firestore document snapshot.
+        
+        A faster from_dict for documents this service wrote itself: the stored
+        fields are copied onto the instance without going through __init__.
+        Missing fields get their defaults, except that submitted_at stays None
+        rather than being set to the current time.
+        """
+        leave_request = cls.__new__(cls)
+        leave_request.__dict__.update(_FIELD_DEFAULTS)
+        leave_request.__dict__.update(snapshot.to_dict())
+        return leave_request
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert the LeaveRequest instance to a dictionary."""
         return {
@@ -76,6 +108,8 @@ class LeaveRequest:
             'employee_id': self.employee_id,
             'request_type': self.request_type,
             'start_date': self.start_date,
+            # Stored so monthly leave trends can group requests without parsing dates
+            'request_month': self.start_date[:7] if self.start_date else None,
             'end_date': self.end_date,
             'disclosure_level': self.disclosure_level,
             'work_impact_notes': self.work_impact_notes,
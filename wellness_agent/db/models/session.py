@@ -58,6 +58,9 @@ class Session:
             data["updated_at"] = datetime.fromisoformat(data["updated_at"])
         if "last_interaction_time" in data and isinstance(data["last_interaction_time"], str):
             data["last_interaction_time"] = datetime.fromisoformat(data["last_interaction_time"])
+        
+        # Derived query field added by the database service
+        data.pop("user_id_active", None)
             
         return cls(**data)
     
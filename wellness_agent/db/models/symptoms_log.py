@@ -43,6 +43,13 @@ class SymptomsLog:
     notes: Optional[str] = None  # Additional notes
     location: Optional[str] = None  # Work location ("office", "home", etc.)
     
+    # Fields that may be read when anonymizing; excludes user_id, free text and notes
+    ANONYMIZED_FIELDS = (
+        "log_id", "timestamp", "symptom_rating", "symptom_emoji",
+        "energy_level", "stress_level", "sleep_quality", "productivity_impact",
+        "needs_accommodation", "accommodation_type", "tags", "location"
+    )
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert the symptoms log to a dictionary for storage."""
         return {
@@ -75,6 +82,31 @@ class SymptomsLog:
             
         return cls(**data)
     
+    @classmethod
+    def anonymize_dict(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Anonymize a stored log dictionary in a single pass.
+        
+        Only ANONYMIZED_FIELDS are read, so a projection of those fields is
+        enough. The result has the same keys as to_dict() and matches what
+        anonymize() returns for the full log.
+        """
+        anon_data = {name: data.get(name) for name in cls.ANONYMIZED_FIELDS}
+        anon_data["log_id"] = f"anon_{data['log_id']}"
+        anon_data["user_id"] = "anonymous"
+        anon_data["symptom_text"] = None
+        anon_data["notes"] = None
+        anon_data["privacy_level"] = "anonymous"
+        anon_data["share_with_hr"] = True
+        anon_data["is_anonymous"] = True
+        anon_data["tags"] = list(data.get("tags") or [])
+        return anon_data
+    
+    @classmethod
+    def from_anonymized_dict(cls, data: Dict[str, Any]) -> 'SymptomsLog':
+        """Create an anonymized SymptomsLog from a projection of ANONYMIZED_FIELDS."""
+        return cls.from_dict(cls.anonymize_dict(data))
+    
     def anonymize(self) -> 'SymptomsLog':
         """
         Create an anonymized copy of this log for reporting.
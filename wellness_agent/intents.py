@@ -0,0 +1,174 @@
+"""Intent routing for the Wellness Agent chat endpoint.
+
+Maps a lowercased user message to the data tool (and its argument) that
+should be called before the message is sent to the model. Everything here
+is a pure function of the message text, so results are memoized.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+# Tool to run when the user confirms a previous suggestion
+CONFIRMATION_TOOLS = {
+    "work_life_balance": ("wellness_guide", "work_life_balance"),
+    "stress": ("wellness_guide", "stress"),
+    "mental_health": ("wellness_guide", "mental_health"),
+    "general_wellness": ("wellness_guide", "general_wellness"),
+    "leave_policy": ("policy_document", "leave"),
+    "mental_health_leave": ("policy_document", "leave"),
+}
+
+# Words that mark a short message as a confirmation
+CONFIRMATION_WORDS = ("yes", "sure", "ok", "okay", "please", "go ahead", "continue")
+
+# Intent dispatch table, checked in order. Each entry is
+# (tool, triggers, argument rules, default argument), where triggers and the
+# condition of each argument rule are alternatives of phrases that must all
+# appear in the lowercased message.
+INTENT_TABLE = (
+    ("department_leave_rates",
+     (("department leave rate",), ("highest leave rate",)),
+     (), None),
+    # Employer-specific query - ROI on wellness initiatives
+    ("wellness_report",
+     (("roi",), ("return", "investment"), ("wellness", "initiatives", "return")),
+     (), "wellness"),
+    # Employer-specific query - Compare departments
+    ("department_stats",
+     (("compare", "department"), ("metrics", "across department"), ("department", "comparison")),
+     (), 6),  # Get 6 months of data for comparison
+    # Employer-specific query - Annual wellness report
+    ("wellness_report",
+     (("annual", "wellness"), ("wellness", "report"), ("yearly", "wellness")),
+     (), "annual"),
+    ("wellness_programs",
+     (("wellness program",), ("program effectiveness",)),
+     (), None),
+    ("health_trends",
+     (("health trend",), ("stress level trend",)),
+     (((("work life",),), "work_life_balance"),
+      ((("physical",),), "physical_activity")),
+     "stress_levels"),
+    # Wellness guides and resources
+    ("wellness_guide",
+     (("stress", "resource"), ("feeling stressed",), ("mental health resources",),
+      ("wellness guide",), ("work-life balance", "track"), ("work life balance", "track"),
+      ("balance", "track"), ("track", "wellness")),
+     (((("work life",), ("work-life",), ("balance",)), "work_life_balance"),
+      ((("stress",),), "stress"),
+      ((("mental health",),), "mental_health")),
+     "general_wellness"),
+    # Listing available resources
+    ("list_resources",
+     (("available resources",), ("what resources",)),
+     (((("wellness",), ("guide",)), "wellness_guides"),
+      ((("policy",),), "policy_documents"),
+      ((("report",),), "aggregated_reports")),
+     None),
+    # Policy documents, including mental health days
+    ("policy_document",
+     (("policy",), ("leave policy",), ("mental health day",), ("mental health days",),
+      ("entitled to",), ("how many", "days"), ("time off", "mental")),
+     (((("accommodation",),), "accommodation"),
+      ((("remote",), ("work from home",)), "remote_work"),
+      ((("menstruation",), ("period",)), "menstruation_leave"),
+      ((("parental",), ("maternity",), ("paternity",)), "parental_leave"),
+      ((("sick",),), "sick_leave"),
+      ((("mental health",),), "mental_health_leave")),
+     "leave"),
+)
+
+# Every phrase the intent table looks for
+INTENT_PHRASES = frozenset(
+    phrase
+    for _, triggers, arg_rules, _ in INTENT_TABLE
+    for alternatives in (triggers, *(condition for condition, _ in arg_rules))
+    for alternative in alternatives
+    for phrase in alternative
+)
+
+# Phrases implied by each phrase, i.e. the phrases it contains (including itself)
+_IMPLIED_PHRASES = {
+    phrase: frozenset(other for other in INTENT_PHRASES if other in phrase)
+    for phrase in INTENT_PHRASES
+}
+
+# One compiled pattern for all phrases. The lookahead finds a match at every
+# position rather than only non-overlapping ones, and longer phrases come
+# first so each position reports its longest phrase; shorter phrases starting
+# there are recovered through _IMPLIED_PHRASES.
+_INTENT_PATTERN = re.compile(
+    "(?=("
+    + "|".join(re.escape(phrase) for phrase in sorted(INTENT_PHRASES, key=len, reverse=True))
+    + "))"
+)
+
+def _find_phrases(msg_low: str) -> frozenset:
+    """Find every intent phrase in a message with a single regex scan."""
+    hits = set()
+    for match in _INTENT_PATTERN.finditer(msg_low):
+        hits.update(_IMPLIED_PHRASES[match.group(1)])
+    return frozenset(hits)
+
+def _matches(alternatives: Tuple[Tuple[str, ...], ...], hits: frozenset) -> bool:
+    """Check whether all phrases of any alternative were found in the message."""
+    return any(all(phrase in hits for phrase in alternative) for alternative in alternatives)
+
+@lru_cache(maxsize=4096)
+def classify_intent(msg_low: str) -> Tuple[Optional[str], Any]:
+    """
+    Find the data tool requested by a message.
+    
+    Args:
+        msg_low: The lowercased user message
+        
+    Returns:
+        A tuple of (tool name, tool argument), or (None, None) if no tool matches
+    """
+    hits = _find_phrases(msg_low)
+    if not hits:
+        return None, None
+    
+    for tool, triggers, arg_rules, default_arg in INTENT_TABLE:
+        if _matches(triggers, hits):
+            for condition, arg in arg_rules:
+                if _matches(condition, hits):
+                    return tool, arg
+            return tool, default_arg
+    
+    return None, None
+
+@lru_cache(maxsize=1024)
+def classify_confirmation(msg_low: str, previous_assistant_msg: str) -> Optional[str]:
+    """
+    Detect a short confirmation of something the assistant suggested.
+    
+    Args:
+        msg_low: The lowercased user message
+        previous_assistant_msg: The lowercased assistant message before it
+        
+    Returns:
+        The confirmed suggestion (a key of CONFIRMATION_TOOLS, or
+        "general_policy"), or None if the message is not a confirmation
+    """
+    if len(msg_low.split()) > 3 or not any(word in msg_low for word in CONFIRMATION_WORDS):
+        return None
+    
+    if "wellness_guide_tool" in previous_assistant_msg or "guide" in previous_assistant_msg:
+        if "work-life balance" in previous_assistant_msg or "work life balance" in previous_assistant_msg:
+            return "work_life_balance"
+        if "stress" in previous_assistant_msg:
+            return "stress"
+        if "mental health" in previous_assistant_msg:
+            return "mental_health"
+        return "general_wellness"
+    
+    if "policy_document_tool" in previous_assistant_msg or "policy" in previous_assistant_msg:
+        if "leave" in previous_assistant_msg:
+            return "leave_policy"
+        if "mental health" in previous_assistant_msg:
+            return "mental_health_leave"
+        return "general_policy"
+    
+    return None
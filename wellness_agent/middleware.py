@@ -0,0 +1,107 @@
+"""ASGI middleware for the Wellness Agent server."""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+_ALL_METHODS = "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+
+class PureCORSMiddleware:
+    """
+    Minimal CORS middleware implemented directly on the ASGI interface.
+    
+    All header values are encoded once at construction, so handling a
+    request only appends pre-built (bytes, bytes) tuples to the response
+    headers. Preflight requests are answered inline without reaching the app.
+    """
+    
+    def __init__(
+        self,
+        app: Callable,
+        allow_origins: Sequence[str] = (),
+        allow_credentials: bool = False,
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        max_age: int = 600
+    ):
+        """
+        Initialize the middleware.
+        
+        Args:
+            app: The ASGI application to wrap
+            allow_origins: Allowed origins, or ["*"] for any origin
+            allow_credentials: Whether to allow credentialed requests
+            allow_methods: Allowed methods, or ["*"] for all methods
+            allow_headers: Allowed request headers, or ["*"] for any header
+            max_age: How long browsers may cache preflight responses, in seconds
+        """
+        self.app = app
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self.allow_all_headers = "*" in allow_headers
+        self.allow_credentials = allow_credentials
+        
+        methods = _ALL_METHODS if "*" in allow_methods else ", ".join(allow_methods)
+        
+        # Headers added to every CORS response, besides the allowed origin
+        self._simple_headers: List[Tuple[bytes, bytes]] = []
+        if allow_credentials:
+            self._simple_headers.append((b"access-control-allow-credentials", b"true"))
+        
+        # Headers added to every preflight response
+        self._preflight_headers: List[Tuple[bytes, bytes]] = self._simple_headers + [
+            (b"access-control-allow-methods", methods.encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"content-length", b"0"),
+        ]
+        if not self.allow_all_headers:
+            self._preflight_headers.append(
+                (b"access-control-allow-headers", ", ".join(allow_headers).encode("latin-1"))
+            )
+        
+        # Credentialed requests can't use a literal "*", so the origin is echoed back
+        self._echo_origin = allow_credentials or not self.allow_all_origins
+    
+    def _origin_headers(self, origin: bytes) -> List[Tuple[bytes, bytes]]:
+        """Build the allow-origin headers for an allowed request origin."""
+        if self._echo_origin:
+            return [(b"access-control-allow-origin", origin), (b"vary", b"Origin")]
+        return [(b"access-control-allow-origin", b"*")]
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """Handle an ASGI request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        origin: Optional[bytes] = None
+        request_method: Optional[bytes] = None
+        request_headers: Optional[bytes] = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        
+        # Not a cross-origin request, or not one we allow
+        if origin is None or not (self.allow_all_origins or origin in self.allow_origins):
+            await self.app(scope, receive, send)
+            return
+        
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = self._origin_headers(origin) + self._preflight_headers
+            if self.allow_all_headers and request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        cors_headers = self._origin_headers(origin) + self._simple_headers
+        
+        async def send_with_cors(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
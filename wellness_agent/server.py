@@ -1,25 +1,46 @@
 """FastAPI server for the Wellness Agent."""
 
 import os
-import json
+import asyncio
+import hashlib
+import itertools
 import logging
+import threading
+import time
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 from dotenv import load_dotenv
 from pathlib import Path
 
+import orjson
+
 from fastapi import FastAPI, Request, Depends, HTTPException, Body, Header
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.types import Scope
 from pydantic import BaseModel, Field
 
 from wellness_agent.agent import root_agent
+from wellness_agent.middleware import PureCORSMiddleware
+from wellness_agent.intents import CONFIRMATION_TOOLS, classify_confirmation, classify_intent
 from wellness_agent.privacy.callbacks import privacy_callback
 from wellness_agent.services.service_factory import ServiceFactory
-from wellness_agent.services.db.memory_service import MemoryService
+from wellness_agent.db.models import Session
+from wellness_agent.shared_libraries.cache import TTLCache, ttl_cache
 from wellness_agent.shared_libraries.memory import _set_initial_states
+from wellness_agent.tools.data_tools import (
+    get_department_leave_rates,
+    get_department_stats,
+    get_health_trends,
+    get_policy_document,
+    get_wellness_guide,
+    get_wellness_programs,
+    get_wellness_report,
+    list_available_resources
+)
 
 # Load environment variables
 load_dotenv()
@@ -29,22 +50,69 @@ logging_level = os.getenv("LOG_LEVEL", "INFO")
 logging.basicConfig(level=logging_level)
 logger = logging.getLogger(__name__)
 
+# Import the Gemini SDK for direct chat calls once at startup. A missing SDK
+# is reported here and turned into the chat fallback response at call time.
+USE_VERTEXAI = os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "FALSE").upper() == "TRUE"
+genai = None
+vertexai = None
+try:
+    if USE_VERTEXAI:
+        import vertexai
+        from vertexai.generative_models import GenerativeModel as VertexGenerativeModel
+    else:
+        import google.generativeai as genai
+except ImportError as e:
+    logger.warning("Gemini SDK not available: %s", e)
+
+# Secret for verifying HS256 bearer tokens; requires the "jwt" extra. Without
+# it, the simple demo token format is accepted.
+_JWT_SECRET = os.getenv("JWT_SECRET")
+if _JWT_SECRET:
+    import jwt
+
 # Initialize service factory
 service_factory = ServiceFactory()
 
-# Initialize memory service
-memory_service = MemoryService()
+# Initialize memory service (Redis-backed when REDIS_URL is set)
+memory_service = service_factory.get_memory_service()
+
+# Sessions recently read or saved by this process, serialized so concurrent
+# requests never share a Session object, so multi-turn chats skip the storage
+# read. Only safe when this process is the sole writer of its sessions, so it
+# is off with Redis, with several workers and on Cloud Run (K_SERVICE), where
+# other processes may update a session. SESSION_CACHE=true|false overrides.
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "900"))
+_single_process = (
+    not os.getenv("REDIS_URL")
+    and not os.getenv("K_SERVICE")
+    and os.getenv("WEB_CONCURRENCY", "1") == "1"
+)
+_session_cache: Optional[TTLCache] = (
+    TTLCache(maxsize=10000, ttl=SESSION_CACHE_TTL)
+    if os.getenv("SESSION_CACHE", str(_single_process)).lower() == "true"
+    else None
+)
+
+# Per session, a fingerprint of the state and the number of messages last
+# persisted by this process, so turns that leave the state unchanged only
+# append their new messages
+_persisted_sessions = TTLCache(maxsize=10000, ttl=SESSION_CACHE_TTL)
+
+# Per session, a fingerprint of the state last produced by privacy_callback,
+# so later turns whose state is unchanged can skip filtering it again
+_filtered_states = TTLCache(maxsize=10000, ttl=SESSION_CACHE_TTL)
 
 # Create the FastAPI app
 app = FastAPI(
     title="Wellness Agent API",
     description="API for the AI Wellness Agent",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware for frontend development
 app.add_middleware(
-    CORSMiddleware,
+    PureCORSMiddleware,
     allow_origins=["*"],  # In production, restrict this to your frontend domains
     allow_credentials=True,
     allow_methods=["*"],
@@ -54,9 +122,76 @@ app.add_middleware(
 # Get the directory of the frontend static files
 frontend_dir = Path(__file__).parent.parent / "frontend" / "public"
 
+# Path of the SPA entry point, resolved once at import
+_INDEX_HTML = str(frontend_dir / "index.html")
+
+# Relative URL paths of the files in the frontend build, listed once at startup
+_STATIC_FILES = frozenset(
+    file.relative_to(frontend_dir).as_posix()
+    for file in frontend_dir.rglob("*")
+    if file.is_file()
+)
+
+# index.html is served for every client-side route, so keep it in memory.
+# no-cache makes browsers revalidate with the ETag on each navigation.
+with open(_INDEX_HTML, "rb") as index_file:
+    _INDEX_BYTES = index_file.read()
+_INDEX_ETAG = '"' + hashlib.md5(_INDEX_BYTES).hexdigest() + '"'
+_INDEX_HEADERS = {"Cache-Control": "no-cache", "ETag": _INDEX_ETAG}
+
 # Mount the static files directory
 app.mount("/static", StaticFiles(directory=frontend_dir), name="static")
 
+# Data tool information included in every chat prompt
+_DATA_TOOLS_INSTRUCTIONS = """When asked about company data, please use these functionalities:
+
+For HR Managers:
+- You can access department leave rates with department_leave_rates_tool
+- You can access wellness program effectiveness with wellness_programs_tool
+- You can see health trends with health_trends_tool
+- You can retrieve policy documents with policy_document_tool
+
+For Employers:
+- You can analyze wellness ROI with wellness_report_tool
+- You can compare departments with department_stats_tool
+- You can view organization-wide trends with leave_trends_tool
+
+For Employees:
+- You can access wellness guides with wellness_guide_tool
+- You can find information about policies with policy_document_tool
+
+Always respect privacy: Never show individual employee data to HR or employers, only anonymized aggregated statistics."""
+
+# Static instructions passed once as the model's system instruction, so
+# they are not rebuilt or re-sent as part of every prompt
+_SYSTEM_INSTRUCTION = "You are a workplace wellness assistant.\n\n" + _DATA_TOOLS_INSTRUCTIONS
+
+# Prompt preamble; the user's query is appended directly after it
+_PROMPT_HEADER_TEMPLATE = "The user's role is: {user_role}.\n\nUSER QUERY: "
+
+# Headers for the known roles are rendered once at import time
+_PROMPT_HEADERS = {
+    role: _PROMPT_HEADER_TEMPLATE.format(user_role=role)
+    for role in ("employee", "hr_manager", "employer")
+}
+
+# Pre-encoded health check response
+_HEALTH_BODY = orjson.dumps({"status": "ok", "version": "0.1.0"})
+_HEALTH_ETAG = '"' + hashlib.md5(_HEALTH_BODY).hexdigest() + '"'
+_HEALTH_HEADERS = {"Cache-Control": "max-age=10", "ETag": _HEALTH_ETAG}
+
+# Short-lived cache for the database connection test
+DB_TEST_CACHE_TTL = int(os.getenv("DB_TEST_CACHE_TTL", "30"))
+_db_test_cache: tuple = (0.0, None)
+_db_test_lock = threading.Lock()
+
+# Second-resolution wall-clock timestamp shared by concurrent requests
+_last_timestamp: Tuple[int, str] = (0, "")
+
+# Gemini model shared by all chat requests, created on first use
+_gemini_model: Any = None
+_gemini_model_lock = threading.Lock()
+
 # Define request/response models
 class ChatMessage(BaseModel):
     role: str = Field(..., description="Role of the message sender (user or assistant)")
@@ -74,47 +209,100 @@ class ChatResponse(BaseModel):
     session_id: str = Field(..., description="Session ID for continuity")
     usage: Dict[str, Any] = Field({}, description="Token usage information")
 
-# Authentication dependency (simplified for demonstration)
+class BatchChatRequest(BaseModel):
+    items: List[ChatRequest] = Field(..., min_length=1, max_length=50, description="Chat requests to process together")
+
+class BatchChatResponse(BaseModel):
+    results: List[ChatResponse] = Field(..., description="Responses in request order")
+
+# User returned when no valid token is sent, resolved once from the environment
+_DEMO_USER = {
+    "user_id": os.getenv("DEMO_PROFILE_ID", "demo_profile_123"),
+    "role": "employee",
+    "organization_id": os.getenv("DEMO_ORGANIZATION_ID", "demo_org_456")
+}
+
+@lru_cache(maxsize=4096)
+def _parse_token(token: str) -> Tuple[Dict[str, Any], Optional[float]]:
+    """
+    Decode a bearer token into user info and its expiry time.
+    
+    Clients send the same token on many consecutive requests, so results are
+    cached per token; expiry is checked by the caller on every request.
+    """
+    if _JWT_SECRET:
+        claims = jwt.decode(token, key=_JWT_SECRET, algorithms=["HS256"], options={"verify_aud": False})
+        user = {
+            "user_id": claims["sub"],
+            "role": claims["role"],
+            "organization_id": claims["org_id"]
+        }
+        return user, claims.get("exp")
+    
+    # Without a JWT secret, accept the simple demo format "user_id:role:org_id"
+    parts = token.split(":")
+    
+    if len(parts) != 3:
+        raise ValueError("Invalid token format")
+    
+    return {
+        "user_id": parts[0],
+        "role": parts[1],
+        "organization_id": parts[2]
+    }, None
+
+# Authentication dependency
 async def get_current_user(authorization: Optional[str] = Header(None)) -> Dict[str, Any]:
     """
-    Simple authentication dependency.
+    Authentication dependency.
     
-    In a real implementation, this would validate a JWT token or session.
+    Validates an HS256 JWT when JWT_SECRET is set, otherwise parses the
+    simple demo token format.
     """
     if not authorization:
         # For demo purposes, use a default user
-        return {
-            "user_id": os.getenv("DEMO_PROFILE_ID", "demo_profile_123"),
-            "role": "employee",
-            "organization_id": os.getenv("DEMO_ORGANIZATION_ID", "demo_org_456")
-        }
+        return dict(_DEMO_USER)
     
-    # In a real implementation, validate the token and return user info
-    # For now, just parse a simple token format
     try:
-        # Format: "Bearer user_id:role:org_id"
+        # Format: "Bearer <token>"
         if not authorization.startswith("Bearer "):
             raise ValueError("Invalid token format")
         
-        token = authorization.replace("Bearer ", "")
-        parts = token.split(":")
+        user, expires_at = _parse_token(authorization[7:])
+        if expires_at is not None and expires_at <= time.time():
+            raise ValueError("Token has expired")
         
-        if len(parts) != 3:
-            raise ValueError("Invalid token format")
-        
-        return {
-            "user_id": parts[0],
-            "role": parts[1],
-            "organization_id": parts[2]
-        }
+        return dict(user)
     except Exception as e:
-        logger.warning(f"Authentication error: {e}")
+        logger.warning("Authentication error: %s", e)
         # Fall back to demo user
-        return {
-            "user_id": os.getenv("DEMO_PROFILE_ID", "demo_profile_123"),
-            "role": "employee",
-            "organization_id": os.getenv("DEMO_ORGANIZATION_ID", "demo_org_456")
-        }
+        return dict(_DEMO_USER)
+
+def _cached_iso_now() -> str:
+    """Return the current local time as an ISO string, rebuilt at most once a second."""
+    global _last_timestamp
+    now = int(time.time())
+    cached_second, cached_iso = _last_timestamp
+    if now != cached_second:
+        cached_iso = datetime.fromtimestamp(now).isoformat()
+        _last_timestamp = (now, cached_iso)
+    return cached_iso
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO date string; dashboards poll with the same boundaries."""
+    return datetime.fromisoformat(value)
+
+@lru_cache(maxsize=8)
+def _read_default_profile(profile_path: str) -> bytes:
+    """
+    Read a default profile file, caching its contents.
+    
+    The profile files are static for the lifetime of the process, so each
+    one is only read from disk once.
+    """
+    with open(profile_path, "rb") as file:
+        return file.read()
 
 def load_default_profile(user_role: str) -> Dict[str, Any]:
     """
@@ -134,14 +322,13 @@ def load_default_profile(user_role: str) -> Dict[str, Any]:
     else:  # Default to employee
         profile_path = "wellness_agent/db/default_profiles/employee_default.json"
     
-    # Try to load the profile
+    # Try to load the profile; parse a fresh copy since callers mutate it
     try:
-        with open(profile_path, "r") as file:
-            data = json.load(file)
-            logger.info(f"Loaded default profile for {user_role} from {profile_path}")
-            return data
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        logger.warning(f"Error loading default profile: {e}")
+        data = orjson.loads(_read_default_profile(profile_path))
+        logger.info("Loaded default profile for %s from %s", user_role, profile_path)
+        return data
+    except (FileNotFoundError, orjson.JSONDecodeError) as e:
+        logger.warning("Error loading default profile: %s", e)
         # Return minimal default data
         return {
             "user_profile": {
@@ -149,519 +336,568 @@ def load_default_profile(user_role: str) -> Dict[str, Any]:
             }
         }
 
-@app.post("/api/chat", response_model=ChatResponse)
+# Data tools used by the chat endpoint: tool name -> call with the intent's argument
+_TOOL_DISPATCH: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    "department_leave_rates": lambda arg: get_department_leave_rates(),
+    "wellness_report": lambda arg: get_wellness_report(report_type=arg),
+    "department_stats": lambda arg: get_department_stats(months=arg),
+    "wellness_programs": lambda arg: get_wellness_programs(),
+    "health_trends": lambda arg: get_health_trends(trend_type=arg),
+    "wellness_guide": lambda arg: get_wellness_guide(guide_type=arg),
+    "list_resources": lambda arg: list_available_resources(resource_type=arg),
+    "policy_document": lambda arg: get_policy_document(policy_type=arg),
+}
+
+# Data tools whose FirestoreService queries are already cached there; caching
+# them here as well would double their staleness and outlive its cache_clear()
+_SERVICE_CACHED_TOOLS = frozenset({"department_leave_rates", "department_stats", "wellness_programs"})
+
+@ttl_cache(
+    maxsize=128,
+    ttl=float(os.getenv("DATA_TOOL_CACHE_TTL", "300")),
+    cache_if=lambda result: "error" not in result
+)
+def _cached_tool_data(tool: str, arg: Any) -> Dict[str, Any]:
+    """
+    Call a data tool, caching successful results.
+    
+    The tools return slowly-changing aggregate data, so repeated questions
+    within DATA_TOOL_CACHE_TTL seconds are answered without a database call.
+    Error responses are not cached, so transient failures are retried.
+    """
+    return _TOOL_DISPATCH[tool](arg)
+
+def _fetch_tool_data(tool: str, arg: Any) -> Dict[str, Any]:
+    """Call a data tool, through the cache unless the service caches it."""
+    if tool in _SERVICE_CACHED_TOOLS:
+        return _TOOL_DISPATCH[tool](arg)
+    return _cached_tool_data(tool, arg)
+
+def _prepare_chat_turn(
+    request: ChatRequest,
+    current_user: Dict[str, Any],
+    session: Optional[Session] = None
+) -> Tuple[Session, str, str]:
+    """
+    Load the session, fetch any requested data and build the prompt for a chat turn.
+    
+    Args:
+        request: The incoming chat request
+        current_user: The authenticated user
+        session: The request's session if it was already loaded
+        
+    Returns:
+        A tuple of (session, session_id, full_prompt)
+    """
+    # Get user information
+    user_id = request.user_id or current_user["user_id"]
+    user_role = request.user_role or current_user["role"]
+    organization_id = request.organization_id or current_user["organization_id"]
+    
+    # Session management - either use existing or create new
+    session_id = request.session_id
+    
+    if session_id and not session:
+        # Try to get existing session
+        if _session_cache is not None:
+            cached = _session_cache.get(session_id)
+            session = Session.from_dict(orjson.loads(cached)) if cached else None
+        if not session:
+            session = memory_service.get_session(session_id)
+            if session:
+                _persisted_sessions.set(
+                    session_id,
+                    (_state_fingerprint(session.state or {}), len(session.conversation_history))
+                )
+    
+    if not session:
+        # Create a new session
+        session_id = str(uuid.uuid4())
+        session = memory_service.create_new_session(user_id, user_role)
+        session_id = session.session_id
+    
+        # Load default profile data for new sessions
+        default_profile = load_default_profile(user_role)
+    
+        # Use the memory module's function to properly set initial states
+        _set_initial_states(default_profile, session.state)
+    
+        logger.info("Created new session %s for user %s with role %s", session_id, user_id, user_role)
+    
+    # Build the turn's state in a single merge, without mutating the stored
+    # session state first
+    state = {
+        **(session.state or {}),
+        "user_id": user_id,
+        "user_role": user_role,
+        "organization_id": organization_id,
+        "session_id": session_id,
+        "system_time": _cached_iso_now()
+    }
+    
+    # The privacy filters only depend on the state, including the user and
+    # role merged into it, so state this process already filtered is reused
+    fingerprint = _state_fingerprint(state)
+    if fingerprint is None or _filtered_states.get(session_id) != fingerprint:
+        state = privacy_callback(state)
+        fingerprint = _state_fingerprint(state)
+    session.state = state
+    _filtered_states.set(session_id, fingerprint)
+    
+    # Record the new message in the session history
+    session.add_message(
+        role=request.messages[-1].role,
+        content=request.messages[-1].content
+    )
+    
+    # Get the latest user message
+    latest_message = request.messages[-1].content
+    msg_low = latest_message.lower()
+    
+    # Check if this is a simple confirmation of a previous suggestion
+    previous_suggestion = None
+    if len(request.messages) >= 3:  # Need at least user, assistant, user
+        previous_suggestion = classify_confirmation(
+            msg_low,
+            request.messages[-2].content.lower()
+        )
+        if previous_suggestion:
+            logger.info("Detected confirmation response to previous suggestion about: %s", previous_suggestion)
+    
+    # Detect data tool requests in the message
+    data_request = None
+    
+    # If this is a confirmation of a previous suggestion, handle accordingly;
+    # otherwise run the regular intent detection
+    if previous_suggestion:
+        tool, arg = CONFIRMATION_TOOLS.get(previous_suggestion, (None, None))
+    else:
+        tool, arg = classify_intent(msg_low)
+    
+    if tool:
+        try:
+            data_request = {
+                "tool": tool,
+                "data": _fetch_tool_data(tool, arg)
+            }
+            logger.info("Retrieved %s data (%s) from real database", tool, arg)
+        except Exception as e:
+            logger.error("Error retrieving %s data: %s", tool, e)
+    
+    # Build the prompt from the pre-rendered header for this role
+    prompt_header = _PROMPT_HEADERS.get(user_role)
+    if prompt_header is None:
+        prompt_header = _PROMPT_HEADER_TEMPLATE.format(user_role=user_role)
+    prompt_parts = [prompt_header, latest_message, "\n"]
+    
+    # Include real data if retrieved
+    if data_request:
+        prompt_parts.append(f"\n\nRESULT FROM {data_request['tool']}_tool:\n")
+    
+        # For policy documents with mental health days, highlight the specific information
+        if data_request['tool'] == "policy_document" and "mental health" in latest_message.lower():
+            prompt_parts.append("When responding, focus specifically on the mental health days information in the policy.\n\n")
+    
+            # Process content to highlight mental health days if present
+            if 'content' in data_request['data'] and isinstance(data_request['data']['content'], str):
+                content = data_request['data']['content']
+    
+                # Try to find and highlight mental health days section
+                lines = content.split('\n')
+                mental_health_content = ""
+    
+                for i, line in enumerate(lines):
+                    if "mental health" in line.lower():
+                        # Add this line and a few surrounding lines for context
+                        start = max(0, i - 2)
+                        end = min(len(lines), i + 3)
+                        mental_health_content = '\n'.join(lines[start:end])
+                        break
+    
+                # If we found relevant content, prepend it as a highlight
+                if mental_health_content:
+                    prompt_parts.append("HIGHLIGHTED SECTION ABOUT MENTAL HEALTH DAYS:\n")
+                    prompt_parts.append(mental_health_content + "\n\n")
+                    prompt_parts.append("FULL POLICY DOCUMENT:\n")
+    
+        # For wellness guides with tracking requests, highlight the tracking information
+        elif data_request['tool'] == "wellness_guide" and "track" in latest_message.lower():
+            prompt_parts.append("When responding, focus on practical ways the user can track and improve their wellness.\n\n")
+    
+            # Process content to highlight tracking information if present
+            if 'content' in data_request['data'] and isinstance(data_request['data']['content'], str):
+                content = data_request['data']['content']
+    
+                # Try to find and highlight tracking-related content
+                tracking_keywords = ["track", "monitor", "journal", "diary", "log", "record", "measure"]
+                lines = content.split('\n')
+                tracking_content = []
+    
+                for i, line in enumerate(lines):
+                    if any(keyword in line.lower() for keyword in tracking_keywords):
+                        # Add this line and a couple surrounding lines for context
+                        start = max(0, i - 1)
+                        end = min(len(lines), i + 2)
+                        tracking_content.append('\n'.join(lines[start:end]))
+    
+                # If we found relevant content, prepend it as highlights
+                if tracking_content:
+                    prompt_parts.append("HIGHLIGHTED TRACKING-RELATED SECTIONS:\n")
+                    prompt_parts.append("\n---\n".join(tracking_content) + "\n\n")
+                    prompt_parts.append("FULL GUIDE CONTENT:\n")
+    
+            # Add specific instructions for work-life balance tracking
+            if "work life balance" in latest_message.lower() or "work-life balance" in latest_message.lower():
+                prompt_parts.append("\nPresent the information as actionable steps for tracking work-life balance. Include concrete examples of tools or methods the user can use to track their balance.\n")
+    
+        # For employer-specific queries, emphasize business metrics and ROI
+        elif user_role == "employer" and data_request['tool'] in ["wellness_report", "department_stats"]:
+            prompt_parts.append("When responding, focus on the business impact, ROI, and actionable insights for leadership. The user is an employer/leader looking for organization-level data.\n\n")
+    
+            # Add specific instructions based on the type of employer query
+            if data_request['tool'] == "wellness_report" and "roi" in latest_message.lower():
+                prompt_parts.append("Analyze the ROI data in detail. Present concrete numbers and percentages about cost savings, productivity improvements, and reduced absenteeism. Compare results to industry benchmarks when available.\n\n")
+    
+            elif data_request['tool'] == "department_stats" and "compare" in latest_message.lower():
+                prompt_parts.append("Present a clear comparison between departments, highlighting top performers and areas for improvement. Suggest targeted interventions for departments with lower metrics.\n\n")
+    
+            elif "report" in latest_message.lower():
+                prompt_parts.append("Summarize the key findings from the annual report, focusing on trends, achievements, and opportunities. Include participation rates, satisfaction scores, and business impact metrics.\n\n")
+    
+        # Add the full data
+        prompt_parts.append(orjson.dumps(data_request['data'], option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode())
+        prompt_parts.append("\n\nPlease respond based on this actual data from our database. Always present the information in a clear, organized way and explain what the data means.")
+    
+        # Additional guidance for specific query types
+        if "mental health day" in latest_message.lower() or "how many" in latest_message.lower():
+            prompt_parts.append("\n\nThe user is specifically asking about entitlement or quantity. Please provide a direct and clear answer about the number or amount if this information is available in the data.")
+    else:
+        prompt_parts.append("\n\nFor data-related questions, please explain that you need to use specific tools to retrieve the data.")
+    
+    return session, session_id, "".join(prompt_parts)
+
+def _create_gemini_model() -> Any:
+    """
+    Create the Gemini model used for direct chat responses.
+    
+    Returns:
+        A Vertex AI or Google AI Studio GenerativeModel, depending on configuration
+    """
+    if USE_VERTEXAI:
+        if vertexai is None:
+            raise RuntimeError("The Vertex AI SDK (google-cloud-aiplatform) is not installed")
+        
+        # Initialize Vertex AI with project and location
+        project_id = os.getenv("GOOGLE_CLOUD_PROJECT", "")
+        location = os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
+        vertexai.init(project=project_id, location=location)
+        
+        return VertexGenerativeModel("gemini-1.5-flash", system_instruction=_SYSTEM_INSTRUCTION)
+    
+    if genai is None:
+        raise RuntimeError("The Google AI SDK (google-generativeai) is not installed")
+    
+    # Use Google AI Studio API key
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY", ""))
+    
+    return genai.GenerativeModel("gemini-1.5-flash", system_instruction=_SYSTEM_INSTRUCTION)
+
+def _get_gemini_model() -> Any:
+    """
+    Get the shared Gemini model, creating it on first use.
+    
+    SDK configuration and model construction happen once per process; the
+    lock keeps concurrent first requests from each building their own model.
+    """
+    global _gemini_model
+    if _gemini_model is None:
+        with _gemini_model_lock:
+            if _gemini_model is None:
+                _gemini_model = _create_gemini_model()
+    return _gemini_model
+
+def _generate_content(prompt: str) -> Any:
+    """Generate a (non-streaming) response from the shared Gemini model."""
+    return _get_gemini_model().generate_content(prompt)
+
+def _fallback_response(error: Exception) -> str:
+    """Build the reply sent when the Gemini call fails."""
+    return f"I'm having trouble connecting to the AI service. Please check your configuration and try again later. Error details: {str(error)}"
+
+def _finish_chat_turn(session: Session, response_text: str) -> None:
+    """
+    Record the agent's response and persist the session.
+    
+    The session state was already rebuilt by _prepare_chat_turn.
+    
+    Args:
+        session: The session for this chat turn
+        response_text: The agent's response
+    """
+    # Record the agent's response in the session history
+    session.add_message(
+        role="assistant",
+        content=response_text
+    )
+    
+    _save_session(session)
+
+def _state_fingerprint(state: Dict[str, Any]) -> Optional[int]:
+    """Fingerprint session state, ignoring the per-turn system_time."""
+    try:
+        return hash(orjson.dumps(
+            {key: value for key, value in state.items() if key != "system_time"},
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        ))
+    except orjson.JSONEncodeError:
+        return None
+
+def _save_session(session: Session) -> None:
+    """
+    Persist a session and keep the local session caches current.
+    
+    If the state is unchanged since this process last loaded or saved the
+    session, only the new messages are written.
+    """
+    fingerprint = _state_fingerprint(session.state or {})
+    persisted = _persisted_sessions.get(session.session_id)
+    
+    if fingerprint is not None and persisted is not None and persisted[0] == fingerprint:
+        saved = memory_service.append_session_messages(
+            session, session.conversation_history[persisted[1]:]
+        )
+    else:
+        saved = memory_service.save_session(session)
+    
+    if saved:
+        _persisted_sessions.set(session.session_id, (fingerprint, len(session.conversation_history)))
+        if _session_cache is not None:
+            _session_cache.set(
+                session.session_id,
+                orjson.dumps(session.to_dict(), option=orjson.OPT_NON_STR_KEYS)
+            )
+
+def _prepare_chat_batch(
+    requests: List[ChatRequest],
+    current_user: Dict[str, Any]
+) -> List[Tuple[Session, str, str]]:
+    """Prepare several chat turns, loading each distinct session only once."""
+    sessions: Dict[str, Session] = {}
+    turns = []
+    for request in requests:
+        turn = _prepare_chat_turn(request, current_user, sessions.get(request.session_id))
+        sessions[turn[1]] = turn[0]
+        turns.append(turn)
+    return turns
+
+def _finish_chat_batch(turns: List[Tuple[Session, str, str]], response_texts: List[str]) -> None:
+    """Record each response, then persist every distinct session once."""
+    sessions: Dict[str, Session] = {}
+    for (session, session_id, _), response_text in zip(turns, response_texts):
+        session.add_message(
+            role="assistant",
+            content=response_text
+        )
+        sessions[session_id] = session
+    
+    for session in sessions.values():
+        _save_session(session)
+
+def _sse_event(payload: Dict[str, Any]) -> str:
+    """Format a payload as a server-sent event."""
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
+
+def _stream_json_list(
+    head: Dict[str, Any],
+    key: str,
+    items: Iterable[Dict[str, Any]],
+    count_key: Optional[str] = None
+) -> Iterator[bytes]:
+    """
+    Yield a JSON object containing a list, one item at a time.
+    
+    Args:
+        head: Fields written before the list
+        key: Name of the list field
+        items: Dictionaries to serialize into the list
+        count_key: Optional field written after the list with the item count
+    
+    If reading the items fails, the error is logged and the object is closed
+    with an "error" field, since the response status was already sent.
+    """
+    # Reopen the serialized head object to append the list field
+    yield orjson.dumps(head)[:-1] + b',"' + key.encode() + b'":['
+    count = 0
+    try:
+        for item in items:
+            if count:
+                yield b","
+            yield orjson.dumps(item)
+            count += 1
+    except Exception as e:
+        logger.error("Error streaming %s: %s", key, e, exc_info=True)
+        yield b'],"error":' + orjson.dumps(f"Error retrieving {key}: {str(e)}") + b"}"
+        return
+    
+    if count_key:
+        yield b'],"' + count_key.encode() + b'":' + str(count).encode() + b"}"
+    else:
+        yield b"]}"
+
+@app.on_event("startup")
+async def warm_caches() -> None:
+    """Read the default profiles and set up the Gemini model before the first request needs them."""
+    for user_role in ("employee", "hr_manager", "employer"):
+        load_default_profile(user_role)
+    
+    try:
+        await asyncio.to_thread(_get_gemini_model)
+    except Exception as e:
+        # Requests retry creating the model and fall back if it still fails
+        logger.warning("Could not initialize Gemini model at startup: %s", e)
+
+@app.post("/api/chat", responses={200: {"model": ChatResponse}})
 async def chat_endpoint(
     request: ChatRequest,
     current_user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Chat with the wellness agent.
+    
+    The response is built from known-good values and returned directly, so
+    ChatResponse only documents it and is not re-validated on every call.
     """
     try:
-        # Get user information
-        user_id = request.user_id or current_user["user_id"]
-        user_role = request.user_role or current_user["role"]
-        organization_id = request.organization_id or current_user["organization_id"]
-        
-        # Session management - either use existing or create new
-        session_id = request.session_id
-        session = None
-        
-        if session_id:
-            # Try to get existing session
-            session = memory_service.get_session(session_id)
+        # Session and data tool lookups block, so keep them off the event loop
+        session, session_id, full_prompt = await asyncio.to_thread(
+            _prepare_chat_turn, request, current_user
+        )
         
-        if not session:
-            # Create a new session
-            session_id = str(uuid.uuid4())
-            session = memory_service.create_new_session(user_id, user_role)
-            session_id = session.session_id
-            
-            # Load default profile data for new sessions
-            default_profile = load_default_profile(user_role)
-            
-            # Initialize the session state with the default profile
-            if not session.state:
-                session.state = {}
-            
-            # Use the memory module's function to properly set initial states
-            _set_initial_states(default_profile, session.state)
-            
-            logger.info(f"Created new session {session_id} for user {user_id} with role {user_role}")
+        # Use a very simplified approach - direct to Gemini
+        try:
+            response = await asyncio.to_thread(_generate_content, full_prompt)
+            response_text = response.text
+        except Exception as e:
+            logger.error("Error with direct Gemini call: %s", e)
+            response_text = _fallback_response(e)
         
-        # Prepare the state with user information and session
-        state = session.state if session.state else {}
+        await asyncio.to_thread(_finish_chat_turn, session, response_text)
         
-        # Ensure basic information is in the state
-        state.update({
-            "user_id": user_id,
-            "user_role": user_role,
-            "organization_id": organization_id,
+        return ORJSONResponse({
+            "response": response_text,
             "session_id": session_id,
-            "system_time": datetime.now().isoformat()
+            "usage": {}  # In a real implementation, we would track and return token usage
         })
+    except Exception as e:
+        logger.error("Error processing chat request: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+
+@app.post("/api/chat/batch", responses={200: {"model": BatchChatResponse}})
+async def chat_batch_endpoint(
+    request: BatchChatRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+) -> ORJSONResponse:
+    """
+    Chat with the wellness agent for several requests at once.
+    
+    Each distinct session is loaded and saved once for the whole batch and the
+    prompts are generated concurrently. Results are returned in request order.
+    Items that share a session record all of their user messages before the
+    responses.
+    """
+    try:
+        turns = await asyncio.to_thread(_prepare_chat_batch, request.items, current_user)
         
-        # Record the new message in the session history
-        session.add_message(
-            role=request.messages[-1].role,
-            content=request.messages[-1].content
+        responses = await asyncio.gather(
+            *(asyncio.to_thread(_generate_content, full_prompt) for _, _, full_prompt in turns),
+            return_exceptions=True
         )
-        
-        # Apply privacy callback to state
-        state = privacy_callback(state)
-        
-        # Get the latest user message
-        latest_message = request.messages[-1].content
-        
-        # Check if this is a simple confirmation of a previous suggestion
-        is_confirmation = False
-        previous_suggestion = None
-        
-        # Look for confirmation words in a short message
-        confirmation_words = ["yes", "sure", "ok", "okay", "please", "go ahead", "continue"]
-        if len(latest_message.split()) <= 3 and any(word in latest_message.lower() for word in confirmation_words):
-            # Look at previous messages to find what was suggested
-            if len(request.messages) >= 3:  # Need at least user, assistant, user
-                previous_assistant_msg = request.messages[-2].content.lower()
-                if "wellness_guide_tool" in previous_assistant_msg or "guide" in previous_assistant_msg:
-                    is_confirmation = True
-                    if "work-life balance" in previous_assistant_msg or "work life balance" in previous_assistant_msg:
-                        previous_suggestion = "work_life_balance"
-                    elif "stress" in previous_assistant_msg:
-                        previous_suggestion = "stress"
-                    elif "mental health" in previous_assistant_msg:
-                        previous_suggestion = "mental_health"
-                    else:
-                        previous_suggestion = "general_wellness"
-                    
-                    logger.info(f"Detected confirmation response to previous suggestion about: {previous_suggestion}")
-                    
-                elif "policy_document_tool" in previous_assistant_msg or "policy" in previous_assistant_msg:
-                    is_confirmation = True
-                    if "leave" in previous_assistant_msg:
-                        previous_suggestion = "leave_policy"
-                    elif "mental health" in previous_assistant_msg:
-                        previous_suggestion = "mental_health_leave"
-                    else:
-                        previous_suggestion = "general_policy"
-                    
-                    logger.info(f"Detected confirmation response to previous suggestion about: {previous_suggestion}")
-        
-        # Detect data tool requests in the message
-        data_request = None
-        
-        # If this is a confirmation of a previous suggestion, handle accordingly
-        if is_confirmation and previous_suggestion:
-            if previous_suggestion == "work_life_balance":
-                try:
-                    from wellness_agent.tools.data_tools import get_wellness_guide
-                    data_request = {
-                        "tool": "wellness_guide",
-                        "data": get_wellness_guide(guide_type="work_life_balance")
-                    }
-                    logger.info(f"Retrieved work-life balance guide based on user confirmation")
-                except Exception as e:
-                    logger.error(f"Error retrieving work-life balance guide: {str(e)}")
-                    
-            elif previous_suggestion == "stress":
-                try:
-                    from wellness_agent.tools.data_tools import get_wellness_guide
-                    data_request = {
-                        "tool": "wellness_guide",
-                        "data": get_wellness_guide(guide_type="stress")
-                    }
-                    logger.info(f"Retrieved stress management guide based on user confirmation")
-                except Exception as e:
-                    logger.error(f"Error retrieving stress guide: {str(e)}")
-                    
-            elif previous_suggestion == "mental_health":
-                try:
-                    from wellness_agent.tools.data_tools import get_wellness_guide
-                    data_request = {
-                        "tool": "wellness_guide",
-                        "data": get_wellness_guide(guide_type="mental_health")
-                    }
-                    logger.info(f"Retrieved mental health guide based on user confirmation")
-                except Exception as e:
-                    logger.error(f"Error retrieving mental health guide: {str(e)}")
-                    
-            elif previous_suggestion == "leave_policy" or previous_suggestion == "mental_health_leave":
-                try:
-                    from wellness_agent.tools.data_tools import get_policy_document
-                    data_request = {
-                        "tool": "policy_document",
-                        "data": get_policy_document(policy_type="leave")
-                    }
-                    logger.info(f"Retrieved leave policy based on user confirmation")
-                except Exception as e:
-                    logger.error(f"Error retrieving leave policy: {str(e)}")
-                    
-            elif previous_suggestion == "general_wellness":
-                try:
-                    from wellness_agent.tools.data_tools import get_wellness_guide
-                    data_request = {
-                        "tool": "wellness_guide",
-                        "data": get_wellness_guide(guide_type="general_wellness")
-                    }
-                    logger.info(f"Retrieved general wellness guide based on user confirmation")
-                except Exception as e:
-                    logger.error(f"Error retrieving general wellness guide: {str(e)}")
-                    
-        # Continue with the regular detection logic if no confirmation was handled
-        elif "department leave rate" in latest_message.lower() or "highest leave rate" in latest_message.lower():
-            try:
-                from wellness_agent.tools.data_tools import get_department_leave_rates
-                data_request = {
-                    "tool": "department_leave_rates",
-                    "data": get_department_leave_rates()
-                }
-                logger.info("Retrieved department leave rates from real database")
-            except Exception as e:
-                logger.error(f"Error retrieving department leave rates: {str(e)}")
-                
-        # Employer-specific query - ROI on wellness initiatives
-        elif "roi" in latest_message.lower() or \
-             ("return" in latest_message.lower() and "investment" in latest_message.lower()) or \
-             ("wellness" in latest_message.lower() and "initiatives" in latest_message.lower() and "return" in latest_message.lower()):
-            try:
-                from wellness_agent.tools.data_tools import get_wellness_report
-                data_request = {
-                    "tool": "wellness_report",
-                    "data": get_wellness_report(report_type="wellness")
-                }
-                logger.info(f"Retrieved wellness ROI report for employer from real database")
-            except Exception as e:
-                logger.error(f"Error retrieving wellness ROI report: {str(e)}")
-                
-        # Employer-specific query - Compare departments
-        elif ("compare" in latest_message.lower() and "department" in latest_message.lower()) or \
-             ("metrics" in latest_message.lower() and "across department" in latest_message.lower()) or \
-             ("department" in latest_message.lower() and "comparison" in latest_message.lower()):
-            try:
-                from wellness_agent.tools.data_tools import get_department_stats
-                data_request = {
-                    "tool": "department_stats",
-                    "data": get_department_stats(months=6)  # Get 6 months of data for comparison
-                }
-                logger.info(f"Retrieved department comparison data for employer from real database")
-            except Exception as e:
-                logger.error(f"Error retrieving department comparison data: {str(e)}")
-                
-        # Employer-specific query - Annual wellness report
-        elif ("annual" in latest_message.lower() and "wellness" in latest_message.lower()) or \
-             ("wellness" in latest_message.lower() and "report" in latest_message.lower()) or \
-             ("yearly" in latest_message.lower() and "wellness" in latest_message.lower()):
-            try:
-                from wellness_agent.tools.data_tools import get_wellness_report
-                data_request = {
-                    "tool": "wellness_report",
-                    "data": get_wellness_report(report_type="annual")
-                }
-                logger.info(f"Retrieved annual wellness report for employer from real database")
-            except Exception as e:
-                logger.error(f"Error retrieving annual wellness report: {str(e)}")
-                
-        elif "wellness program" in latest_message.lower() or "program effectiveness" in latest_message.lower():
+        response_texts = []
+        for response in responses:
             try:
-                from wellness_agent.tools.data_tools import get_wellness_programs
-                data_request = {
-                    "tool": "wellness_programs",
-                    "data": get_wellness_programs()
-                }
-                logger.info("Retrieved wellness programs from real database")
+                if isinstance(response, Exception):
+                    raise response
+                response_texts.append(response.text)
             except Exception as e:
-                logger.error(f"Error retrieving wellness programs: {str(e)}")
-                
-        elif "health trend" in latest_message.lower() or "stress level trend" in latest_message.lower():
-            trend_type = "stress_levels"
-            if "work life" in latest_message.lower():
-                trend_type = "work_life_balance"
-            elif "physical" in latest_message.lower():
-                trend_type = "physical_activity"
-                
-            try:
-                from wellness_agent.tools.data_tools import get_health_trends
-                data_request = {
-                    "tool": "health_trends",
-                    "data": get_health_trends(trend_type=trend_type)
-                }
-                logger.info(f"Retrieved health trends for {trend_type} from real database")
-            except Exception as e:
-                logger.error(f"Error retrieving health trends: {str(e)}")
-
-        # Add handling for wellness guides and resources
-        elif ("stress" in latest_message.lower() and "resource" in latest_message.lower()) or \
-             "feeling stressed" in latest_message.lower() or \
-             "mental health resources" in latest_message.lower() or \
-             "wellness guide" in latest_message.lower() or \
-             ("work-life balance" in latest_message.lower() and "track" in latest_message.lower()) or \
-             ("work life balance" in latest_message.lower() and "track" in latest_message.lower()) or \
-             ("balance" in latest_message.lower() and "track" in latest_message.lower()) or \
-             ("track" in latest_message.lower() and "wellness" in latest_message.lower()):
-            
-            # Determine guide type based on the query
-            guide_type = "general_wellness"
-            
-            if "work life" in latest_message.lower() or "work-life" in latest_message.lower() or \
-               "balance" in latest_message.lower():
-                guide_type = "work_life_balance"
-                logger.info(f"Detected work-life balance tracking request: '{latest_message}'")
-            elif "stress" in latest_message.lower():
-                guide_type = "stress"
-            elif "mental health" in latest_message.lower():
-                guide_type = "mental_health"
-                
-            try:
-                from wellness_agent.tools.data_tools import get_wellness_guide
-                data_request = {
-                    "tool": "wellness_guide",
-                    "data": get_wellness_guide(guide_type=guide_type)
-                }
-                logger.info(f"Retrieved wellness guide for {guide_type} from real database")
-            except Exception as e:
-                logger.error(f"Error retrieving wellness guide: {str(e)}")
+                logger.error("Error with direct Gemini call: %s", e)
+                response_texts.append(_fallback_response(e))
         
-        # Add handling for listing available resources
-        elif "available resources" in latest_message.lower() or "what resources" in latest_message.lower():
-            resource_type = None
-            if "wellness" in latest_message.lower() or "guide" in latest_message.lower():
-                resource_type = "wellness_guides"
-            elif "policy" in latest_message.lower():
-                resource_type = "policy_documents"
-            elif "report" in latest_message.lower():
-                resource_type = "aggregated_reports"
-                
-            try:
-                from wellness_agent.tools.data_tools import list_available_resources
-                data_request = {
-                    "tool": "list_resources",
-                    "data": list_available_resources(resource_type=resource_type)
-                }
-                logger.info(f"Listed available resources with prefix {resource_type or 'all'} from real database")
-            except Exception as e:
-                logger.error(f"Error listing available resources: {str(e)}")
-                
-        # Enhanced policy detection with better recognition of mental health days
-        elif "policy" in latest_message.lower() or \
-             "leave policy" in latest_message.lower() or \
-             "mental health day" in latest_message.lower() or \
-             "mental health days" in latest_message.lower() or \
-             "entitled to" in latest_message.lower() or \
-             ("how many" in latest_message.lower() and "days" in latest_message.lower()) or \
-             ("time off" in latest_message.lower() and "mental" in latest_message.lower()):
-            
-            # Determine policy type based on the query
-            policy_type = "leave"
-            
-            if "accommodation" in latest_message.lower():
-                policy_type = "accommodation"
-            elif "remote" in latest_message.lower() or "work from home" in latest_message.lower():
-                policy_type = "remote_work"
-            # Add better handling for specific leave types
-            elif "menstruation" in latest_message.lower() or "period" in latest_message.lower():
-                policy_type = "menstruation_leave"
-            elif "parental" in latest_message.lower() or "maternity" in latest_message.lower() or "paternity" in latest_message.lower():
-                policy_type = "parental_leave"
-            elif "sick" in latest_message.lower():
-                policy_type = "sick_leave"
-            elif "mental health" in latest_message.lower():
-                policy_type = "mental_health_leave"
-            
-            # Log more detailed information about the policy request
-            logger.info(f"Detected policy request: '{latest_message}' - Using policy type: {policy_type}")
-                
-            try:
-                from wellness_agent.tools.data_tools import get_policy_document
-                data_request = {
-                    "tool": "policy_document",
-                    "data": get_policy_document(policy_type=policy_type)
-                }
-                logger.info(f"Retrieved policy document for {policy_type} from real database")
-            except Exception as e:
-                logger.error(f"Error retrieving policy document: {str(e)}")
-        
-        # Prepare data tool information for the prompt
-        data_tools_instructions = """
-        When asked about company data, please use these functionalities:
-        
-        For HR Managers:
-        - You can access department leave rates with department_leave_rates_tool
-        - You can access wellness program effectiveness with wellness_programs_tool
-        - You can see health trends with health_trends_tool
-        - You can retrieve policy documents with policy_document_tool
-        
-        For Employers:
-        - You can analyze wellness ROI with wellness_report_tool
-        - You can compare departments with department_stats_tool
-        - You can view organization-wide trends with leave_trends_tool
-        
-        For Employees:
-        - You can access wellness guides with wellness_guide_tool
-        - You can find information about policies with policy_document_tool
-        
-        Always respect privacy: Never show individual employee data to HR or employers, only anonymized aggregated statistics.
-        """
-        
-        # Build the prompt
-        full_prompt = f"""You are a workplace wellness assistant. The user's role is: {user_role}.
-        
-        {data_tools_instructions}
-        
-        USER QUERY: {latest_message}
-        """
+        await asyncio.to_thread(_finish_chat_batch, turns, response_texts)
         
-        # Include real data if retrieved
-        if data_request:
-            full_prompt += f"\n\nRESULT FROM {data_request['tool']}_tool:\n"
-            
-            # For policy documents with mental health days, highlight the specific information
-            if data_request['tool'] == "policy_document" and "mental health" in latest_message.lower():
-                full_prompt += "When responding, focus specifically on the mental health days information in the policy.\n\n"
-                
-                # Process content to highlight mental health days if present
-                if 'content' in data_request['data'] and isinstance(data_request['data']['content'], str):
-                    content = data_request['data']['content']
-                    
-                    # Try to find and highlight mental health days section
-                    lines = content.split('\n')
-                    mental_health_content = ""
-                    
-                    for i, line in enumerate(lines):
-                        if "mental health" in line.lower():
-                            # Add this line and a few surrounding lines for context
-                            start = max(0, i - 2)
-                            end = min(len(lines), i + 3)
-                            mental_health_content = '\n'.join(lines[start:end])
-                            break
-                    
-                    # If we found relevant content, prepend it as a highlight
-                    if mental_health_content:
-                        full_prompt += "HIGHLIGHTED SECTION ABOUT MENTAL HEALTH DAYS:\n"
-                        full_prompt += mental_health_content + "\n\n"
-                        full_prompt += "FULL POLICY DOCUMENT:\n"
-            
-            # For wellness guides with tracking requests, highlight the tracking information
-            elif data_request['tool'] == "wellness_guide" and "track" in latest_message.lower():
-                full_prompt += "When responding, focus on practical ways the user can track and improve their wellness.\n\n"
-                
-                # Process content to highlight tracking information if present
-                if 'content' in data_request['data'] and isinstance(data_request['data']['content'], str):
-                    content = data_request['data']['content']
-                    
-                    # Try to find and highlight tracking-related content
-                    tracking_keywords = ["track", "monitor", "journal", "diary", "log", "record", "measure"]
-                    lines = content.split('\n')
-                    tracking_content = []
-                    
-                    for i, line in enumerate(lines):
-                        if any(keyword in line.lower() for keyword in tracking_keywords):
-                            # Add this line and a couple surrounding lines for context
-                            start = max(0, i - 1)
-                            end = min(len(lines), i + 2)
-                            tracking_content.append('\n'.join(lines[start:end]))
-                    
-                    # If we found relevant content, prepend it as highlights
-                    if tracking_content:
-                        full_prompt += "HIGHLIGHTED TRACKING-RELATED SECTIONS:\n"
-                        full_prompt += "\n---\n".join(tracking_content) + "\n\n"
-                        full_prompt += "FULL GUIDE CONTENT:\n"
-                        
-                # Add specific instructions for work-life balance tracking
-                if "work life balance" in latest_message.lower() or "work-life balance" in latest_message.lower():
-                    full_prompt += "\nPresent the information as actionable steps for tracking work-life balance. Include concrete examples of tools or methods the user can use to track their balance.\n"
-            
-            # For employer-specific queries, emphasize business metrics and ROI
-            elif user_role == "employer" and data_request['tool'] in ["wellness_report", "department_stats"]:
-                full_prompt += "When responding, focus on the business impact, ROI, and actionable insights for leadership. The user is an employer/leader looking for organization-level data.\n\n"
-                
-                # Add specific instructions based on the type of employer query
-                if data_request['tool'] == "wellness_report" and "roi" in latest_message.lower():
-                    full_prompt += "Analyze the ROI data in detail. Present concrete numbers and percentages about cost savings, productivity improvements, and reduced absenteeism. Compare results to industry benchmarks when available.\n\n"
-                    
-                elif data_request['tool'] == "department_stats" and "compare" in latest_message.lower():
-                    full_prompt += "Present a clear comparison between departments, highlighting top performers and areas for improvement. Suggest targeted interventions for departments with lower metrics.\n\n"
-                    
-                elif "report" in latest_message.lower():
-                    full_prompt += "Summarize the key findings from the annual report, focusing on trends, achievements, and opportunities. Include participation rates, satisfaction scores, and business impact metrics.\n\n"
-            
-            # Add the full data
-            full_prompt += json.dumps(data_request['data'], indent=2)
-            full_prompt += "\n\nPlease respond based on this actual data from our database. Always present the information in a clear, organized way and explain what the data means."
-            
-            # Additional guidance for specific query types
-            if "mental health day" in latest_message.lower() or "how many" in latest_message.lower():
-                full_prompt += "\n\nThe user is specifically asking about entitlement or quantity. Please provide a direct and clear answer about the number or amount if this information is available in the data."
-        else:
-            full_prompt += "\n\nFor data-related questions, please explain that you need to use specific tools to retrieve the data."
+        return ORJSONResponse({
+            "results": [
+                {"response": response_text, "session_id": session_id, "usage": {}}
+                for (_, session_id, _), response_text in zip(turns, response_texts)
+            ]
+        })
+    except Exception as e:
+        logger.error("Error processing batch chat request: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+
+@app.post("/api/chat/stream")
+async def chat_stream_endpoint(
+    request: ChatRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Chat with the wellness agent, streaming the response as server-sent events.
+    
+    The first event carries the session ID, each following event carries a
+    "delta" with the next piece of the response, and the stream ends with
+    "data: [DONE]".
+    """
+    try:
+        session, session_id, full_prompt = await asyncio.to_thread(
+            _prepare_chat_turn, request, current_user
+        )
+    except Exception as e:
+        logger.error("Error processing chat request: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+    
+    async def event_stream():
+        yield _sse_event({"session_id": session_id})
         
-        # Use a very simplified approach - direct to Gemini
+        chunks = []
         try:
-            # Import vertexai for direct access
-            import google.generativeai as genai
-            
-            # Configure the API
-            if os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "FALSE").upper() == "TRUE":
-                # Use VertexAI
-                import vertexai
-                from vertexai.generative_models import GenerativeModel
-                
-                # Initialize Vertex AI with project and location
-                project_id = os.getenv("GOOGLE_CLOUD_PROJECT", "")
-                location = os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
-                vertexai.init(project=project_id, location=location)
-                
-                # Create the model
-                model = GenerativeModel("gemini-1.5-flash")
-                response_text = model.generate_content(full_prompt).text
-                
-            else:
-                # Use Google AI Studio API key
-                genai.configure(api_key=os.getenv("GOOGLE_API_KEY", ""))
-                
-                # Create the model
-                model = genai.GenerativeModel("gemini-1.5-flash")
-                response = model.generate_content(full_prompt)
-                response_text = response.text
-                
+            # Creating the model may configure the SDK, so do that off the event loop
+            model = _gemini_model or await asyncio.to_thread(_get_gemini_model)
+            response = await model.generate_content_async(full_prompt, stream=True)
+            async for part in response:
+                chunks.append(part.text)
+                yield _sse_event({"delta": part.text})
         except Exception as e:
-            logger.error(f"Error with direct Gemini call: {str(e)}")
-            # Fallback response
-            response_text = f"I'm having trouble connecting to the AI service. Please check your configuration and try again later. Error details: {str(e)}"
+            logger.error("Error with streaming Gemini call: %s", e)
+            fallback = _fallback_response(e)
+            chunks.append(fallback)
+            yield _sse_event({"delta": fallback})
         
-        # Record the agent's response in the session history
-        session.add_message(
-            role="assistant",
-            content=response_text
-        )
-        
-        # Update the session state
-        session.update_state(state)
-        
-        # Save the updated session
-        memory_service.save_session(session)
-        
-        return {
-            "response": response_text,
-            "session_id": session_id,
-            "usage": {}  # In a real implementation, we would track and return token usage
-        }
-    except Exception as e:
-        logger.error(f"Error processing chat request: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+        # Persist the complete response once streaming has finished
+        await asyncio.to_thread(_finish_chat_turn, session, "".join(chunks))
+        yield "data: [DONE]\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
 
 @app.get("/api/health")
-async def health_check() -> Dict[str, str]:
+async def health_check(if_none_match: Optional[str] = Header(None)) -> Response:
     """
     Health check endpoint.
+    
+    The payload is constant, so it is served from pre-encoded bytes with an ETag.
     """
-    return {"status": "ok", "version": "0.1.0"}
+    if if_none_match == _HEALTH_ETAG:
+        return Response(status_code=304, headers=_HEALTH_HEADERS)
+    return Response(content=_HEALTH_BODY, media_type="application/json", headers=_HEALTH_HEADERS)
 
 @app.get("/api/sessions/{user_id}")
 async def get_user_sessions(
     user_id: str,
     active_only: bool = True,
     current_user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> StreamingResponse:
     """
     Get all sessions for a user.
     
@@ -672,13 +908,13 @@ async def get_user_sessions(
         raise HTTPException(status_code=403, detail="Not authorized to access these sessions")
     
     try:
-        sessions = memory_service.get_user_sessions(user_id, active_only)
-        return {
-            "user_id": user_id,
-            "sessions": [session.to_dict() for session in sessions]
-        }
+        sessions = await asyncio.to_thread(memory_service.get_user_sessions, user_id, active_only)
+        return StreamingResponse(
+            _stream_json_list({"user_id": user_id}, "sessions", (session.to_dict() for session in sessions)),
+            media_type="application/json"
+        )
     except Exception as e:
-        logger.error(f"Error retrieving user sessions: {e}", exc_info=True)
+        logger.error("Error retrieving user sessions: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error retrieving user sessions: {str(e)}")
 
 @app.get("/api/symptom_logs/{user_id}")
@@ -686,12 +922,14 @@ async def get_user_symptom_logs(
     user_id: str,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    after_log_id: Optional[str] = None,
     current_user: Dict[str, Any] = Depends(get_current_user)
-) -> Dict[str, Any]:
+) -> StreamingResponse:
     """
-    Get symptom logs for a user.
+    Get symptom logs for a user, newest first.
     
-    This endpoint requires authentication and proper authorization.
+    Pass the log_id of the last log received as after_log_id to get the next
+    page. This endpoint requires authentication and proper authorization.
     """
     # Simple authorization check - users can only access their own logs, HR can access all
     if current_user["user_id"] != user_id and current_user["role"] != "hr_manager":
@@ -699,67 +937,109 @@ async def get_user_symptom_logs(
     
     try:
         # Convert date strings to datetime objects if provided
-        start_datetime = datetime.fromisoformat(start_date) if start_date else None
-        end_datetime = datetime.fromisoformat(end_date) if end_date else None
+        start_datetime = _parse_iso(start_date) if start_date else None
+        end_datetime = _parse_iso(end_date) if end_date else None
         
-        logs = memory_service.get_user_symptom_logs(
+        # Logs are read lazily while the response streams, in Starlette's
+        # threadpool, so log_count is written after the list
+        logs = iter(memory_service.iter_user_symptom_logs(
             user_id=user_id,
             start_date=start_datetime,
-            end_date=end_datetime
-        )
+            end_date=end_datetime,
+            # Anonymized logs carry an "anon_" prefix on their log_id
+            after_log_id=after_log_id.removeprefix("anon_") if after_log_id else None,
+            # HR accessing employee logs only ever sees anonymized data
+            anonymized=current_user["user_id"] != user_id
+        ))
         
-        # If HR is accessing employee logs, ensure they only see anonymized data
-        if current_user["user_id"] != user_id and current_user["role"] == "hr_manager":
-            logs = [log.anonymize() for log in logs]
+        # Read the first log before responding, so a failing query still
+        # returns an error status instead of a truncated body
+        first_log = await asyncio.to_thread(next, logs, None)
+        if first_log is not None:
+            logs = itertools.chain((first_log,), logs)
         
-        return {
-            "user_id": user_id if current_user["user_id"] == user_id else "anonymous",
-            "log_count": len(logs),
-            "logs": [log.to_dict() for log in logs]
-        }
+        head = {"user_id": user_id if current_user["user_id"] == user_id else "anonymous"}
+        return StreamingResponse(
+            _stream_json_list(head, "logs", logs, count_key="log_count"),
+            media_type="application/json"
+        )
     except Exception as e:
-        logger.error(f"Error retrieving symptom logs: {e}", exc_info=True)
+        logger.error("Error retrieving symptom logs: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error retrieving symptom logs: {str(e)}")
 
-@app.get("/")
-async def serve_frontend():
-    """
-    Serve the frontend application.
-    """
-    return FileResponse(frontend_dir / "index.html")
-
-@app.get("/{path:path}")
-async def serve_frontend_paths(path: str):
-    """
-    Serve the frontend application for any route.
-    
-    This allows the frontend to handle client-side routing.
-    """
-    # First check if the file exists in the static directory
-    file_path = frontend_dir / path
-    if file_path.exists() and file_path.is_file():
-        return FileResponse(file_path)
+def _run_connection_tests() -> Dict[str, Any]:
+    """Run the database connection tests, reusing recent results."""
+    global _db_test_cache
+    from wellness_agent.db.test_connection import test_all_connections
     
-    # Otherwise, serve the index.html for client-side routing
-    return FileResponse(frontend_dir / "index.html")
+    with _db_test_lock:
+        cached_at, results = _db_test_cache
+        if results is None or time.monotonic() - cached_at > DB_TEST_CACHE_TTL:
+            # Only one caller at a time re-runs the (slow) connection tests
+            results = test_all_connections()
+            _db_test_cache = (time.monotonic(), results)
+    return results
 
 @app.get("/api/db/test-connection")
-async def test_database_connections() -> Dict[str, Any]:
+async def test_database_connections() -> ORJSONResponse:
     """
     Test database connections.
     
-    This endpoint tests connections to Firestore and BigQuery.
+    This endpoint tests connections to Firestore and BigQuery. Results are
+    cached for DB_TEST_CACHE_TTL seconds so monitoring loops don't open a new
+    set of connections on every ping.
     """
-    from wellness_agent.db.test_connection import test_all_connections
-    
     try:
-        results = test_all_connections()
-        return results
+        results = await asyncio.to_thread(_run_connection_tests)
+        return ORJSONResponse(
+            content=results,
+            headers={"Cache-Control": f"max-age={DB_TEST_CACHE_TTL}"}
+        )
     except Exception as e:
-        logger.error(f"Error testing database connections: {e}", exc_info=True)
+        logger.error("Error testing database connections: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error testing database connections: {str(e)}")
 
+# Frontend routes are registered last so they never shadow API routes
+def _index_response(if_none_match: Optional[str]) -> Response:
+    """Serve the in-memory index.html, or a 304 if the client's copy is current."""
+    if if_none_match == _INDEX_ETAG:
+        return Response(status_code=304, headers=_INDEX_HEADERS)
+    return Response(content=_INDEX_BYTES, media_type="text/html", headers=_INDEX_HEADERS)
+
+class FrontendFiles(StaticFiles):
+    """
+    Serve the frontend build, falling back to index.html for client-side routes.
+    
+    Files in the build are served by StaticFiles, which handles ETag and
+    If-None-Match. Other paths are answered from memory without touching the
+    filesystem.
+    """
+    
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        # Unknown API paths are errors, not client-side routes
+        if path == "api" or path.startswith("api/"):
+            raise HTTPException(status_code=404, detail="Not found")
+        
+        if path in _STATIC_FILES:
+            return await super().get_response(path, scope)
+        
+        return _index_response(Headers(scope=scope).get("if-none-match"))
+
+# Mounted last so that every API route is matched first
+app.mount("/", FrontendFiles(directory=frontend_dir), name="frontend")
+
 if __name__ == "__main__":
-    # This is for development only. In production, use a proper ASGI server.
+    # Multiple workers only share sessions through Redis, so default to one
+    # worker per CPU only when REDIS_URL is set. uvloop and httptools are used
+    # when installed (uvicorn[standard]).
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    default_workers = (os.cpu_count() or 1) if os.getenv("REDIS_URL") else 1
+    uvicorn.run(
+        "wellness_agent.server:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", default_workers)),
+        loop="auto",
+        http="auto",
+        access_log=False
+    ) 
\ No newline at end of file
@@ -1,11 +1,26 @@
 """Services package for the Wellness Agent."""
 
-from wellness_agent.services.symptom_service import SymptomService
-from wellness_agent.services.accommodation_service import AccommodationService
-from wellness_agent.services.organization_service import OrganizationService
-from wellness_agent.services.analytics_service import AnalyticsService
-from wellness_agent.services.db_service import DatabaseService
-from wellness_agent.services.service_factory import ServiceFactory
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from wellness_agent.services.symptom_service import SymptomService
+    from wellness_agent.services.accommodation_service import AccommodationService
+    from wellness_agent.services.organization_service import OrganizationService
+    from wellness_agent.services.analytics_service import AnalyticsService
+    from wellness_agent.services.db_service import DatabaseService
+    from wellness_agent.services.service_factory import ServiceFactory
+
+# Submodule defining each public name. Submodules are imported on first access,
+# so importing the package does not load every database client library.
+_SUBMODULES = {
+    "SymptomService": "symptom_service",
+    "AccommodationService": "accommodation_service",
+    "OrganizationService": "organization_service",
+    "AnalyticsService": "analytics_service",
+    "DatabaseService": "db_service",
+    "ServiceFactory": "service_factory",
+}
 
 __all__ = [
     "SymptomService",
@@ -14,4 +29,11 @@ __all__ = [
     "AnalyticsService",
     "DatabaseService",
     "ServiceFactory"
-] 
\ No newline at end of file
+]
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        value = getattr(importlib.import_module(f"{__name__}.{_SUBMODULES[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
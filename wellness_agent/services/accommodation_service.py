@@ -1,12 +1,21 @@
 """Accommodation service for the Wellness Agent."""
 
 import datetime
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any, Union
 
 from wellness_agent.db.firestore import FirestoreClient
 from wellness_agent.db.bigquery import BigQueryClient
 from wellness_agent.privacy.anonymizer import Anonymizer
 
+# Number of days covered by each trend time period
+_DAYS_MAP = MappingProxyType({
+    "week": 7,
+    "month": 30,
+    "quarter": 90,
+    "year": 365
+})
+
 class AccommodationService:
     """Service for managing accommodation requests."""
     
@@ -152,13 +161,7 @@ class AccommodationService:
             Anonymized trend data
         """
         # Convert time period to days
-        days_map = {
-            "week": 7,
-            "month": 30,
-            "quarter": 90,
-            "year": 365
-        }
-        days = days_map.get(time_period, 30)
+        days = _DAYS_MAP.get(time_period, 30)
         
         # In a real implementation, this would:
         # 1. Fetch raw data from Firestore
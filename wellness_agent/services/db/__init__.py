@@ -1,6 +1,23 @@
 """Database service module for the Wellness Agent."""
 
-from wellness_agent.services.db.leave_request_service import LeaveRequestService
-from wellness_agent.services.db.accommodation_plan_service import AccommodationPlanService
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["LeaveRequestService", "AccommodationPlanService"] 
\ No newline at end of file
+if TYPE_CHECKING:
+    from wellness_agent.services.db.leave_request_service import LeaveRequestService
+    from wellness_agent.services.db.accommodation_plan_service import AccommodationPlanService
+
+# Submodule defining each public name, imported on first access
+_SUBMODULES = {
+    "LeaveRequestService": "leave_request_service",
+    "AccommodationPlanService": "accommodation_plan_service",
+}
+
+__all__ = ["LeaveRequestService", "AccommodationPlanService"]
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        value = getattr(importlib.import_module(f"{__name__}.{_SUBMODULES[name]}"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,129 @@
+"""Shared Firestore client for the database services."""
+
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Tuple
+
+if TYPE_CHECKING:
+    from google.cloud import firestore
+
+logger = logging.getLogger(__name__)
+
+# google.cloud.firestore pulls in gRPC and the auth libraries, so it is only
+# imported once a client is requested; mock-mode services never load it.
+
+
+@lru_cache(maxsize=1)
+def get_client() -> "firestore.Client":
+    """
+    Get the process-wide Firestore client.
+
+    Creating a client sets up its own gRPC channel and credentials, so all
+    database services share one instance instead of building their own.
+
+    Returns:
+        The shared Firestore client
+    """
+    from google.cloud import firestore
+
+    return firestore.Client()
+
+
+@lru_cache(maxsize=1)
+def get_async_client() -> "firestore.AsyncClient":
+    """
+    Get the process-wide asynchronous Firestore client.
+
+    The client's gRPC channel belongs to the event loop that first uses it,
+    so call this from within the server's running loop.
+
+    Returns:
+        The shared asynchronous Firestore client
+    """
+    from google.cloud import firestore
+
+    return firestore.AsyncClient()
+
+
+@lru_cache(maxsize=1)
+def _transient_errors() -> Tuple[type, ...]:
+    """Exception types showing that Firestore itself is unavailable."""
+    from google.api_core import exceptions
+    
+    return (
+        exceptions.ServiceUnavailable,
+        exceptions.DeadlineExceeded,
+        exceptions.InternalServerError
+    )
+
+
+class CircuitBreaker:
+    """
+    Stop calling Firestore for a while after repeated consecutive failures.
+
+    Services check ``is_open`` before a Firestore call and go straight to
+    their mock fallback while it is True, instead of waiting for each call
+    to time out during an outage. Use the breaker as a context manager
+    around the call to record its outcome; exceptions are re-raised. Only
+    transient errors (unavailable, deadline exceeded, internal) count as
+    failures; errors such as NotFound or bugs in the caller do not.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds the circuit stays open before calls are retried
+            timer: Clock used for the cooldown (monotonic seconds by default)
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.timer = timer
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether Firestore calls should currently be skipped."""
+        return self.timer() < self._open_until
+
+    def record_success(self) -> None:
+        """Reset the failure count after a successful call."""
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._failures = 0
+                self._open_until = self.timer() + self.cooldown
+                logger.warning(
+                    "Firestore failed %d times in a row; using the fallback for %.0f seconds",
+                    self.failure_threshold, self.cooldown
+                )
+
+    def __enter__(self) -> "CircuitBreaker":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.record_success()
+        elif issubclass(exc_type, _transient_errors()):
+            self.record_failure()
+        return False
+
+
+# Breaker for the accommodation plan service's Firestore calls
+firestore_breaker = CircuitBreaker()
@@ -1,13 +1,53 @@
 """Accommodation plan service for the Wellness Agent."""
 
+import asyncio
+import atexit
+import copy
+import logging
 import os
-import uuid
-import json
+import secrets
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Union
-from google.cloud import firestore
+from typing import Callable, List, Dict, Any, Optional, Set, Union
+
+import orjson
 
 from wellness_agent.db.models.accommodation_plan import AccommodationPlan
+from wellness_agent.shared_libraries.cache import TTLCache
+from wellness_agent.services.db._firestore_client import (
+    firestore_breaker,
+    get_async_client,
+    get_client
+)
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of writes Firestore accepts in a single batch
+_MAX_BATCH_WRITES = 500
+
+# Statuses an accommodation plan can have, and those counted as active
+_VALID_STATUSES = frozenset({"pending", "approved", "denied", "completed"})
+_ACTIVE_STATUSES = ("pending", "approved")
+
+# Mock database file, in the repository's mock_db directory
+_MOCK_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
+    'mock_db',
+    'accommodation_plans.json'
+)
+
+# Number of write-ahead log entries after which the mock database is compacted
+_MOCK_LOG_COMPACT_EVERY = 1000
+
+
+def _plan_from_data(plan_data: Dict[str, Any]) -> AccommodationPlan:
+    """
+    Build a plan from stored plan data.
+    
+    The data is copied, so changing the plan's lists in place does not
+    change the mock database or the read cache.
+    """
+    return AccommodationPlan.from_dict(copy.deepcopy(plan_data))
 
 
 class AccommodationPlanService:
@@ -18,16 +58,32 @@ class AccommodationPlanService:
     Firestore as the backend database.
     """
     
+    # Mock database shared by all instances, loaded from disk on first use
+    _mock_cache: Optional[Dict[str, Any]] = None
+    
+    # Plan IDs in the mock database by employee ID and by status
+    _employee_index: Dict[str, Set[str]] = {}
+    _status_index: Dict[str, Set[str]] = {}
+    
+    # Guards the mock database, its indexes and its write-ahead log
+    _mock_lock = threading.RLock()
+    
+    # Entries in the write-ahead log since the mock database was last compacted
+    _mock_log_entries = 0
+    
+    # Recently read Firestore plan documents by plan ID, dropped on local writes
+    _plan_cache = TTLCache(maxsize=4096, ttl=30)
+    
     def __init__(self):
         """Initialize the accommodation plan service with a Firestore client."""
         self.use_mock = os.getenv("USE_MOCK_SERVICES", "false").lower() == "true"
         
         if not self.use_mock:
             try:
-                self.db = firestore.Client()
+                self.db = get_client()
                 self.collection = self.db.collection('accommodation_plans')
-            except Exception as e:
-                print(f"Error initializing Firestore client, falling back to mock: {e}")
+            except Exception:
+                logger.exception("Error initializing Firestore client, falling back to mock")
                 self.use_mock = True
     
     def create_accommodation_plan(
@@ -57,7 +113,7 @@ class AccommodationPlanService:
         Returns:
             The created AccommodationPlan object
         """
-        if self.use_mock:
+        if self.use_mock or firestore_breaker.is_open:
             return self._mock_create_accommodation_plan(
                 employee_id=employee_id,
                 accommodation_types=accommodation_types,
@@ -69,16 +125,7 @@ class AccommodationPlanService:
                 manager_notes=manager_notes
             )
             
-        # Generate a unique plan ID
-        today = datetime.now().strftime("%Y%m%d")
-        plan_id = f"AP-{today}-{uuid.uuid4().hex[:6].upper()}"
-        
-        # Calculate review date (default to 90 days from now)
-        review_date = (datetime.now() + timedelta(days=90)).strftime("%Y-%m-%d")
-        
-        # Create the accommodation plan object
-        plan = AccommodationPlan(
-            plan_id=plan_id,
+        plan = self._build_accommodation_plan(
             employee_id=employee_id,
             accommodation_types=accommodation_types,
             duration=duration,
@@ -86,18 +133,16 @@ class AccommodationPlanService:
             specific_days=specific_days,
             functional_limitations=functional_limitations,
             privacy_level=privacy_level,
-            manager_notes=manager_notes,
-            status="pending",
-            created_at=datetime.now().isoformat(),
-            review_date=review_date
+            manager_notes=manager_notes
         )
         
         # Save to Firestore
         try:
-            self.collection.document(plan_id).set(plan.to_dict())
-            return plan
-        except Exception as e:
-            print(f"Error creating accommodation plan: {e}")
+            with firestore_breaker:
+                self.collection.document(plan.plan_id).set(plan.to_dict())
+                return plan
+        except Exception:
+            logger.exception("Error creating accommodation plan")
             # Fall back to mock implementation
             return self._mock_create_accommodation_plan(
                 employee_id=employee_id,
@@ -114,32 +159,165 @@ class AccommodationPlanService:
         """
         Get an accommodation plan by ID.
         
+        Firestore reads are cached for 30 seconds; updates and deletes made
+        through this service drop the cached copy.
+        
         Args:
             plan_id: ID of the plan to retrieve
             
         Returns:
             AccommodationPlan object if found, None otherwise
         """
-        if self.use_mock:
+        if self.use_mock or firestore_breaker.is_open:
             return self._mock_get_accommodation_plan(plan_id)
             
+        plan_data = self._plan_cache.get(plan_id)
+        if plan_data is not None:
+            return _plan_from_data(plan_data)
+            
         try:
-            doc = self.collection.document(plan_id).get()
-            if doc.exists:
-                return AccommodationPlan.from_dict(doc.to_dict())
-            return None
-        except Exception as e:
-            print(f"Error retrieving accommodation plan: {e}")
+            with firestore_breaker:
+                doc = self.collection.document(plan_id).get()
+                if doc.exists:
+                    plan_data = doc.to_dict()
+                    self._plan_cache.set(plan_id, plan_data)
+                    return _plan_from_data(plan_data)
+                return None
+        except Exception:
+            logger.exception("Error retrieving accommodation plan")
             # Fall back to mock implementation
             return self._mock_get_accommodation_plan(plan_id)
     
     def get_accommodation_plans_by_employee(
+        self, 
+        employee_id: str,
+        active_only: bool = True,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[AccommodationPlan], List[Dict[str, Any]]]:
+        """
+        Get all accommodation plans for an employee.
+        
+        Args:
+            employee_id: ID of the employee
+            active_only: Whether to include only active plans
+            fields: Plan fields to fetch; when given, only these fields are read
+                from Firestore and each plan is returned as a dictionary
+            
+        Returns:
+            List of AccommodationPlan objects, or of dictionaries holding the
+            requested fields
+        """
+        if self.use_mock or firestore_breaker.is_open:
+            return self._mock_get_accommodation_plans_by_employee(
+                employee_id=employee_id,
+                active_only=active_only,
+                fields=fields
+            )
+            
+        try:
+            with firestore_breaker:
+                query = self.collection.where('employee_id', '==', employee_id)
+                
+                if active_only:
+                    query = query.where('status', 'in', list(_ACTIVE_STATUSES))
+                    
+                if fields:
+                    query = query.select(fields)
+                    
+                # Served by the (employee_id, status) index in firestore.indexes.json;
+                # an employee has few plans, so fetch them in one response
+                docs = query.get()
+                
+                if fields:
+                    return [doc.to_dict() for doc in docs]
+                return [AccommodationPlan.from_dict(doc.to_dict()) for doc in docs]
+        except Exception:
+            logger.exception("Error retrieving accommodation plans")
+            # Fall back to mock implementation
+            return self._mock_get_accommodation_plans_by_employee(
+                employee_id=employee_id,
+                active_only=active_only,
+                fields=fields
+            )
+    
+    def get_accommodation_plans(self, plan_ids: List[str]) -> List[AccommodationPlan]:
+        """
+        Get several accommodation plans by ID in a single round trip.
+        
+        Args:
+            plan_ids: IDs of the plans to retrieve
+            
+        Returns:
+            AccommodationPlan objects for the IDs that exist, in request order
+        """
+        if self.use_mock or firestore_breaker.is_open:
+            return self._mock_get_accommodation_plans(plan_ids)
+            
+        try:
+            with firestore_breaker:
+                refs = [self.collection.document(plan_id) for plan_id in plan_ids]
+                found = {
+                    doc.id: AccommodationPlan.from_dict(doc.to_dict())
+                    for doc in self.db.get_all(refs)
+                    if doc.exists
+                }
+                return [found[plan_id] for plan_id in plan_ids if plan_id in found]
+        except Exception:
+            logger.exception("Error retrieving accommodation plans")
+            # Fall back to mock implementation
+            return self._mock_get_accommodation_plans(plan_ids)
+    
+    async def aget_accommodation_plan(self, plan_id: str) -> Optional[AccommodationPlan]:
+        """
+        Get an accommodation plan by ID without blocking the event loop.
+        
+        Args:
+            plan_id: ID of the plan to retrieve
+            
+        Returns:
+            AccommodationPlan object if found, None otherwise
+        """
+        if self.use_mock or firestore_breaker.is_open:
+            return self._mock_get_accommodation_plan(plan_id)
+            
+        plan_data = self._plan_cache.get(plan_id)
+        if plan_data is not None:
+            return _plan_from_data(plan_data)
+            
+        try:
+            with firestore_breaker:
+                doc = await self._async_collection().document(plan_id).get()
+                if doc.exists:
+                    plan_data = doc.to_dict()
+                    self._plan_cache.set(plan_id, plan_data)
+                    return _plan_from_data(plan_data)
+                return None
+        except Exception:
+            logger.exception("Error retrieving accommodation plan")
+            # Fall back to mock implementation
+            return self._mock_get_accommodation_plan(plan_id)
+    
+    async def aget_many(self, plan_ids: List[str]) -> List[Optional[AccommodationPlan]]:
+        """
+        Get several accommodation plans concurrently.
+        
+        Args:
+            plan_ids: IDs of the plans to retrieve
+            
+        Returns:
+            One AccommodationPlan or None per ID, in the same order
+        """
+        return list(await asyncio.gather(
+            *(self.aget_accommodation_plan(plan_id) for plan_id in plan_ids)
+        ))
+    
+    async def aget_accommodation_plans_by_employee(
         self, 
         employee_id: str,
         active_only: bool = True
     ) -> List[AccommodationPlan]:
         """
-        Get all accommodation plans for an employee.
+        Get all accommodation plans for an employee without blocking the event loop.
         
         Args:
             employee_id: ID of the employee
@@ -148,23 +326,22 @@ class AccommodationPlanService:
         Returns:
             List of AccommodationPlan objects
         """
-        if self.use_mock:
+        if self.use_mock or firestore_breaker.is_open:
             return self._mock_get_accommodation_plans_by_employee(
                 employee_id=employee_id,
                 active_only=active_only
             )
             
         try:
-            query = self.collection.where('employee_id', '==', employee_id)
-            
-            if active_only:
-                query = query.where('status', 'in', ['pending', 'approved'])
+            with firestore_breaker:
+                query = self._async_collection().where('employee_id', '==', employee_id)
                 
-            docs = query.stream()
-            
-            return [AccommodationPlan.from_dict(doc.to_dict()) for doc in docs]
-        except Exception as e:
-            print(f"Error retrieving accommodation plans: {e}")
+                if active_only:
+                    query = query.where('status', 'in', list(_ACTIVE_STATUSES))
+                    
+                return [AccommodationPlan.from_dict(doc.to_dict()) async for doc in query.stream()]
+        except Exception:
+            logger.exception("Error retrieving accommodation plans")
             # Fall back to mock implementation
             return self._mock_get_accommodation_plans_by_employee(
                 employee_id=employee_id,
@@ -189,40 +366,42 @@ class AccommodationPlanService:
             
         Returns:
             True if successful, False otherwise
+            
+        Raises:
+            ValueError: If the status is not a known plan status
         """
-        if self.use_mock:
-            return self._mock_update_accommodation_plan_status(
-                plan_id=plan_id,
-                status=status,
-                approved_by=approved_by,
-                notes=notes
-            )
+        return self.update_fields(plan_id, self._status_fields(status, approved_by, notes))
+    
+    def update_fields(self, plan_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        Update selected fields of an accommodation plan.
+        
+        Only the given fields are written, in both Firestore and the mock
+        backend.
+        
+        Args:
+            plan_id: ID of the plan to update
+            fields: Field names mapped to their new values
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if self.use_mock or firestore_breaker.is_open:
+            return self._mock_update_fields(plan_id, fields)
             
         try:
-            updates = {
-                'status': status
-            }
-            
-            if status == "approved":
-                updates['approved_at'] = datetime.now().isoformat()
-                if approved_by:
-                    updates['approved_by'] = approved_by
-                
-            if notes:
-                updates['notes'] = notes
-                
-            self.collection.document(plan_id).update(updates)
-            return True
-        except Exception as e:
-            print(f"Error updating accommodation plan status: {e}")
+            with firestore_breaker:
+                self.collection.document(plan_id).update(fields)
+                return True
+        except Exception:
+            logger.exception("Error updating accommodation plan")
             # Fall back to mock implementation
-            return self._mock_update_accommodation_plan_status(
-                plan_id=plan_id,
-                status=status,
-                approved_by=approved_by,
-                notes=notes
-            )
+            return self._mock_update_fields(plan_id, fields)
+        finally:
+            # Dropped after the write, so a concurrent read cannot cache the old plan again
+            self._plan_cache.pop(plan_id)
             
+
     def delete_accommodation_plan(self, plan_id: str) -> bool:
         """
         Delete an accommodation plan.
@@ -233,20 +412,150 @@ class AccommodationPlanService:
         Returns:
             True if successful, False otherwise
         """
-        if self.use_mock:
+        if self.use_mock or firestore_breaker.is_open:
             return self._mock_delete_accommodation_plan(plan_id)
             
         try:
-            self.collection.document(plan_id).delete()
-            return True
-        except Exception as e:
-            print(f"Error deleting accommodation plan: {e}")
+            with firestore_breaker:
+                self.collection.document(plan_id).delete()
+                return True
+        except Exception:
+            logger.exception("Error deleting accommodation plan")
             # Fall back to mock implementation
             return self._mock_delete_accommodation_plan(plan_id)
+        finally:
+            # Dropped after the write, so a concurrent read cannot cache the old plan again
+            self._plan_cache.pop(plan_id)
     
-    # Mock implementations for local testing without Firestore
-    def _mock_create_accommodation_plan(
+    def create_accommodation_plans_bulk(
         self,
+        plan_requests: List[Dict[str, Any]]
+    ) -> List[AccommodationPlan]:
+        """
+        Create several accommodation plans with batched writes.
+        
+        Args:
+            plan_requests: One dictionary per plan holding the keyword arguments
+                accepted by create_accommodation_plan
+            
+        Returns:
+            The created AccommodationPlan objects, in request order
+        """
+        if self.use_mock or firestore_breaker.is_open:
+            return [self._mock_create_accommodation_plan(**request) for request in plan_requests]
+            
+        plans = [self._build_accommodation_plan(**request) for request in plan_requests]
+        
+        try:
+            with firestore_breaker:
+                self._commit_in_batches(
+                    lambda batch, plan: batch.set(self.collection.document(plan.plan_id), plan.to_dict()),
+                    plans
+                )
+                return plans
+        except Exception:
+            logger.exception("Error creating accommodation plans")
+            # Fall back to mock implementation
+            for plan in plans:
+                self._save_to_mock_db(plan)
+            return plans
+    
+    def update_statuses_bulk(self, updates: List[Dict[str, Any]]) -> bool:
+        """
+        Update the status of several accommodation plans with batched writes.
+        
+        Args:
+            updates: One dictionary per plan with plan_id, status and the optional
+                approved_by and notes accepted by update_accommodation_plan_status
+            
+        Returns:
+            True if every plan was updated, False otherwise
+            
+        Raises:
+            ValueError: If any status is not a known plan status; nothing is
+                written in that case
+        """
+        # Build every update first so an invalid status fails before any write
+        writes = [
+            (
+                update['plan_id'],
+                self._status_fields(update['status'], update.get('approved_by'), update.get('notes'))
+            )
+            for update in updates
+        ]
+        
+        if self.use_mock or firestore_breaker.is_open:
+            results = [self._mock_update_fields(plan_id, fields) for plan_id, fields in writes]
+            return all(results)
+            
+        try:
+            with firestore_breaker:
+                self._commit_in_batches(
+                    lambda batch, write: batch.update(self.collection.document(write[0]), write[1]),
+                    writes
+                )
+                return True
+        except Exception:
+            logger.exception("Error updating accommodation plan statuses")
+            # Fall back to mock implementation
+            results = [self._mock_update_fields(plan_id, fields) for plan_id, fields in writes]
+            return all(results)
+        finally:
+            # Dropped after the writes, so concurrent reads cannot cache the old plans again
+            for plan_id, _ in writes:
+                self._plan_cache.pop(plan_id)
+    
+    def delete_plans_bulk(self, plan_ids: List[str]) -> bool:
+        """
+        Delete several accommodation plans with batched writes.
+        
+        Args:
+            plan_ids: IDs of the plans to delete
+            
+        Returns:
+            True if every plan was deleted, False otherwise
+        """
+        if self.use_mock or firestore_breaker.is_open:
+            results = [self._mock_delete_accommodation_plan(plan_id) for plan_id in plan_ids]
+            return all(results)
+            
+        try:
+            with firestore_breaker:
+                self._commit_in_batches(
+                    lambda batch, plan_id: batch.delete(self.collection.document(plan_id)),
+                    plan_ids
+                )
+                return True
+        except Exception:
+            logger.exception("Error deleting accommodation plans")
+            # Fall back to mock implementation
+            results = [self._mock_delete_accommodation_plan(plan_id) for plan_id in plan_ids]
+            return all(results)
+        finally:
+            # Dropped after the writes, so concurrent reads cannot cache the old plans again
+            for plan_id in plan_ids:
+                self._plan_cache.pop(plan_id)
+    
+    def _async_collection(self):
+        """Get the accommodation plans collection on the shared async client."""
+        return get_async_client().collection('accommodation_plans')
+    
+    def _commit_in_batches(self, add_write: Callable[[Any, Any], Any], items: List[Any]) -> None:
+        """
+        Commit one write per item using as few Firestore batches as possible.
+        
+        Args:
+            add_write: Adds the write for one item to the given batch
+            items: Items to write
+        """
+        for start in range(0, len(items), _MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for item in items[start:start + _MAX_BATCH_WRITES]:
+                add_write(batch, item)
+            batch.commit()
+    
+    @staticmethod
+    def _build_accommodation_plan(
         employee_id: str,
         accommodation_types: List[str],
         duration: str,
@@ -256,13 +565,14 @@ class AccommodationPlanService:
         privacy_level: str = "minimum",
         manager_notes: Optional[str] = None
     ) -> AccommodationPlan:
-        """Mock implementation for local testing."""
+        """Build a new pending accommodation plan with a fresh ID."""
+        now = datetime.now()
+        
         # Generate a unique plan ID
-        today = datetime.now().strftime("%Y%m%d")
-        plan_id = f"AP-{today}-{uuid.uuid4().hex[:6].upper()}"
+        plan_id = f"AP-{now:%Y%m%d}-{secrets.randbits(24):06X}"
         
         # Calculate review date (default to 90 days from now)
-        review_date = (datetime.now() + timedelta(days=90)).strftime("%Y-%m-%d")
+        review_date = f"{now + timedelta(days=90):%Y-%m-%d}"
         
         # Create the accommodation plan object
         plan = AccommodationPlan(
@@ -276,124 +586,256 @@ class AccommodationPlanService:
             privacy_level=privacy_level,
             manager_notes=manager_notes,
             status="pending",
-            created_at=datetime.now().isoformat(),
+            created_at=now.isoformat(),
             review_date=review_date
         )
         
+        return plan
+    
+    @staticmethod
+    def _status_fields(
+        status: str,
+        approved_by: Optional[str] = None,
+        notes: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the fields written by a status update.
+        
+        Raises:
+            ValueError: If the status is not a known plan status
+        """
+        if status not in _VALID_STATUSES:
+            raise ValueError(f"Invalid accommodation plan status: {status}")
+            
+        updates = {
+            'status': status
+        }
+        
+        if status == "approved":
+            updates['approved_at'] = datetime.now().isoformat()
+            if approved_by:
+                updates['approved_by'] = approved_by
+            
+        if notes:
+            updates['notes'] = notes
+            
+        return updates
+    
+    # Mock implementations for local testing without Firestore
+    def _mock_create_accommodation_plan(
+        self,
+        employee_id: str,
+        accommodation_types: List[str],
+        duration: str,
+        frequency: str,
+        specific_days: Optional[List[str]] = None,
+        functional_limitations: Optional[List[str]] = None,
+        privacy_level: str = "minimum",
+        manager_notes: Optional[str] = None
+    ) -> AccommodationPlan:
+        """Mock implementation for local testing."""
+        plan = self._build_accommodation_plan(
+            employee_id=employee_id,
+            accommodation_types=accommodation_types,
+            duration=duration,
+            frequency=frequency,
+            specific_days=specific_days,
+            functional_limitations=functional_limitations,
+            privacy_level=privacy_level,
+            manager_notes=manager_notes
+        )
+        
         # Save to local JSON file for testing
         self._save_to_mock_db(plan)
         return plan
     
     def _mock_get_accommodation_plan(self, plan_id: str) -> Optional[AccommodationPlan]:
         """Mock implementation to get an accommodation plan."""
-        mock_data = self._load_from_mock_db()
-        if plan_id in mock_data:
-            return AccommodationPlan.from_dict(mock_data[plan_id])
-        return None
+        with self._mock_lock:
+            mock_data = self._load_from_mock_db()
+            if plan_id in mock_data:
+                return _plan_from_data(mock_data[plan_id])
+            return None
+    
+    def _mock_get_accommodation_plans(self, plan_ids: List[str]) -> List[AccommodationPlan]:
+        """Mock implementation to get several accommodation plans."""
+        with self._mock_lock:
+            mock_data = self._load_from_mock_db()
+            return [
+                _plan_from_data(mock_data[plan_id])
+                for plan_id in plan_ids
+                if plan_id in mock_data
+            ]
     
     def _mock_get_accommodation_plans_by_employee(
         self, 
         employee_id: str,
-        active_only: bool = True
-    ) -> List[AccommodationPlan]:
+        active_only: bool = True,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[AccommodationPlan], List[Dict[str, Any]]]:
         """Mock implementation to get accommodation plans by employee."""
-        mock_data = self._load_from_mock_db()
-        
-        # Filter by employee ID
-        filtered_data = [
-            AccommodationPlan.from_dict(data) 
-            for data in mock_data.values() 
-            if data.get('employee_id') == employee_id
-        ]
-        
-        # Filter by status if needed
-        if active_only:
-            filtered_data = [
-                plan for plan in filtered_data 
-                if plan.status in ['pending', 'approved']
-            ]
+        with self._mock_lock:
+            mock_data = self._load_from_mock_db()
             
-        return filtered_data
-    
-    def _mock_update_accommodation_plan_status(
-        self, 
-        plan_id: str, 
-        status: str,
-        approved_by: Optional[str] = None,
-        notes: Optional[str] = None
-    ) -> bool:
-        """Mock implementation to update accommodation plan status."""
-        mock_data = self._load_from_mock_db()
-        
-        if plan_id not in mock_data:
-            return False
+            plan_ids = self._employee_index.get(employee_id, set())
             
-        # Update the plan
-        plan_data = mock_data[plan_id]
-        plan_data['status'] = status
-        
-        if status == "approved":
-            plan_data['approved_at'] = datetime.now().isoformat()
-            if approved_by:
-                plan_data['approved_by'] = approved_by
+            # Filter by status if needed
+            if active_only:
+                plan_ids = plan_ids & set().union(
+                    *(self._status_index.get(status, ()) for status in _ACTIVE_STATUSES)
+                )
             
-        if notes:
-            plan_data['notes'] = notes
+            # Keep the plans in creation order
+            plans = [
+                mock_data[plan_id]
+                for plan_id in sorted(plan_ids, key=lambda plan_id: mock_data[plan_id].get('created_at', ''))
+            ]
+            
+            if fields:
+                return [
+                    {field: copy.deepcopy(plan_data[field]) for field in fields if field in plan_data}
+                    for plan_data in plans
+                ]
+            return [_plan_from_data(plan_data) for plan_data in plans]
+    
+    def _mock_update_fields(self, plan_id: str, fields: Dict[str, Any]) -> bool:
+        """Mock implementation to update selected plan fields."""
+        with self._mock_lock:
+            mock_data = self._load_from_mock_db()
             
-        # Save back to file
-        mock_data[plan_id] = plan_data
-        with open(self._get_mock_db_path(), 'w') as f:
-            json.dump(mock_data, f, indent=2)
+            if plan_id not in mock_data:
+                return False
             
-        return True
+            plan_data = mock_data[plan_id]
+            self._unindex_mock_plan(plan_id, plan_data)
+            # Copy the fields, so the caller's lists are not stored
+            mock_data[plan_id] = plan_data = {**plan_data, **copy.deepcopy(fields)}
+            self._index_mock_plan(plan_id, plan_data)
+            self._append_to_mock_log({"op": "update", "id": plan_id, "fields": fields})
+            return True
     
     def _mock_delete_accommodation_plan(self, plan_id: str) -> bool:
         """Mock implementation to delete an accommodation plan."""
-        mock_data = self._load_from_mock_db()
-        
-        if plan_id not in mock_data:
-            return False
+        with self._mock_lock:
+            mock_data = self._load_from_mock_db()
             
-        # Delete the plan
-        del mock_data[plan_id]
-        
-        # Save back to file
-        with open(self._get_mock_db_path(), 'w') as f:
-            json.dump(mock_data, f, indent=2)
+            if plan_id not in mock_data:
+                return False
             
-        return True
+            # Delete the plan
+            self._unindex_mock_plan(plan_id, mock_data.pop(plan_id))
+            
+            self._append_to_mock_log({"op": "delete", "id": plan_id})
+            return True
     
     def _save_to_mock_db(self, plan: AccommodationPlan) -> None:
-        """Save to a local JSON file for mock testing."""
-        mock_db_path = self._get_mock_db_path()
-        
-        # Load existing data
-        existing_data = self._load_from_mock_db()
-        
-        # Add or update the accommodation plan
-        existing_data[plan.plan_id] = plan.to_dict()
-        
-        # Save back to file
-        with open(mock_db_path, 'w') as f:
-            json.dump(existing_data, f, indent=2)
+        """Save a plan to the in-memory mock database and log the write."""
+        with self._mock_lock:
+            # Copy, since to_dict() is cached and shares the plan's lists
+            plan_data = copy.deepcopy(plan.to_dict())
+            mock_data = self._load_from_mock_db()
+            
+            if plan.plan_id in mock_data:
+                self._unindex_mock_plan(plan.plan_id, mock_data[plan.plan_id])
+            mock_data[plan.plan_id] = plan_data
+            self._index_mock_plan(plan.plan_id, plan_data)
+            self._append_to_mock_log({"op": "set", "id": plan.plan_id, "data": plan_data})
     
     def _load_from_mock_db(self) -> Dict[str, Any]:
-        """Load data from the mock database."""
+        """
+        Load data from the mock database.
+        
+        The JSON file and its write-ahead log are read once per process; later
+        calls return the shared in-memory dictionary.
+        """
+        cls = type(self)
+        if cls._mock_cache is None:
+            with self._mock_lock:
+                # Another thread may have loaded it while we waited
+                if cls._mock_cache is None:
+                    os.makedirs(os.path.dirname(self._get_mock_db_path()), exist_ok=True)
+                    mock_data = self._read_mock_db()
+                    cls._employee_index = {}
+                    cls._status_index = {}
+                    for plan_id, plan_data in mock_data.items():
+                        self._index_mock_plan(plan_id, plan_data)
+                    cls._mock_cache = mock_data
+                    atexit.register(self._compact_mock_db)
+        return cls._mock_cache
+    
+    def _index_mock_plan(self, plan_id: str, plan_data: Dict[str, Any]) -> None:
+        """Add a mock plan to the employee and status indexes."""
+        self._employee_index.setdefault(plan_data.get('employee_id'), set()).add(plan_id)
+        self._status_index.setdefault(plan_data.get('status'), set()).add(plan_id)
+    
+    def _unindex_mock_plan(self, plan_id: str, plan_data: Dict[str, Any]) -> None:
+        """Remove a mock plan from the employee and status indexes."""
+        self._employee_index.get(plan_data.get('employee_id'), set()).discard(plan_id)
+        self._status_index.get(plan_data.get('status'), set()).discard(plan_id)
+    
+    def _read_mock_db(self) -> Dict[str, Any]:
+        """Read the mock database file and replay its write-ahead log."""
         mock_db_path = self._get_mock_db_path()
+        data: Dict[str, Any] = {}
         
-        if not os.path.exists(mock_db_path):
-            return {}
-            
         try:
-            with open(mock_db_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading mock database: {e}")
-            return {}
+            if os.path.exists(mock_db_path):
+                with open(mock_db_path, 'rb') as f:
+                    data = orjson.loads(f.read())
+                    
+            wal_path = mock_db_path + ".wal"
+            if os.path.exists(wal_path):
+                with open(wal_path, 'rb') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        entry = orjson.loads(line)
+                        type(self)._mock_log_entries += 1
+                        if entry["op"] == "delete":
+                            data.pop(entry["id"], None)
+                        elif entry["op"] == "update":
+                            if entry["id"] in data:
+                                data[entry["id"]].update(entry["fields"])
+                        else:
+                            data[entry["id"]] = entry["data"]
+        except Exception:
+            logger.exception("Error loading mock database")
+            
+        return data
+    
+    def _append_to_mock_log(self, entry: Dict[str, Any]) -> None:
+        """
+        Append one mutation to the mock database's write-ahead log.
+        
+        The database is compacted every _MOCK_LOG_COMPACT_EVERY entries, so
+        the log does not grow without limit in a long-running process.
+        """
+        with self._mock_lock:
+            with open(self._get_mock_db_path() + ".wal", 'ab') as f:
+                f.write(orjson.dumps(entry) + b"\n")
+            
+            type(self)._mock_log_entries += 1
+            if self._mock_log_entries >= _MOCK_LOG_COMPACT_EVERY:
+                self._compact_mock_db()
+    
+    def _compact_mock_db(self) -> None:
+        """Write the in-memory mock database to disk and clear the log."""
+        with self._mock_lock:
+            mock_data = type(self)._mock_cache
+            if mock_data is None:
+                return
+            
+            # Replace the file in one step, so a crash cannot leave it half written
+            mock_db_path = self._get_mock_db_path()
+            with open(mock_db_path + ".tmp", 'wb') as f:
+                f.write(orjson.dumps(mock_data, option=orjson.OPT_INDENT_2))
+            os.replace(mock_db_path + ".tmp", mock_db_path)
+            
+            wal_path = mock_db_path + ".wal"
+            if os.path.exists(wal_path):
+                os.remove(wal_path)
+            type(self)._mock_log_entries = 0
     
     def _get_mock_db_path(self) -> str:
         """Get the path to the mock database file."""
-        mock_db_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'mock_db')
-        os.makedirs(mock_db_dir, exist_ok=True)
-        
-        return os.path.join(mock_db_dir, 'accommodation_plans.json') 
\ No newline at end of file
+        return _MOCK_DB_PATH 
\ No newline at end of file
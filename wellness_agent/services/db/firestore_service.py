@@ -7,17 +7,67 @@ import datetime
 from typing import Dict, List, Any, Optional
 import logging
 
+from wellness_agent.services.db._firestore_client import get_client
+from wellness_agent.shared_libraries.cache import ttl_cache
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _is_success(result: Dict[str, Any]) -> bool:
+    """Whether a query result is worth caching (i.e. not an error response)."""
+    return "error" not in result
+
+def _field(snapshot: Any, field_path: str, default: Any = None) -> Any:
+    """
+    Read one field of a document snapshot.
+    
+    Unlike to_dict(), this does not build a dictionary of the whole document.
+    DocumentSnapshot.get raises KeyError for missing fields, which is turned
+    into the default like dict.get.
+    """
+    try:
+        return snapshot.get(field_path)
+    except KeyError:
+        return default
+
+def _month_threshold(months: int) -> str:
+    """
+    Get the earliest month ("YYYY-MM") covered by a query over the last months.
+    
+    The current month counts as the first of them, so e.g. the last 6 months
+    in 2024-03 start at 2023-10, however long the months in between are.
+    """
+    today = datetime.date.today()
+    month_index = today.year * 12 + today.month - 1 - (months - 1)
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+# Dashboard queries change slowly, so their results are cached for five minutes
+_dashboard_cache = ttl_cache(maxsize=256, ttl=300, cache_if=_is_success)
+
+# Number of documents read per page when scanning a whole collection
+_PAGE_SIZE = 500
+
+# Wellness program statuses and their categories, in display order
+_PROGRAM_STATUS_BUCKETS = {"Active": "active", "Scheduled": "scheduled", "Completed": "completed"}
+
+# Departments reported by get_department_leave_rates
+_DEPARTMENTS = ["Engineering", "Marketing", "Operations", "Sales", "HR", "Finance"]
+
 class FirestoreService:
     """Service class for accessing Firestore data with privacy protections."""
     
-    def __init__(self):
-        """Initialize Firestore client"""
-        self.db = firestore.Client()
+    @property
+    def db(self) -> firestore.Client:
+        """
+        The shared Firestore client.
+        
+        It is created on first use rather than when the service is, so
+        importing the data tools does not set up credentials and a channel.
+        """
+        return get_client()
     
+    @_dashboard_cache
     def get_department_stats(self, department: Optional[str] = None, months: int = 3) -> Dict[str, Any]:
         """
         Get aggregated department statistics.
@@ -32,36 +82,32 @@ class FirestoreService:
         try:
             collection = self.db.collection("department_stats")
             
-            # Get current date and calculate date threshold
-            now = datetime.datetime.now()
-            date_threshold = now - datetime.timedelta(days=30*months)
-            
             # Query for department stats within time range
+            month_threshold = _month_threshold(months)
             if department and department != "Company-wide":
-                query = collection.where("department", "==", department).where("date", ">=", date_threshold)
+                query = collection.where("department", "==", department).where("month", ">=", month_threshold)
             else:
                 # For company-wide, we'll specifically query for the "Company-wide" stats
-                query = collection.where("department", "==", "Company-wide").where("date", ">=", date_threshold)
+                query = collection.where("department", "==", "Company-wide").where("month", ">=", month_threshold)
             
-            # Execute query and process results
-            results = query.get()
-            
-            if not results:
-                return {"message": "No data found for the specified parameters", "data": []}
+            # Newest months first, sorted and limited by Firestore using the
+            # (department, month DESC) index; only fetch the fields returned below
+            query = query.order_by("month", direction=firestore.Query.DESCENDING).limit(months).select(
+                ["department", "month", "metrics"]
+            )
             
-            # Process data
+            # Stream results and process them as they arrive
             stats_data = []
-            for doc in results:
-                data = doc.to_dict()
+            for doc in query.stream():
                 # Only include aggregated metrics, no individual employee data
                 stats_data.append({
-                    "department": data.get("department"),
-                    "month": data.get("month"),
-                    "metrics": data.get("metrics", {})
+                    "department": _field(doc, "department"),
+                    "month": _field(doc, "month"),
+                    "metrics": _field(doc, "metrics", {})
                 })
             
-            # Sort by date
-            stats_data.sort(key=lambda x: x.get("month", ""), reverse=True)
+            if not stats_data:
+                return {"message": "No data found for the specified parameters", "data": []}
             
             return {
                 "message": f"Retrieved {len(stats_data)} months of data for {department if department else 'all departments'}",
@@ -69,13 +115,19 @@ class FirestoreService:
             }
             
         except Exception as e:
-            logger.error(f"Error retrieving department stats: {str(e)}")
+            logger.error("Error retrieving department stats: %s", e)
             return {"error": f"Could not retrieve department statistics: {str(e)}"}
     
     def get_leave_trends(self, department: Optional[str] = None, months: int = 6) -> Dict[str, Any]:
         """
         Get anonymized leave trends by department.
         
+        Reads the pre-aggregated leave_trends_monthly summaries kept by
+        rebuild_leave_trend_summaries for the months before the last rebuild.
+        Later months, and all months if the summaries were never built, are
+        aggregated from the raw leave requests, so new requests show up
+        without waiting for the next rebuild.
+        
         Args:
             department: Optional department to filter by
             months: Number of months to analyze
@@ -84,38 +136,37 @@ class FirestoreService:
             Dict with leave trend analysis
         """
         try:
-            collection = self.db.collection("leave_requests")
+            month_threshold = _month_threshold(months)
             
-            # Get current date and calculate date threshold
-            now = datetime.datetime.now()
-            date_threshold = now - datetime.timedelta(days=30*months)
+            # Summaries are complete for the months before the one they were
+            # rebuilt in; requests may have been added to later months since
+            status = self.db.collection("aggregation_status").document("leave_trends_monthly").get()
+            rebuilt_month = status.to_dict().get("rebuilt_month") if status.exists else None
             
-            # Query for leave requests within time range
-            if department:
-                query = collection.where("department", "==", department).where("request_date", ">=", date_threshold)
-            else:
-                query = collection.where("request_date", ">=", date_threshold)
+            summaries = []
+            if rebuilt_month and rebuilt_month > month_threshold:
+                query = self.db.collection("leave_trends_monthly").where(
+                    "month", ">=", month_threshold
+                ).where("month", "<", rebuilt_month)
+                if department:
+                    query = query.where("department", "==", department)
+                summaries = [doc.to_dict() for doc in query.stream()]
             
-            # Execute query
-            results = query.get()
+            summaries += self._aggregate_leave_requests(department, max(month_threshold, rebuilt_month or ""))
             
-            if not results:
+            if not summaries:
                 return {"message": "No leave data found for the specified parameters", "data": {}}
             
-            # Process and aggregate data
+            # Combine the department summaries of each month, tracking the month
+            # with the most leave days as we go
             leave_data = {}
             leave_types = {}
             total_requests = 0
+            highest_month = None
+            highest_days = 0
             
-            for doc in results:
-                data = doc.to_dict()
-                
-                # Extract month from request date
-                request_date = data.get("request_date")
-                if not request_date:
-                    continue
-                    
-                month_str = request_date.strftime("%Y-%m")
+            for data in summaries:
+                month_str = data["month"]
                 
                 # Initialize month data if not exists
                 if month_str not in leave_data:
@@ -124,41 +175,48 @@ class FirestoreService:
                         "total_days": 0,
                         "leave_types": {}
                     }
+                month_data = leave_data[month_str]
                 
                 # Update counters
-                leave_data[month_str]["total_requests"] += 1
-                leave_data[month_str]["total_days"] += data.get("duration_days", 0)
+                month_data["total_requests"] += data.get("total_requests", 0)
+                month_data["total_days"] += data.get("total_days", 0)
                 
-                # Count leave types
-                leave_type = data.get("leave_type", "Unknown")
-                if leave_type not in leave_data[month_str]["leave_types"]:
-                    leave_data[month_str]["leave_types"][leave_type] = 0
-                leave_data[month_str]["leave_types"][leave_type] += 1
+                # Ties go to the earliest month
+                if highest_month is None or month_data["total_days"] > highest_days or (
+                    month_data["total_days"] == highest_days and month_str < highest_month
+                ):
+                    highest_month = month_str
+                    highest_days = month_data["total_days"]
                 
-                # Update overall leave types counter
-                if leave_type not in leave_types:
-                    leave_types[leave_type] = 0
-                leave_types[leave_type] += 1
+                # Count leave types
+                for leave_type, count in data.get("leave_types", {}).items():
+                    month_types = month_data["leave_types"]
+                    month_types[leave_type] = month_types.get(leave_type, 0) + count
+                    
+                    # Update overall leave types counter
+                    leave_types[leave_type] = leave_types.get(leave_type, 0) + count
                 
-                total_requests += 1
-            
-            # Calculate percentages for leave types
-            for month, month_data in leave_data.items():
-                for leave_type, count in month_data["leave_types"].items():
-                    month_data["leave_types"][leave_type] = {
+                total_requests += data.get("total_requests", 0)
+            
+            # Sort months chronologically, turning each month's leave type counts
+            # into counts and percentages
+            sorted_leave_data = {}
+            for month in sorted(leave_data):
+                month_data = leave_data[month]
+                month_data["leave_types"] = {
+                    leave_type: {
                         "count": count,
                         "percentage": round(count / month_data["total_requests"] * 100, 1)
                     }
-            
-            # Sort months chronologically
-            sorted_months = sorted(leave_data.keys())
-            sorted_leave_data = {month: leave_data[month] for month in sorted_months}
+                    for leave_type, count in month_data["leave_types"].items()
+                }
+                sorted_leave_data[month] = month_data
             
             # Prepare summary
             summary = {
                 "total_requests": total_requests,
                 "leave_types_breakdown": {},
-                "highest_month": max(sorted_leave_data.items(), key=lambda x: x[1]["total_days"])[0] if sorted_leave_data else None
+                "highest_month": highest_month
             }
             
             for leave_type, count in leave_types.items():
@@ -174,9 +232,129 @@ class FirestoreService:
             }
             
         except Exception as e:
-            logger.error(f"Error retrieving leave trends: {str(e)}")
+            logger.error("Error retrieving leave trends: %s", e)
             return {"error": f"Could not retrieve leave trend data: {str(e)}"}
     
+    def rebuild_leave_trend_summaries(self, months: int = 12) -> int:
+        """
+        Rebuild the leave_trends_monthly summary collection.
+        
+        Aggregates the raw leave requests of the last months into one document
+        per department and month, so get_leave_trends reads a handful of
+        summaries instead of every request. The month of the rebuild is
+        recorded in aggregation_status/leave_trends_monthly; get_leave_trends
+        aggregates that month and later ones from the raw requests. Run it
+        after loading leave data and on a schedule (e.g. nightly) so fewer
+        months are aggregated on each call.
+        
+        Args:
+            months: Number of months to rebuild
+            
+        Returns:
+            Number of summary documents written
+        """
+        rebuilt_month = datetime.date.today().strftime("%Y-%m")
+        summaries = self._aggregate_leave_requests(None, _month_threshold(months))
+        
+        collection = self.db.collection("leave_trends_monthly")
+        # Firestore accepts at most 500 writes per batch
+        for start in range(0, len(summaries), 500):
+            batch = self.db.batch()
+            for summary in summaries[start:start + 500]:
+                batch.set(collection.document(f"{summary['department']}-{summary['month']}"), summary)
+            batch.commit()
+        
+        # Recorded last, so readers only trust summaries that were written
+        self.db.collection("aggregation_status").document("leave_trends_monthly").set({
+            "rebuilt_month": rebuilt_month,
+            "rebuilt_at": datetime.datetime.now()
+        })
+        
+        logger.info("Rebuilt %d leave trend summaries", len(summaries))
+        return len(summaries)
+    
+    def backfill_request_months(self) -> int:
+        """
+        Add the request_month field to leave requests written without it.
+        
+        Run once after upgrading (mock_db/setup_firestore.py --backfill):
+        leave trends select requests by request_month, so requests without it
+        are left out. New requests store request_month when they are created.
+        
+        Returns:
+            Number of leave requests updated
+        """
+        collection = self.db.collection("leave_requests")
+        query = collection.select(["request_date", "start_date", "request_month"])
+        
+        updates = []
+        for doc in query.stream():
+            data = doc.to_dict()
+            if data.get("request_month"):
+                continue
+            # Seeded requests have a request_date, submitted ones a start_date
+            if data.get("request_date"):
+                updates.append((doc.reference, data["request_date"].strftime("%Y-%m")))
+            elif data.get("start_date"):
+                updates.append((doc.reference, data["start_date"][:7]))
+        
+        # Firestore accepts at most 500 writes per batch
+        for start in range(0, len(updates), 500):
+            batch = self.db.batch()
+            for reference, month_str in updates[start:start + 500]:
+                batch.update(reference, {"request_month": month_str})
+            batch.commit()
+        
+        logger.info("Added request_month to %d leave requests", len(updates))
+        return len(updates)
+    
+    def _aggregate_leave_requests(
+        self, department: Optional[str], month_threshold: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate raw leave requests into per-department monthly summaries.
+        
+        Args:
+            department: Optional department to filter by
+            month_threshold: Earliest request month ("YYYY-MM") to include
+            
+        Returns:
+            One summary dict per department and month with total_requests,
+            total_days and a leave_types count map
+        """
+        collection = self.db.collection("leave_requests")
+        
+        # Query for leave requests within time range
+        if department:
+            query = collection.where("department", "==", department).where("request_month", ">=", month_threshold)
+        else:
+            query = collection.where("request_month", ">=", month_threshold)
+        
+        # Only fetch the fields that are aggregated
+        query = query.select(["department", "request_month", "duration_days", "leave_type"])
+        
+        summaries = {}
+        for doc in query.stream():
+            data = doc.to_dict()
+            
+            key = (data.get("department", "Unknown"), data["request_month"])
+            if key not in summaries:
+                summaries[key] = {
+                    "department": key[0],
+                    "month": key[1],
+                    "total_requests": 0,
+                    "total_days": 0,
+                    "leave_types": {}
+                }
+            
+            summary = summaries[key]
+            summary["total_requests"] += 1
+            summary["total_days"] += data.get("duration_days", 0)
+            leave_type = data.get("leave_type", "Unknown")
+            summary["leave_types"][leave_type] = summary["leave_types"].get(leave_type, 0) + 1
+        
+        return list(summaries.values())
+    
     def get_health_trends(self, trend_type: str = "stress_levels", months: int = 6) -> Dict[str, Any]:
         """
         Get anonymized health trend data.
@@ -191,43 +369,40 @@ class FirestoreService:
         try:
             collection = self.db.collection("health_trends")
             
-            # Get current date and calculate date threshold
-            now = datetime.datetime.now()
-            date_threshold = now - datetime.timedelta(days=30*months)
-            
             # Query for health trends within time range
-            query = collection.where("trend_type", "==", trend_type).where("date", ">=", date_threshold)
+            # Sorted by month by Firestore using the (trend_type, month) index
+            query = collection.where("trend_type", "==", trend_type).where(
+                "month", ">=", _month_threshold(months)
+            ).order_by("month").select(["month", "metrics", "insights"])
             
-            # Execute query
-            results = query.get()
-            
-            if not results:
-                return {"message": f"No {trend_type} trend data found for the specified parameters", "data": {}}
-            
-            # Process data
+            # Stream results, summing the company and department values as they arrive
             trend_data = []
-            for doc in results:
-                data = doc.to_dict()
+            company_total = 0
+            department_totals = {}
+            for doc in query.stream():
+                metrics = _field(doc, "metrics", {})
                 trend_data.append({
-                    "month": data.get("month"),
-                    "metrics": data.get("metrics", {}),
-                    "insights": data.get("insights", [])
+                    "month": _field(doc, "month"),
+                    "metrics": metrics,
+                    "insights": _field(doc, "insights", [])
                 })
+                company_total += metrics.get("company_average", 0)
+                for dept, value in metrics.get("department_breakdown", {}).items():
+                    department_totals[dept] = department_totals.get(dept, 0) + value
             
-            # Sort by month
-            trend_data.sort(key=lambda x: x.get("month", ""))
+            if not trend_data:
+                return {"message": f"No {trend_type} trend data found for the specified parameters", "data": {}}
             
             # Calculate averages and trends
             averages = {
-                "company_average": sum(item["metrics"].get("company_average", 0) for item in trend_data) / len(trend_data) if trend_data else 0
+                "company_average": company_total / len(trend_data)
             }
             
             # Calculate department averages if department breakdown exists
-            if trend_data and "department_breakdown" in trend_data[0]["metrics"]:
-                averages["department_averages"] = {}
-                for dept in trend_data[0]["metrics"]["department_breakdown"]:
-                    dept_values = [item["metrics"]["department_breakdown"].get(dept, 0) for item in trend_data]
-                    averages["department_averages"][dept] = sum(dept_values) / len(dept_values)
+            if "department_breakdown" in trend_data[0]["metrics"]:
+                averages["department_averages"] = {
+                    dept: total / len(trend_data) for dept, total in department_totals.items()
+                }
             
             # Identify trend direction (improving/worsening)
             if len(trend_data) >= 2:
@@ -254,9 +429,10 @@ class FirestoreService:
             }
             
         except Exception as e:
-            logger.error(f"Error retrieving health trends: {str(e)}")
+            logger.error("Error retrieving health trends: %s", e)
             return {"error": f"Could not retrieve health trend data: {str(e)}"}
     
+    @_dashboard_cache
     def get_wellness_programs(self) -> Dict[str, Any]:
         """
         Get information about wellness programs.
@@ -267,34 +443,54 @@ class FirestoreService:
         try:
             collection = self.db.collection("wellness_programs")
             
-            # Get all programs
-            results = collection.get()
-            
-            if not results:
-                return {"message": "No wellness programs found", "programs": []}
-            
-            # Process data
-            programs = []
-            for doc in results:
-                data = doc.to_dict()
-                programs.append({
-                    "name": data.get("name"),
-                    "description": data.get("description"),
-                    "status": data.get("status"),
-                    "participation_rate": data.get("participation_rate"),
-                    "satisfaction_score": data.get("satisfaction_score")
-                })
+            # Read programs a page at a time, ordered by status then name, fetching
+            # only the fields returned below
+            query = collection.order_by("status").order_by("name").limit(_PAGE_SIZE).select(
+                ["name", "description", "status", "participation_rate", "satisfaction_score"]
+            )
+            
+            # Categorize programs and total their scores in a single pass; each
+            # page arrives sorted by name
+            categorized = {bucket: [] for bucket in _PROGRAM_STATUS_BUCKETS.values()}
+            other_programs = []
+            total_participation = 0
+            total_satisfaction = 0
+            rated_programs = 0
+            last_doc = None
+            
+            while True:
+                page = query.start_after(last_doc) if last_doc else query
+                docs = list(page.stream())
+                
+                for doc in docs:
+                    program = {
+                        "name": _field(doc, "name"),
+                        "description": _field(doc, "description"),
+                        "status": _field(doc, "status"),
+                        "participation_rate": _field(doc, "participation_rate"),
+                        "satisfaction_score": _field(doc, "satisfaction_score")
+                    }
+                    total_participation += program["participation_rate"] or 0
+                    
+                    # Unrated programs are left out of the satisfaction average
+                    satisfaction = program["satisfaction_score"] or 0
+                    if satisfaction > 0:
+                        total_satisfaction += satisfaction
+                        rated_programs += 1
+                    
+                    bucket = _PROGRAM_STATUS_BUCKETS.get(program["status"])
+                    (categorized[bucket] if bucket else other_programs).append(program)
+                
+                if len(docs) < _PAGE_SIZE:
+                    break
+                last_doc = docs[-1]
             
-            # Sort by status then name
-            status_order = {"Active": 0, "Scheduled": 1, "Completed": 2}
-            programs.sort(key=lambda x: (status_order.get(x.get("status"), 99), x.get("name", "")))
+            # Active, scheduled and completed programs first, then any other status
+            other_programs.sort(key=lambda x: x.get("name", ""))
+            programs = [program for bucket in categorized.values() for program in bucket] + other_programs
             
-            # Categorize programs
-            categorized = {
-                "active": [p for p in programs if p.get("status") == "Active"],
-                "scheduled": [p for p in programs if p.get("status") == "Scheduled"],
-                "completed": [p for p in programs if p.get("status") == "Completed"]
-            }
+            if not programs:
+                return {"message": "No wellness programs found", "programs": []}
             
             return {
                 "message": f"Retrieved {len(programs)} wellness programs",
@@ -303,49 +499,43 @@ class FirestoreService:
                     "active_programs": len(categorized["active"]),
                     "scheduled_programs": len(categorized["scheduled"]),
                     "completed_programs": len(categorized["completed"]),
-                    "avg_participation_rate": sum(p.get("participation_rate", 0) for p in programs) / len(programs) if programs else 0,
-                    "avg_satisfaction_score": sum(p.get("satisfaction_score", 0) for p in programs if p.get("satisfaction_score", 0) > 0) / len([p for p in programs if p.get("satisfaction_score", 0) > 0]) if [p for p in programs if p.get("satisfaction_score", 0) > 0] else 0
+                    "avg_participation_rate": total_participation / len(programs),
+                    "avg_satisfaction_score": total_satisfaction / rated_programs if rated_programs else 0
                 },
                 "categorized": categorized,
                 "all_programs": programs
             }
             
         except Exception as e:
-            logger.error(f"Error retrieving wellness programs: {str(e)}")
+            logger.error("Error retrieving wellness programs: %s", e)
             return {"error": f"Could not retrieve wellness programs: {str(e)}"}
     
+    @_dashboard_cache
     def get_department_leave_rates(self) -> Dict[str, Any]:
         """
         Get anonymized leave rates by department.
         
+        Reads the latest_department_stats collection kept by
+        rebuild_latest_department_stats in a single query, falling back to one
+        query per department when it has not been built yet or is older than
+        the newest month in department_stats.
+        
         Returns:
             Dict with department leave rates
         """
         try:
-            collection = self.db.collection("department_stats")
-            
-            # Get the latest month stats for each department
-            departments = ["Engineering", "Marketing", "Operations", "Sales", "HR", "Finance"]
+            latest_stats = {doc.id: doc.to_dict() for doc in self.db.collection("latest_department_stats").get()}
+            newest_month = self._newest_department_stats_month()
+            if not latest_stats or max(data.get("month", "") for data in latest_stats.values()) < newest_month:
+                latest_stats = self._query_latest_department_stats()
             
-            # Get current date
-            now = datetime.datetime.now()
-            current_month = now.strftime("%Y-%m")
-            
-            # Fetch latest data for each department
             leave_rates = {}
-            for dept in departments:
-                # Query for latest month available
-                query = collection.where("department", "==", dept).order_by("date", direction=firestore.Query.DESCENDING).limit(1)
-                results = query.get()
-                
-                if results:
-                    doc = next(iter(results))
-                    data = doc.to_dict()
-                    leave_rates[dept] = {
-                        "leave_rate": data.get("metrics", {}).get("leave_rate", 0),
-                        "avg_leave_days": data.get("metrics", {}).get("avg_leave_days", 0),
-                        "month": data.get("month", "Unknown")
-                    }
+            for dept, data in latest_stats.items():
+                leave_rates[dept] = {
+                    "leave_rate": data.get("metrics", {}).get("leave_rate", 0),
+                    "avg_leave_days": data.get("metrics", {}).get("avg_leave_days", 0),
+                    "month": data.get("month", "Unknown")
+                }
             
             # Sort departments by leave rate (highest to lowest)
             sorted_depts = sorted(leave_rates.keys(), key=lambda x: leave_rates[x]["leave_rate"], reverse=True)
@@ -366,5 +556,58 @@ class FirestoreService:
             }
             
         except Exception as e:
-            logger.error(f"Error retrieving department leave rates: {str(e)}")
-            return {"error": f"Could not retrieve department leave rates: {str(e)}"} 
\ No newline at end of file
+            logger.error("Error retrieving department leave rates: %s", e)
+            return {"error": f"Could not retrieve department leave rates: {str(e)}"} 
+    
+    def rebuild_latest_department_stats(self) -> int:
+        """
+        Rebuild the latest_department_stats collection.
+        
+        Copies each department's most recent department_stats document to a
+        document named after the department, so get_department_leave_rates
+        needs one query instead of one per department. Run it whenever new
+        monthly department stats are loaded.
+        
+        Returns:
+            Number of departments written
+        """
+        latest_stats = self._query_latest_department_stats()
+        
+        collection = self.db.collection("latest_department_stats")
+        batch = self.db.batch()
+        for dept, data in latest_stats.items():
+            batch.set(collection.document(dept), data)
+        batch.commit()
+        
+        FirestoreService.get_department_leave_rates.cache_clear()
+        logger.info("Rebuilt latest department stats for %d departments", len(latest_stats))
+        return len(latest_stats)
+    
+    def _newest_department_stats_month(self) -> str:
+        """Get the newest month ("YYYY-MM") in department_stats, or "" if it is empty."""
+        query = self.db.collection("department_stats").order_by(
+            "month", direction=firestore.Query.DESCENDING
+        ).limit(1).select(["month"])
+        for doc in query.get():
+            return _field(doc, "month", "")
+        return ""
+    
+    def _query_latest_department_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Query the most recent department_stats document of each department.
+        
+        Returns:
+            Dict mapping each department with data to its latest stats document
+        """
+        collection = self.db.collection("department_stats")
+        
+        latest_stats = {}
+        for dept in _DEPARTMENTS:
+            # Query for latest month available
+            query = collection.where("department", "==", dept).order_by("date", direction=firestore.Query.DESCENDING).limit(1)
+            results = query.get()
+            
+            if results:
+                latest_stats[dept] = next(iter(results)).to_dict()
+        
+        return latest_stats
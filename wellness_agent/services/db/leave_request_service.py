@@ -1,13 +1,24 @@
 """Leave request service for the Wellness Agent."""
 
+import atexit
+import logging
 import os
-import uuid
+import secrets
+import threading
 import json
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Union
-from google.cloud import firestore
+from typing import List, Dict, Any, Optional, Set, Union
 
 from wellness_agent.db.models.leave_request import LeaveRequest
+from wellness_agent.services.db._firestore_client import get_client
+
+logger = logging.getLogger(__name__)
+
+# Firestore rejects batches with more than 500 writes
+_MAX_BATCH_WRITES = 500
+
+# Statuses of requests that are still pending or upcoming
+_ACTIVE_STATUSES = ("pending", "approved")
 
 
 class LeaveRequestService:
@@ -18,16 +29,24 @@ class LeaveRequestService:
     Firestore as the backend database.
     """
     
+    # Mock database shared by all instances; loaded on first use and written
+    # back to disk by flush_mock_db
+    _mock_cache: Optional[Dict[str, Any]] = None
+    _mock_dirty = False
+    # Request IDs by employee ID, kept in step with _mock_cache
+    _employee_index: Dict[str, Set[str]] = {}
+    _mock_lock = threading.RLock()
+    
     def __init__(self):
         """Initialize the leave request service with a Firestore client."""
         self.use_mock = os.getenv("USE_MOCK_SERVICES", "false").lower() == "true"
         
         if not self.use_mock:
             try:
-                self.db = firestore.Client()
+                self.db = get_client()
                 self.collection = self.db.collection('leave_requests')
-            except Exception as e:
-                print(f"Error initializing Firestore client, falling back to mock: {e}")
+            except Exception:
+                logger.exception("Error initializing Firestore client, falling back to mock")
                 self.use_mock = True
     
     def create_leave_request(
@@ -63,29 +82,21 @@ class LeaveRequestService:
                 work_impact_notes=work_impact_notes
             )
             
-        # Generate a unique request ID
-        today = datetime.now().strftime("%Y%m%d")
-        request_id = f"LR-{today}-{uuid.uuid4().hex[:6].upper()}"
-        
-        # Create the leave request object
-        leave_request = LeaveRequest(
-            request_id=request_id,
+        leave_request = self._build_leave_request(
             employee_id=employee_id,
             request_type=request_type,
             start_date=start_date,
             end_date=end_date,
             disclosure_level=disclosure_level,
-            work_impact_notes=work_impact_notes,
-            status="pending",
-            submitted_at=datetime.now().isoformat()
+            work_impact_notes=work_impact_notes
         )
         
         # Save to Firestore
         try:
-            self.collection.document(request_id).set(leave_request.to_dict())
+            self.collection.document(leave_request.request_id).set(leave_request.to_dict())
             return leave_request
-        except Exception as e:
-            print(f"Error creating leave request: {e}")
+        except Exception:
+            logger.exception("Error creating leave request")
             # Fall back to mock implementation
             return self._mock_create_leave_request(
                 employee_id=employee_id,
@@ -112,10 +123,10 @@ class LeaveRequestService:
         try:
             doc = self.collection.document(request_id).get()
             if doc.exists:
-                return LeaveRequest.from_dict(doc.to_dict())
+                return LeaveRequest.from_firestore_snapshot(doc)
             return None
-        except Exception as e:
-            print(f"Error retrieving leave request: {e}")
+        except Exception:
+            logger.exception("Error retrieving leave request")
             # Fall back to mock implementation
             return self._mock_get_leave_request(request_id)
     
@@ -141,16 +152,17 @@ class LeaveRequestService:
             )
             
         try:
+            # Both filters run in Firestore using the (employee_id, status) index
             query = self.collection.where('employee_id', '==', employee_id)
             
             if not include_completed:
-                query = query.where('status', 'in', ['pending', 'approved'])
+                query = query.where('status', 'in', list(_ACTIVE_STATUSES))
                 
             docs = query.stream()
             
-            return [LeaveRequest.from_dict(doc.to_dict()) for doc in docs]
-        except Exception as e:
-            print(f"Error retrieving leave requests: {e}")
+            return [LeaveRequest.from_firestore_snapshot(doc) for doc in docs]
+        except Exception:
+            logger.exception("Error retrieving leave requests")
             # Fall back to mock implementation
             return self._mock_get_leave_requests_by_employee(
                 employee_id=employee_id,
@@ -198,8 +210,8 @@ class LeaveRequestService:
                 
             self.collection.document(request_id).update(updates)
             return True
-        except Exception as e:
-            print(f"Error updating leave request status: {e}")
+        except Exception:
+            logger.exception("Error updating leave request status")
             # Fall back to mock implementation
             return self._mock_update_leave_request_status(
                 request_id=request_id,
@@ -224,14 +236,46 @@ class LeaveRequestService:
         try:
             self.collection.document(request_id).delete()
             return True
-        except Exception as e:
-            print(f"Error deleting leave request: {e}")
+        except Exception:
+            logger.exception("Error deleting leave request")
             # Fall back to mock implementation
             return self._mock_delete_leave_request(request_id)
     
-    # Mock implementations for local testing without Firestore
-    def _mock_create_leave_request(
+    def create_leave_requests_bulk(
         self,
+        leave_requests: List[Dict[str, Any]]
+    ) -> List[LeaveRequest]:
+        """
+        Create several leave requests with batched writes.
+        
+        Args:
+            leave_requests: One dictionary per request holding the keyword
+                arguments accepted by create_leave_request
+            
+        Returns:
+            The created LeaveRequest objects, in request order
+        """
+        if self.use_mock:
+            return [self._mock_create_leave_request(**request) for request in leave_requests]
+            
+        created = [self._build_leave_request(**request) for request in leave_requests]
+        
+        try:
+            for start in range(0, len(created), _MAX_BATCH_WRITES):
+                batch = self.db.batch()
+                for leave_request in created[start:start + _MAX_BATCH_WRITES]:
+                    batch.set(self.collection.document(leave_request.request_id), leave_request.to_dict())
+                batch.commit()
+            return created
+        except Exception:
+            logger.exception("Error creating leave requests")
+            # Fall back to mock implementation
+            for leave_request in created:
+                self._save_to_mock_db(leave_request)
+            return created
+    
+    @staticmethod
+    def _build_leave_request(
         employee_id: str,
         request_type: str,
         start_date: str,
@@ -239,13 +283,14 @@ class LeaveRequestService:
         disclosure_level: str = "no_reason",
         work_impact_notes: Optional[str] = None
     ) -> LeaveRequest:
-        """Mock implementation for local testing."""
+        """Build a new pending leave request with a fresh ID."""
+        now = datetime.now()
+        
         # Generate a unique request ID
-        today = datetime.now().strftime("%Y%m%d")
-        request_id = f"LR-{today}-{uuid.uuid4().hex[:6].upper()}"
+        request_id = f"LR-{now:%Y%m%d}-{secrets.randbits(24):06X}"
         
         # Create the leave request object
-        leave_request = LeaveRequest(
+        return LeaveRequest(
             request_id=request_id,
             employee_id=employee_id,
             request_type=request_type,
@@ -254,7 +299,27 @@ class LeaveRequestService:
             disclosure_level=disclosure_level,
             work_impact_notes=work_impact_notes,
             status="pending",
-            submitted_at=datetime.now().isoformat()
+            submitted_at=now.isoformat()
+        )
+    
+    # Mock implementations for local testing without Firestore
+    def _mock_create_leave_request(
+        self,
+        employee_id: str,
+        request_type: str,
+        start_date: str,
+        end_date: Optional[str] = None,
+        disclosure_level: str = "no_reason",
+        work_impact_notes: Optional[str] = None
+    ) -> LeaveRequest:
+        """Mock implementation for local testing."""
+        leave_request = self._build_leave_request(
+            employee_id=employee_id,
+            request_type=request_type,
+            start_date=start_date,
+            end_date=end_date,
+            disclosure_level=disclosure_level,
+            work_impact_notes=work_impact_notes
         )
         
         # Save to local JSON file for testing
@@ -263,10 +328,11 @@ class LeaveRequestService:
     
     def _mock_get_leave_request(self, request_id: str) -> Optional[LeaveRequest]:
         """Mock implementation to get a leave request."""
-        mock_data = self._load_from_mock_db()
-        if request_id in mock_data:
-            return LeaveRequest.from_dict(mock_data[request_id])
-        return None
+        with self._mock_lock:
+            mock_data = self._load_from_mock_db()
+            if request_id in mock_data:
+                return LeaveRequest.from_dict(mock_data[request_id])
+            return None
     
     def _mock_get_leave_requests_by_employee(
         self, 
@@ -274,23 +340,20 @@ class LeaveRequestService:
         include_completed: bool = False
     ) -> List[LeaveRequest]:
         """Mock implementation to get leave requests by employee."""
-        mock_data = self._load_from_mock_db()
+        with self._mock_lock:
+            mock_data = self._load_from_mock_db()
+            
+            # Look up the employee's requests in the index, oldest first
+            requests = sorted(
+                (mock_data[request_id] for request_id in self._employee_index.get(employee_id, ())),
+                key=lambda data: data.get('submitted_at') or ''
+            )
         
-        # Filter by employee ID
-        filtered_data = [
-            LeaveRequest.from_dict(data) 
-            for data in mock_data.values() 
-            if data.get('employee_id') == employee_id
+        return [
+            LeaveRequest.from_dict(data)
+            for data in requests
+            if include_completed or data.get('status', 'pending') in _ACTIVE_STATUSES
         ]
-        
-        # Filter by status if needed
-        if not include_completed:
-            filtered_data = [
-                request for request in filtered_data 
-                if request.status in ['pending', 'approved']
-            ]
-            
-        return filtered_data
     
     def _mock_update_leave_request_status(
         self, 
@@ -300,61 +363,102 @@ class LeaveRequestService:
         notes: Optional[str] = None
     ) -> bool:
         """Mock implementation to update leave request status."""
-        mock_data = self._load_from_mock_db()
-        
-        if request_id not in mock_data:
-            return False
-            
-        # Update the request
-        request_data = mock_data[request_id]
-        request_data['status'] = status
-        request_data['processed_at'] = datetime.now().isoformat()
-        
-        if processed_by:
-            request_data['processed_by'] = processed_by
+        with self._mock_lock:
+            mock_data = self._load_from_mock_db()
             
-        if notes:
-            request_data['notes'] = notes
+            if request_id not in mock_data:
+                return False
+                
+            # Update the request
+            request_data = mock_data[request_id]
+            request_data['status'] = status
+            request_data['processed_at'] = datetime.now().isoformat()
             
-        # Save back to file
-        mock_data[request_id] = request_data
-        with open(self._get_mock_db_path(), 'w') as f:
-            json.dump(mock_data, f, indent=2)
+            if processed_by:
+                request_data['processed_by'] = processed_by
+                
+            if notes:
+                request_data['notes'] = notes
+                
+            type(self)._mock_dirty = True
             
         return True
     
     def _mock_delete_leave_request(self, request_id: str) -> bool:
         """Mock implementation to delete a leave request."""
-        mock_data = self._load_from_mock_db()
-        
-        if request_id not in mock_data:
-            return False
+        with self._mock_lock:
+            mock_data = self._load_from_mock_db()
             
-        # Delete the request
-        del mock_data[request_id]
-        
-        # Save back to file
-        with open(self._get_mock_db_path(), 'w') as f:
-            json.dump(mock_data, f, indent=2)
+            if request_id not in mock_data:
+                return False
+                
+            # Delete the request
+            self._unindex_mock_request(request_id, mock_data.pop(request_id))
+            type(self)._mock_dirty = True
             
         return True
     
     def _save_to_mock_db(self, leave_request: LeaveRequest) -> None:
-        """Save to a local JSON file for mock testing."""
-        mock_db_path = self._get_mock_db_path()
-        
-        # Load existing data
-        existing_data = self._load_from_mock_db()
-        
-        # Add or update the leave request
-        existing_data[leave_request.request_id] = leave_request.to_dict()
+        """Add or update a leave request in the in-memory mock database."""
+        with self._mock_lock:
+            mock_data = self._load_from_mock_db()
+            
+            previous = mock_data.get(leave_request.request_id)
+            if previous is not None:
+                self._unindex_mock_request(leave_request.request_id, previous)
+            
+            mock_data[leave_request.request_id] = leave_request.to_dict()
+            self._index_mock_request(leave_request.request_id, mock_data[leave_request.request_id])
+            type(self)._mock_dirty = True
+    
+    def flush_mock_db(self) -> None:
+        """
+        Write the in-memory mock database to disk if it has changed.
         
-        # Save back to file
-        with open(mock_db_path, 'w') as f:
-            json.dump(existing_data, f, indent=2)
+        Mock writes only update memory; this runs automatically at exit and
+        can be called earlier when another process needs to read the file.
+        """
+        cls = type(self)
+        with self._mock_lock:
+            if cls._mock_cache is None or not cls._mock_dirty:
+                return
+            
+            mock_db_path = self._get_mock_db_path()
+            os.makedirs(os.path.dirname(mock_db_path), exist_ok=True)
+            with open(mock_db_path, 'w') as f:
+                json.dump(cls._mock_cache, f, indent=2)
+            cls._mock_dirty = False
     
     def _load_from_mock_db(self) -> Dict[str, Any]:
-        """Load data from the mock database."""
+        """
+        Load data from the mock database.
+        
+        The JSON file is read once per process; later calls return the shared
+        in-memory dictionary.
+        """
+        cls = type(self)
+        if cls._mock_cache is None:
+            with self._mock_lock:
+                # Another thread may have loaded it while we waited
+                if cls._mock_cache is None:
+                    mock_data = self._read_mock_db()
+                    cls._employee_index = {}
+                    for request_id, request_data in mock_data.items():
+                        self._index_mock_request(request_id, request_data)
+                    cls._mock_cache = mock_data
+                    atexit.register(self.flush_mock_db)
+        return cls._mock_cache
+    
+    def _index_mock_request(self, request_id: str, request_data: Dict[str, Any]) -> None:
+        """Add a mock leave request to the employee index."""
+        self._employee_index.setdefault(request_data.get('employee_id'), set()).add(request_id)
+    
+    def _unindex_mock_request(self, request_id: str, request_data: Dict[str, Any]) -> None:
+        """Remove a mock leave request from the employee index."""
+        self._employee_index.get(request_data.get('employee_id'), set()).discard(request_id)
+    
+    def _read_mock_db(self) -> Dict[str, Any]:
+        """Read the mock database file."""
         mock_db_path = self._get_mock_db_path()
         
         if not os.path.exists(mock_db_path):
@@ -363,13 +467,12 @@ class LeaveRequestService:
         try:
             with open(mock_db_path, 'r') as f:
                 return json.load(f)
-        except Exception as e:
-            print(f"Error loading mock database: {e}")
+        except Exception:
+            logger.exception("Error loading mock database")
             return {}
     
     def _get_mock_db_path(self) -> str:
         """Get the path to the mock database file."""
         mock_db_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'mock_db')
-        os.makedirs(mock_db_dir, exist_ok=True)
         
-        return os.path.join(mock_db_dir, 'leave_requests.json') 
\ No newline at end of file
+        return os.path.join(mock_db_dir, 'leave_requests.json')
@@ -1,12 +1,14 @@
 """Memory database service for the Wellness Agent."""
 
+import copy
 import os
 import json
+import threading
 import uuid
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
-
-from google.cloud import firestore
+from typing import Dict, Iterator, List, Optional, Any, Set, Union
 
 from wellness_agent.db.models import (
     User,
@@ -15,7 +17,35 @@ from wellness_agent.db.models import (
     WellnessTip,
     LeaveRequest
 )
+from wellness_agent.services.db._firestore_client import get_client
+from wellness_agent.shared_libraries.cache import TTLCache
+
+# Firestore rejects batches with more than 500 writes
+_MAX_BATCH_WRITES = 500
+
+# Firestore accepts at most 30 values in an array_contains_any filter
+_MAX_ARRAY_CONTAINS_ANY = 30
+
+# Seconds session state updates are collected before they are written, so a
+# burst of interactions results in one write per session
+_SESSION_WRITE_DELAY = 0.5
 
+# Collection and ID attribute of each entity type saved by MemoryService
+_ENTITY_COLLECTIONS = {
+    User: ("users", "user_id"),
+    Session: ("sessions", "session_id"),
+    SymptomsLog: ("symptom_logs", "log_id"),
+    WellnessTip: ("wellness_tips", "tip_id")
+}
+
+def _user_id_active(user_id: str, is_active: bool) -> str:
+    """
+    Build the user_id_active value stored on session documents.
+    
+    Combining both fields lets active sessions be queried with a single
+    equality filter, which needs no composite index.
+    """
+    return f"{user_id}:{is_active}"
 
 class MemoryService:
     """
@@ -26,13 +56,57 @@ class MemoryService:
     It supports both Firestore and a mock implementation.
     """
     
+    # Shared instances created by instance(), one per class
+    _instances: Dict[type, "MemoryService"] = {}
+    _instances_lock = threading.Lock()
+    
+    # Firestore documents read by get_user, get_session and get_wellness_tip,
+    # by collection and document ID. Saves made through this service drop the
+    # cached copy; sessions change often, so they are only kept briefly.
+    _read_caches = {
+        "users": TTLCache(maxsize=10_000, ttl=60),
+        "sessions": TTLCache(maxsize=10_000, ttl=5),
+        "wellness_tips": TTLCache(maxsize=10_000, ttl=60)
+    }
+    
+    @classmethod
+    def instance(cls) -> "MemoryService":
+        """
+        Get the process-wide instance of this service class.
+        
+        Creating the service sets up its client or seeds the mock store, so
+        callers share one instance instead of building their own. Each
+        subclass (e.g. RedisMemoryService) gets its own instance.
+        
+        Returns:
+            The shared service instance
+        """
+        instance = cls._instances.get(cls)
+        if instance is None:
+            with cls._instances_lock:
+                # Another thread may have created it while we waited
+                instance = cls._instances.get(cls)
+                if instance is None:
+                    instance = cls._instances[cls] = cls()
+        return instance
+    
     def __init__(self):
         """Initialize the memory service."""
         self.use_mock = os.getenv("USE_MOCK_SERVICES", "false").lower() == "true"
         
+        # Session states passed to sync_state_to_database that are not yet
+        # written, by session ID, and the timer that writes them
+        self._pending_session_states: Dict[str, Dict[str, Any]] = {}
+        self._session_flush_timer: Optional[threading.Timer] = None
+        self._session_write_lock = threading.Lock()
+        # Held while writing sessions, so an older state never overwrites a
+        # newer one; reentrant, since a flush saves through bulk_save
+        self._session_flush_lock = threading.RLock()
+        self._flushing_session_states = False
+        
         if not self.use_mock:
             # Initialize Firestore client
-            self.db = firestore.Client()
+            self.db = get_client()
         else:
             # Initialize mock storage
             self.mock_data = {
@@ -61,6 +135,13 @@ class MemoryService:
             "wellness_tips": {}
         }
         
+        # Secondary indexes over the mock sessions and symptom logs, kept up to
+        # date by bulk_save. Each user's log IDs are sorted by timestamp, with
+        # the timestamps in a parallel list for bisecting date ranges.
+        self._sessions_by_user: Dict[str, Set[str]] = defaultdict(set)
+        self._logs_by_user: Dict[str, List[str]] = defaultdict(list)
+        self._log_times_by_user: Dict[str, List[datetime]] = defaultdict(list)
+        
         try:
             # Create a demo user for the default employee role
             demo_employee = User(
@@ -94,16 +175,15 @@ class MemoryService:
             self.mock_data["users"][demo_hr_manager.user_id] = demo_hr_manager.to_dict()
             self.mock_data["users"][demo_employer.user_id] = demo_employer.to_dict()
             
-            # Create a sample session (as a dictionary, not as a Session object)
+            # Create a sample session
             sample_session = Session(
                 session_id=str(uuid.uuid4()),
                 user_id=demo_employee.user_id,
                 user_role=demo_employee.role,
                 is_active=True
             )
-            self.mock_data["sessions"][sample_session.session_id] = sample_session.to_dict()
             
-            # Create a sample symptom log (as a dictionary)
+            # Create a sample symptom log
             sample_log = SymptomsLog(
                 log_id=str(uuid.uuid4()),
                 user_id=demo_employee.user_id,
@@ -114,7 +194,9 @@ class MemoryService:
                 stress_level=3,
                 privacy_level="standard"
             )
-            self.mock_data["symptom_logs"][sample_log.log_id] = sample_log.to_dict()
+            
+            # Store them like saved ones, so they are indexed
+            self.bulk_save([sample_session, sample_log])
         except Exception as e:
             print(f"Error initializing mock data: {str(e)}")
     
@@ -123,6 +205,8 @@ class MemoryService:
         """
         Get a user by ID.
         
+        Firestore reads are cached for a minute.
+        
         Args:
             user_id: The ID of the user to retrieve
             
@@ -130,12 +214,26 @@ class MemoryService:
             The user if found, None otherwise
         """
         if self.use_mock:
-            user_dict = self.mock_data["users"].get(user_id)
+            return self._get_mock_entity("users", User, user_id)
+        else:
+            user_dict = self._get_document("users", user_id)
             return User.from_dict(user_dict) if user_dict else None
+    
+    def get_users(self, user_ids: List[str]) -> List[User]:
+        """
+        Get several users by ID in a single round trip.
+        
+        Args:
+            user_ids: The IDs of the users to retrieve
+            
+        Returns:
+            The users that exist, in request order
+        """
+        if self.use_mock:
+            users = [self._get_mock_entity("users", User, user_id) for user_id in user_ids]
+            return [user for user in users if user]
         else:
-            doc_ref = self.db.collection("users").document(user_id)
-            doc = doc_ref.get()
-            return User.from_dict(doc.to_dict()) if doc.exists else None
+            return [User.from_dict(user_dict) for user_dict in self._get_documents("users", user_ids)]
     
     def save_user(self, user: User) -> bool:
         """
@@ -147,24 +245,16 @@ class MemoryService:
         Returns:
             True if successful, False otherwise
         """
-        user_dict = user.to_dict()
-        
-        try:
-            if self.use_mock:
-                self.mock_data["users"][user.user_id] = user
-                return True
-            else:
-                self.db.collection("users").document(user.user_id).set(user_dict)
-                return True
-        except Exception as e:
-            print(f"Error saving user: {str(e)}")
-            return False
+        return self.bulk_save([user])
     
     # Session methods
     def get_session(self, session_id: str) -> Optional[Session]:
         """
         Get a session by ID.
         
+        Firestore reads are cached for five seconds. A state passed to
+        sync_state_to_database is returned even before it is written.
+        
         Args:
             session_id: The ID of the session to retrieve
             
@@ -172,16 +262,36 @@ class MemoryService:
             The session if found, None otherwise
         """
         if self.use_mock:
-            session = self.mock_data["sessions"].get(session_id)
-            # Check if the object is already a Session instance
-            if isinstance(session, Session):
-                return session
-            # Otherwise convert from dictionary
-            return Session.from_dict(session) if session else None
+            return self._get_mock_entity("sessions", Session, session_id)
+        else:
+            session_dict = self._get_document("sessions", session_id)
+            session = Session.from_dict(session_dict) if session_dict else None
+            
+            pending_state = self._pending_session_states.get(session_id)
+            if session and pending_state is not None:
+                session.state = dict(pending_state)
+            return session
+    
+    def get_sessions(self, session_ids: List[str]) -> List[Session]:
+        """
+        Get several sessions by ID in a single round trip.
+        
+        Args:
+            session_ids: The IDs of the sessions to retrieve
+            
+        Returns:
+            The sessions that exist, in request order
+        """
+        if self.use_mock:
+            sessions = [self._get_mock_entity("sessions", Session, session_id) for session_id in session_ids]
+            return [session for session in sessions if session]
         else:
-            doc_ref = self.db.collection("sessions").document(session_id)
-            doc = doc_ref.get()
-            return Session.from_dict(doc.to_dict()) if doc.exists else None
+            sessions = [Session.from_dict(session_dict) for session_dict in self._get_documents("sessions", session_ids)]
+            for session in sessions:
+                pending_state = self._pending_session_states.get(session.session_id)
+                if pending_state is not None:
+                    session.state = dict(pending_state)
+            return sessions
     
     def save_session(self, session: Session) -> bool:
         """
@@ -190,21 +300,53 @@ class MemoryService:
         Args:
             session: The session to save
             
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.bulk_save([session])
+    
+    def append_session_messages(self, session: Session, messages: List[Dict[str, Any]]) -> bool:
+        """
+        Persist new messages of a session whose other fields are unchanged.
+        
+        Only the new messages and timestamps are written, instead of the
+        whole session document.
+        
+        Args:
+            session: The session the messages were added to
+            messages: The messages added since the session was last saved
+            
         Returns:
             True if successful, False otherwise
         """
         try:
             if self.use_mock:
-                # Store the session object directly
+                # The mock store holds the session object itself
+                self._index_mock_entity(session)
                 self.mock_data["sessions"][session.session_id] = session
                 return True
             else:
-                # Convert to dictionary for Firestore
-                session_dict = session.to_dict()
-                self.db.collection("sessions").document(session.session_id).set(session_dict)
+                update = {
+                    "updated_at": session.updated_at.isoformat(),
+                    "last_interaction_time": session.last_interaction_time.isoformat()
+                }
+                if messages:
+                    from google.cloud import firestore
+                    update["conversation_history"] = firestore.ArrayUnion(messages)
+                
+                reference = self.db.collection("sessions").document(session.session_id)
+                if self._has_pending_session_states([session.session_id]):
+                    with self._session_flush_lock:
+                        # The session supersedes a state queued for it, so write its state instead
+                        if self._discard_pending_session_states([session.session_id]):
+                            update["state"] = session.state
+                        reference.update(update)
+                else:
+                    reference.update(update)
+                self._uncache_document("sessions", session.session_id)
                 return True
         except Exception as e:
-            print(f"Error saving session: {str(e)}")
+            print(f"Error saving session messages: {str(e)}")
             return False
     
     def get_user_sessions(self, user_id: str, active_only: bool = True) -> List[Session]:
@@ -220,22 +362,16 @@ class MemoryService:
         """
         if self.use_mock:
             sessions = []
-            for session_id, session in self.mock_data["sessions"].items():
-                # Check if it's already a Session object
-                if isinstance(session, Session):
-                    if session.user_id == user_id:
-                        if not active_only or session.is_active:
-                            sessions.append(session)
-                else:
-                    # It's a dictionary
-                    if session.get('user_id') == user_id:
-                        if not active_only or session.get('is_active', True):
-                            sessions.append(Session.from_dict(session))
+            for session_id in self._sessions_by_user.get(user_id, ()):
+                session = self.mock_data["sessions"][session_id]
+                if not active_only or session.is_active:
+                    sessions.append(session)
             return sessions
         else:
-            query = self.db.collection("sessions").where("user_id", "==", user_id)
             if active_only:
-                query = query.where("is_active", "==", True)
+                query = self.db.collection("sessions").where("user_id_active", "==", _user_id_active(user_id, True))
+            else:
+                query = self.db.collection("sessions").where("user_id", "==", user_id)
             
             sessions = []
             for doc in query.stream():
@@ -253,70 +389,277 @@ class MemoryService:
         Returns:
             True if successful, False otherwise
         """
-        log_dict = log.to_dict()
-        
-        try:
-            if self.use_mock:
-                self.mock_data["symptom_logs"][log.log_id] = log
-                return True
-            else:
-                self.db.collection("symptom_logs").document(log.log_id).set(log_dict)
-                return True
-        except Exception as e:
-            print(f"Error saving symptom log: {str(e)}")
-            return False
+        return self.bulk_save([log])
     
     def get_user_symptom_logs(
         self, 
         user_id: str, 
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        limit: int = 100
-    ) -> List[SymptomsLog]:
+        limit: int = 100,
+        anonymized: bool = False,
+        as_dicts: bool = False,
+        after_log_id: Optional[str] = None
+    ) -> Union[List[SymptomsLog], List[Dict[str, Any]]]:
         """
-        Get symptom logs for a user.
+        Get symptom logs for a user, newest first.
         
         Args:
             user_id: The ID of the user
             start_date: Optional start date filter
             end_date: Optional end date filter
             limit: Maximum number of logs to return
+            anonymized: Whether to return anonymized logs; identifying
+                fields are then never read from the database
+            as_dicts: Whether to return the logs as dictionaries in
+                to_dict() form rather than SymptomsLog objects
+            after_log_id: ID of the last log of the previous page; only
+                older logs are returned
             
         Returns:
             A list of symptom logs for the user
         """
+        if as_dicts:
+            return list(self.iter_user_symptom_logs(
+                user_id, start_date, end_date, limit, anonymized, after_log_id
+            ))
+        
         if self.use_mock:
-            logs = []
-            for log in self.mock_data["symptom_logs"].values():
-                if log.user_id == user_id:
-                    if start_date and log.timestamp < start_date:
-                        continue
-                    if end_date and log.timestamp > end_date:
-                        continue
-                    logs.append(log)
-                    if len(logs) >= limit:
-                        break
-            return logs
+            return [
+                log.anonymize() if anonymized else log
+                for log in self._mock_user_symptom_logs(user_id, start_date, end_date, limit, after_log_id)
+            ]
         else:
-            query = self.db.collection("symptom_logs").where("user_id", "==", user_id)
-            
-            if start_date:
-                query = query.where("timestamp", ">=", start_date.isoformat())
-            if end_date:
-                query = query.where("timestamp", "<=", end_date.isoformat())
-            
-            query = query.limit(limit)
+            if anonymized:
+                return [
+                    SymptomsLog.from_anonymized_dict(log_dict)
+                    for log_dict in self._stream_symptom_logs(
+                        user_id, start_date, end_date, limit, after_log_id, SymptomsLog.ANONYMIZED_FIELDS
+                    )
+                ]
             
             logs = []
-            for doc in query.stream():
-                logs.append(SymptomsLog.from_dict(doc.to_dict()))
+            for log_dict in self._stream_symptom_logs(user_id, start_date, end_date, limit, after_log_id):
+                logs.append(SymptomsLog.from_dict(log_dict))
             return logs
     
+    def iter_user_symptom_logs(
+        self,
+        user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        anonymized: bool = False,
+        after_log_id: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over a user's symptom logs as dictionaries in to_dict() form.
+        
+        Logs are read lazily, newest first, so callers can stream them without
+        holding the whole result in memory.
+        
+        Args:
+            user_id: The ID of the user
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            limit: Maximum number of logs to return
+            anonymized: Whether to return anonymized logs; identifying
+                fields are then never read from the database
+            after_log_id: ID of the last log of the previous page; only
+                older logs are returned
+            
+        Yields:
+            One dictionary per symptom log
+        """
+        if self.use_mock:
+            for log in self._mock_user_symptom_logs(user_id, start_date, end_date, limit, after_log_id):
+                log_dict = log.to_dict()
+                yield SymptomsLog.anonymize_dict(log_dict) if anonymized else log_dict
+        else:
+            fields = SymptomsLog.ANONYMIZED_FIELDS if anonymized else None
+            for log_dict in self._stream_symptom_logs(user_id, start_date, end_date, limit, after_log_id, fields):
+                # Timestamps are stored natively; to_dict() form uses ISO strings
+                if isinstance(log_dict.get("timestamp"), datetime):
+                    log_dict["timestamp"] = log_dict["timestamp"].isoformat()
+                yield SymptomsLog.anonymize_dict(log_dict) if anonymized else log_dict
+    
+    def _get_document(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a Firestore document through the collection's read cache.
+        
+        Returns a copy of the document data, so callers may modify it (the
+        models' from_dict does), or None if the document does not exist.
+        """
+        cache = self._read_caches[collection]
+        data = cache.get(doc_id)
+        if data is None:
+            doc = self.db.collection(collection).document(doc_id).get()
+            if not doc.exists:
+                return None
+            data = doc.to_dict()
+            cache.set(doc_id, data)
+        return copy.deepcopy(data)
+    
+    def _get_documents(self, collection: str, doc_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Read several Firestore documents through the collection's read cache.
+        
+        Documents missing from the cache are fetched with a single get_all
+        call. Returns copies of the data of the documents that exist, in
+        request order.
+        """
+        cache = self._read_caches[collection]
+        found = {}
+        missing = []
+        for doc_id in doc_ids:
+            data = cache.get(doc_id)
+            if data is None:
+                missing.append(doc_id)
+            else:
+                found[doc_id] = data
+        
+        if missing:
+            refs = [self.db.collection(collection).document(doc_id) for doc_id in missing]
+            for doc in self.db.get_all(refs):
+                if doc.exists:
+                    found[doc.id] = doc.to_dict()
+                    cache.set(doc.id, found[doc.id])
+        
+        return [copy.deepcopy(found[doc_id]) for doc_id in doc_ids if doc_id in found]
+    
+    def _uncache_document(self, collection: str, doc_id: str) -> None:
+        """Drop a document that was just written from its read cache."""
+        cache = self._read_caches.get(collection)
+        if cache is not None:
+            cache.pop(doc_id)
+    
+    def _get_mock_entity(self, collection: str, model: type, doc_id: str) -> Any:
+        """
+        Get an entity from the mock store.
+        
+        Saved entities are stored as objects; entries stored as dictionaries
+        are converted to the model.
+        """
+        entity = self.mock_data[collection].get(doc_id)
+        if entity is None or isinstance(entity, model):
+            return entity
+        return model.from_dict(entity)
+    
+    def _mock_user_symptom_logs(
+        self,
+        user_id: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: int,
+        after_log_id: Optional[str] = None
+    ) -> List[SymptomsLog]:
+        """Look up a user's mock symptom logs in a date range, newest first."""
+        log_ids = self._logs_by_user.get(user_id, [])
+        log_times = self._log_times_by_user.get(user_id, [])
+        
+        start = bisect_left(log_times, start_date) if start_date else 0
+        end = bisect_right(log_times, end_date) if end_date else len(log_times)
+        if after_log_id in log_ids:
+            end = min(end, log_ids.index(after_log_id))
+        start = max(start, end - limit)
+        
+        return [self.mock_data["symptom_logs"][log_id] for log_id in reversed(log_ids[start:end])]
+    
+    def _index_mock_entity(self, entity: Union[User, Session, SymptomsLog, WellnessTip]) -> None:
+        """Add a saved mock session or symptom log to the per-user indexes."""
+        if isinstance(entity, Session):
+            self._sessions_by_user[entity.user_id].add(entity.session_id)
+        elif isinstance(entity, SymptomsLog):
+            # Drop the entry of a previous version of the log
+            previous = self.mock_data["symptom_logs"].get(entity.log_id)
+            if previous is not None:
+                position = self._logs_by_user[previous.user_id].index(entity.log_id)
+                del self._logs_by_user[previous.user_id][position]
+                del self._log_times_by_user[previous.user_id][position]
+            
+            log_ids = self._logs_by_user[entity.user_id]
+            log_times = self._log_times_by_user[entity.user_id]
+            position = bisect_right(log_times, entity.timestamp)
+            log_ids.insert(position, entity.log_id)
+            log_times.insert(position, entity.timestamp)
+    
+    def _stream_symptom_logs(
+        self,
+        user_id: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: int,
+        after_log_id: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the data of a user's Firestore symptom logs, newest first.
+        
+        Pages continue from the snapshot of after_log_id with a start_after
+        cursor, so earlier pages are not read again.
+        
+        Timestamps are stored as native Firestore timestamps, so datetimes
+        compare in time order whatever their timezone. Logs saved before that
+        keep ISO string timestamps until backfill_symptom_log_timestamps has
+        run; range filters only match values of their own type, and those
+        logs are older than any native one, so they are read afterwards with
+        string bounds.
+        """
+        collection = self.db.collection("symptom_logs")
+        cursor = collection.document(after_log_id).get() if after_log_id else None
+        if cursor is not None and not cursor.exists:
+            cursor = None
+        
+        queries = []
+        if cursor is None or not isinstance(cursor.get("timestamp"), str):
+            queries.append(self._symptom_logs_query(
+                collection, user_id, start_date or datetime.min, end_date, cursor
+            ))
+            cursor = None
+        queries.append(self._symptom_logs_query(
+            collection, user_id,
+            start_date.isoformat() if start_date else "",
+            end_date.isoformat() if end_date else None,
+            cursor
+        ))
+        
+        remaining = limit
+        for query in queries:
+            if remaining <= 0:
+                return
+            if fields:
+                query = query.select(fields)
+            for doc in query.limit(remaining).stream():
+                remaining -= 1
+                yield doc.to_dict()
+    
+    def _symptom_logs_query(
+        self,
+        collection: Any,
+        user_id: str,
+        lower: Union[datetime, str],
+        upper: Optional[Union[datetime, str]],
+        cursor: Any = None
+    ) -> Any:
+        """Build the query for a user's symptom logs in a timestamp range, newest first."""
+        from google.cloud import firestore
+        
+        query = collection.where("user_id", "==", user_id).where("timestamp", ">=", lower)
+        if upper is not None:
+            query = query.where("timestamp", "<=", upper)
+        
+        query = query.order_by("timestamp", direction=firestore.Query.DESCENDING)
+        if cursor is not None:
+            query = query.start_after(cursor)
+        return query
+    
     # Wellness Tip methods
     def get_wellness_tip(self, tip_id: str) -> Optional[WellnessTip]:
         """
         Get a wellness tip by ID.
         
+        Firestore reads are cached for a minute.
+        
         Args:
             tip_id: The ID of the tip to retrieve
             
@@ -324,12 +667,26 @@ class MemoryService:
             The wellness tip if found, None otherwise
         """
         if self.use_mock:
-            tip_dict = self.mock_data["wellness_tips"].get(tip_id)
+            return self._get_mock_entity("wellness_tips", WellnessTip, tip_id)
+        else:
+            tip_dict = self._get_document("wellness_tips", tip_id)
             return WellnessTip.from_dict(tip_dict) if tip_dict else None
+    
+    def get_wellness_tips(self, tip_ids: List[str]) -> List[WellnessTip]:
+        """
+        Get several wellness tips by ID in a single round trip.
+        
+        Args:
+            tip_ids: The IDs of the tips to retrieve
+            
+        Returns:
+            The wellness tips that exist, in request order
+        """
+        if self.use_mock:
+            tips = [self._get_mock_entity("wellness_tips", WellnessTip, tip_id) for tip_id in tip_ids]
+            return [tip for tip in tips if tip]
         else:
-            doc_ref = self.db.collection("wellness_tips").document(tip_id)
-            doc = doc_ref.get()
-            return WellnessTip.from_dict(doc.to_dict()) if doc.exists else None
+            return [WellnessTip.from_dict(tip_dict) for tip_dict in self._get_documents("wellness_tips", tip_ids)]
     
     def get_wellness_tips_by_category(
         self, 
@@ -364,19 +721,22 @@ class MemoryService:
                     break
             return tips
         else:
-            # Firestore doesn't support OR queries across fields directly
-            # For simplicity, we'll query by the first category and filter in code
-            query = self.db.collection("wellness_tips").where("categories", "array_contains", categories[0])
-            query = query.limit(limit * 2)  # Fetch extra to allow for filtering
+            if not categories:
+                return []
+            
+            # Match any of the categories in Firestore (which takes up to 30
+            # values). Only one array_contains_any filter is allowed per query,
+            # so symptom tags are checked here while streaming.
+            query = self.db.collection("wellness_tips").where(
+                "categories", "array_contains_any", categories[:_MAX_ARRAY_CONTAINS_ANY]
+            )
+            if not symptom_tags:
+                query = query.limit(limit)
             
             tips = []
             for doc in query.stream():
                 tip = WellnessTip.from_dict(doc.to_dict())
                 
-                # Check if any category matches
-                if not any(category in tip.categories for category in categories):
-                    continue
-                
                 # Check symptom tags if provided
                 if symptom_tags and not any(tag in tip.symptom_tags for tag in symptom_tags):
                     continue
@@ -397,19 +757,119 @@ class MemoryService:
         Returns:
             True if successful, False otherwise
         """
-        tip_dict = tip.to_dict()
+        return self.bulk_save([tip])
+    
+    def bulk_save(self, entities: List[Union[User, Session, SymptomsLog, WellnessTip]]) -> bool:
+        """
+        Save several users, sessions, symptom logs or wellness tips at once.
         
+        The entities may be of mixed types. In Firestore they are written with
+        batched writes, one round trip per 500 entities.
+        
+        Args:
+            entities: The entities to save
+            
+        Returns:
+            True if successful, False otherwise
+        """
         try:
             if self.use_mock:
-                self.mock_data["wellness_tips"][tip.tip_id] = tip
+                for entity in entities:
+                    collection, id_attr = _ENTITY_COLLECTIONS[type(entity)]
+                    self._index_mock_entity(entity)
+                    # Store the object directly
+                    self.mock_data[collection][getattr(entity, id_attr)] = entity
                 return True
             else:
-                self.db.collection("wellness_tips").document(tip.tip_id).set(tip_dict)
+                session_ids = [entity.session_id for entity in entities if isinstance(entity, Session)]
+                if session_ids and self._has_pending_session_states(session_ids):
+                    # Saved sessions supersede the states queued for them
+                    with self._session_flush_lock:
+                        self._discard_pending_session_states(session_ids)
+                        self._write_entities(entities)
+                else:
+                    self._write_entities(entities)
                 return True
         except Exception as e:
-            print(f"Error saving wellness tip: {str(e)}")
+            print(f"Error saving entities: {str(e)}")
             return False
     
+    def _write_entities(self, entities: List[Union[User, Session, SymptomsLog, WellnessTip]]) -> None:
+        """Write entities to Firestore in batches and drop their cached copies."""
+        for start in range(0, len(entities), _MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            written = []
+            for entity in entities[start:start + _MAX_BATCH_WRITES]:
+                collection, id_attr = _ENTITY_COLLECTIONS[type(entity)]
+                data = entity.to_dict()
+                if isinstance(entity, Session):
+                    data["user_id_active"] = _user_id_active(entity.user_id, entity.is_active)
+                elif isinstance(entity, SymptomsLog):
+                    # Store a native timestamp so date ranges order correctly
+                    data["timestamp"] = entity.timestamp
+                batch.set(self.db.collection(collection).document(getattr(entity, id_attr)), data)
+                written.append((collection, getattr(entity, id_attr)))
+            batch.commit()
+            
+            for collection, doc_id in written:
+                self._uncache_document(collection, doc_id)
+    
+    def backfill_session_user_id_active(self) -> int:
+        """
+        Add user_id_active to sessions saved without it.
+        
+        Run once after upgrading: active session lookups query on
+        user_id_active, which older versions did not store, so their active
+        sessions are not listed until it has run.
+        
+        Returns:
+            Number of sessions updated
+        """
+        if self.use_mock:
+            return 0
+        
+        updates = []
+        for doc in self.db.collection("sessions").select(["user_id", "is_active", "user_id_active"]).stream():
+            data = doc.to_dict()
+            if "user_id_active" not in data and "user_id" in data:
+                updates.append((doc.reference, _user_id_active(data["user_id"], data.get("is_active", True))))
+        
+        for start in range(0, len(updates), _MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for reference, user_id_active in updates[start:start + _MAX_BATCH_WRITES]:
+                batch.update(reference, {"user_id_active": user_id_active})
+            batch.commit()
+        
+        return len(updates)
+    
+    def backfill_symptom_log_timestamps(self) -> int:
+        """
+        Convert symptom log timestamps stored as ISO strings to timestamps.
+        
+        Run once after upgrading: symptom log queries filter and order on
+        native timestamps, so logs with string timestamps are left out. New
+        logs store native timestamps when they are saved.
+        
+        Returns:
+            Number of symptom logs updated
+        """
+        if self.use_mock:
+            return 0
+        
+        updates = []
+        for doc in self.db.collection("symptom_logs").select(["timestamp"]).stream():
+            timestamp = doc.to_dict().get("timestamp")
+            if isinstance(timestamp, str):
+                updates.append((doc.reference, datetime.fromisoformat(timestamp)))
+        
+        for start in range(0, len(updates), _MAX_BATCH_WRITES):
+            batch = self.db.batch()
+            for reference, timestamp in updates[start:start + _MAX_BATCH_WRITES]:
+                batch.update(reference, {"timestamp": timestamp})
+            batch.commit()
+        
+        return len(updates)
+    
     # Helper methods
     def create_new_session(self, user_id: str, user_role: str) -> Session:
         """
@@ -442,12 +902,14 @@ class MemoryService:
         
         return session
     
-    def create_symptom_log_from_state(self, state: Dict[str, Any]) -> Optional[SymptomsLog]:
+    def create_symptom_log_from_state(self, state: Dict[str, Any], save: bool = True) -> Optional[SymptomsLog]:
         """
         Create a symptom log from the current session state.
         
         Args:
             state: The current session state
+            save: Whether to save the log; pass False to save it later together
+                with other entities via bulk_save
             
         Returns:
             A new symptom log instance, or None if required data is missing
@@ -489,7 +951,8 @@ class MemoryService:
         log.location = state.get("location")
         
         # Save the log
-        self.save_symptom_log(log)
+        if save:
+            self.save_symptom_log(log)
         
         return log
     
@@ -497,29 +960,126 @@ class MemoryService:
         """
         Synchronize the current session state to the database.
         
+        With Firestore the write happens in the background: get_session
+        returns the new state right away, and the states of all sessions
+        updated within _SESSION_WRITE_DELAY seconds are written together in
+        one batch, keeping only the latest state of each session. Use
+        sync_states_to_database to write immediately. Saving the session
+        directly replaces its queued state.
+        
         Args:
             state: The current session state
             
         Returns:
-            True if successful, False otherwise
+            True if the state was saved or queued, False otherwise
         """
         session_id = state.get("session_id")
-        if not session_id:
+        if self.use_mock or not session_id:
+            return self.sync_states_to_database([state])
+        
+        with self._session_write_lock:
+            # Copy the state, since callers keep modifying their dictionary
+            self._pending_session_states[session_id] = dict(state)
+            if self._session_flush_timer is None:
+                self._session_flush_timer = threading.Timer(_SESSION_WRITE_DELAY, self.flush_session_states)
+                self._session_flush_timer.start()
+        return True
+    
+    def flush_session_states(self) -> bool:
+        """
+        Write the session states queued by sync_state_to_database now.
+        
+        Returns:
+            True if every queued state was written, False otherwise
+        """
+        with self._session_flush_lock:
+            with self._session_write_lock:
+                timer, self._session_flush_timer = self._session_flush_timer, None
+                states = dict(self._pending_session_states)
+            if timer is not None:
+                timer.cancel()
+            if not states:
+                return True
+            
+            self._flushing_session_states = True
+            try:
+                saved = self.sync_states_to_database(list(states.values()))
+            finally:
+                self._flushing_session_states = False
+            
+            # Keep states that were replaced while writing; they are queued again
+            with self._session_write_lock:
+                for session_id, state in states.items():
+                    if self._pending_session_states.get(session_id) is state:
+                        del self._pending_session_states[session_id]
+            return saved
+    
+    def _has_pending_session_states(self, session_ids: List[str]) -> bool:
+        """
+        Check whether a state is queued for any of the sessions.
+        
+        Saves only take _session_flush_lock when one is, so saves of sessions
+        without queued states still run concurrently.
+        """
+        with self._session_write_lock:
+            return any(session_id in self._pending_session_states for session_id in session_ids)
+    
+    def _discard_pending_session_states(self, session_ids: List[str]) -> bool:
+        """
+        Drop the queued states of sessions that are being saved directly.
+        
+        Must be called with _session_flush_lock held. During a flush nothing
+        is dropped, since states queued while it writes are newer than the
+        ones it saves.
+        
+        Returns:
+            True if a queued state was dropped, False otherwise
+        """
+        if self._flushing_session_states:
             return False
         
+        with self._session_write_lock:
+            dropped = [self._pending_session_states.pop(session_id, None) for session_id in session_ids]
+        return any(state is not None for state in dropped)
+    
+    def sync_states_to_database(self, states: List[Dict[str, Any]]) -> bool:
+        """
+        Synchronize several session states to the database in one batch.
+        
+        Args:
+            states: The session states, each with its session_id
+            
+        Returns:
+            True if every state was synchronized, False otherwise
+        """
         try:
-            # Get the current session
-            session = self.get_session(session_id)
-            if not session:
-                return False
+            # Read all the sessions at once
+            session_ids = [state.get("session_id") for state in states]
+            sessions = {
+                session.session_id: session
+                for session in self.get_sessions([session_id for session_id in session_ids if session_id])
+            }
+            
+            now = datetime.now()
+            updated = {}
+            synced = 0
+            for session_id, state in zip(session_ids, states):
+                session = sessions.get(session_id)
+                if not session:
+                    continue
+                
+                # Update the session state
+                session.state = state
+                session.updated_at = now
+                session.last_interaction_time = now
+                updated[session_id] = session
+                synced += 1
             
-            # Update the session state
-            session.state = state
-            session.updated_at = datetime.now()
-            session.last_interaction_time = datetime.now()
+            if not updated:
+                return False
             
-            # Save the updated session
-            return self.save_session(session)
+            # Save the updated sessions
+            return self.bulk_save(list(updated.values())) and synced == len(states)
         except Exception as e:
             print(f"Error syncing state to database: {str(e)}")
             return False 
\ No newline at end of file
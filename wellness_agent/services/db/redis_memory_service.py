@@ -0,0 +1,155 @@
+"""Redis-backed session storage for the Wellness Agent."""
+
+import os
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from wellness_agent.db.models import Session
+from wellness_agent.services.db.memory_service import MemoryService
+
+
+class RedisMemoryService(MemoryService):
+    """
+    Memory service that keeps sessions in Redis.
+    
+    Sessions are shared between server workers and survive worker restarts,
+    and expire after SESSION_EXPIRY_HOURS. Users, symptom logs and wellness
+    tips are still handled by the base MemoryService (Firestore or mock).
+    """
+    
+    SESSION_KEY = "session:{}"
+    USER_SESSIONS_KEY = "user_sessions:{}"
+    
+    def __init__(self, redis_url: Optional[str] = None):
+        """
+        Initialize the Redis memory service.
+        
+        Args:
+            redis_url: Redis connection URL, defaults to the REDIS_URL environment variable
+        """
+        import redis
+        
+        self.redis = redis.Redis.from_url(redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        self.session_ttl = int(float(os.getenv("SESSION_EXPIRY_HOURS", "24")) * 3600)
+        
+        # Set up Redis first: seeding the mock store saves the sample session here
+        super().__init__()
+    
+    def get_session(self, session_id: str) -> Optional[Session]:
+        """
+        Get a session by ID.
+        
+        Args:
+            session_id: The ID of the session to retrieve
+            
+        Returns:
+            The session if found, None otherwise
+        """
+        data = self.redis.get(self.SESSION_KEY.format(session_id))
+        return Session.from_dict(orjson.loads(data)) if data else None
+    
+    def get_sessions(self, session_ids: List[str]) -> List[Session]:
+        """
+        Get several sessions by ID with a single MGET.
+        
+        Args:
+            session_ids: The IDs of the sessions to retrieve
+            
+        Returns:
+            The sessions that exist, in request order
+        """
+        if not session_ids:
+            return []
+        values = self.redis.mget([self.SESSION_KEY.format(session_id) for session_id in session_ids])
+        return [Session.from_dict(orjson.loads(data)) for data in values if data is not None]
+    
+    def save_session(self, session: Session) -> bool:
+        """
+        Save a session to Redis, refreshing its expiry.
+        
+        Args:
+            session: The session to save
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            data = orjson.dumps(session.to_dict(), option=orjson.OPT_NON_STR_KEYS)
+            user_key = self.USER_SESSIONS_KEY.format(session.user_id)
+            
+            pipe = self.redis.pipeline()
+            pipe.set(self.SESSION_KEY.format(session.session_id), data, ex=self.session_ttl)
+            pipe.sadd(user_key, session.session_id)
+            pipe.expire(user_key, self.session_ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"Error saving session: {str(e)}")
+            return False
+    
+    def bulk_save(self, entities: List[Any]) -> bool:
+        """
+        Save several entities, keeping sessions in Redis.
+        
+        Sessions are written with save_session; everything else goes through
+        the base MemoryService.
+        """
+        sessions = [entity for entity in entities if isinstance(entity, Session)]
+        others = [entity for entity in entities if not isinstance(entity, Session)]
+        
+        saved = all([self.save_session(session) for session in sessions])
+        if others and not super().bulk_save(others):
+            return False
+        return saved
+    
+    def append_session_messages(self, session: Session, messages: List[Dict[str, Any]]) -> bool:
+        """
+        Persist new messages of a session.
+        
+        Sessions are stored as a single Redis value, so the whole session is
+        rewritten.
+        """
+        return self.save_session(session)
+    
+    def sync_state_to_database(self, state: Dict[str, Any]) -> bool:
+        """
+        Synchronize the current session state to Redis.
+        
+        Redis writes are fast and other workers read the same sessions, so
+        the state is written immediately instead of being queued.
+        """
+        return self.sync_states_to_database([state])
+    
+    def get_user_sessions(self, user_id: str, active_only: bool = True) -> List[Session]:
+        """
+        Get all sessions for a user.
+        
+        Args:
+            user_id: The ID of the user
+            active_only: Whether to only return active sessions
+            
+        Returns:
+            A list of sessions for the user
+        """
+        user_key = self.USER_SESSIONS_KEY.format(user_id)
+        session_ids = [session_id.decode() for session_id in self.redis.smembers(user_key)]
+        if not session_ids:
+            return []
+        
+        sessions = []
+        expired_ids = []
+        values = self.redis.mget([self.SESSION_KEY.format(session_id) for session_id in session_ids])
+        for session_id, data in zip(session_ids, values):
+            if data is None:
+                expired_ids.append(session_id)
+                continue
+            session = Session.from_dict(orjson.loads(data))
+            if not active_only or session.is_active:
+                sessions.append(session)
+        
+        # Drop index entries for sessions that have expired
+        if expired_ids:
+            self.redis.srem(user_key, *expired_ids)
+        
+        return sessions
@@ -27,29 +27,29 @@ class StorageService:
             
             self.storage_client = storage.Client()
             self.bucket_name = bucket_name
-            logger.info(f"Initializing Storage Service with bucket: {bucket_name}")
+            logger.info("Initializing Storage Service with bucket: %s", bucket_name)
             
             # Check if the bucket exists
             try:
                 self.bucket = self.storage_client.bucket(bucket_name)
                 if not self.bucket.exists():
-                    logger.warning(f"Bucket {bucket_name} does not exist. Will attempt to create it.")
+                    logger.warning("Bucket %s does not exist. Will attempt to create it.", bucket_name)
                     self.bucket = self.storage_client.create_bucket(bucket_name)
-                    logger.info(f"Created bucket {bucket_name}")
+                    logger.info("Created bucket %s", bucket_name)
             except Exception as e:
-                logger.error(f"Error accessing bucket {bucket_name}: {str(e)}")
+                logger.error("Error accessing bucket %s: %s", bucket_name, e)
                 # Use default fallback behavior
                 self.bucket = self.storage_client.bucket(bucket_name)
                 
             # Store the credentials path for potential refreshing
             self.credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
             if self.credentials_path:
-                logger.info(f"Using credentials from: {self.credentials_path}")
+                logger.info("Using credentials from: %s", self.credentials_path)
             else:
                 logger.warning("GOOGLE_APPLICATION_CREDENTIALS environment variable not set")
                 
         except Exception as e:
-            logger.error(f"Error initializing StorageService: {str(e)}")
+            logger.error("Error initializing StorageService: %s", e)
             # Keep a reference to avoid attribute errors, but operations will fail
             self.storage_client = None
             self.bucket_name = bucket_name
@@ -106,7 +106,7 @@ class StorageService:
             }
             
         except Exception as e:
-            logger.error(f"Error listing resources: {str(e)}")
+            logger.error("Error listing resources: %s", e)
             return {"error": f"Could not list resources: {str(e)}"}
     
     def generate_signed_url(self, blob_name: str, expiration_minutes: int = 60) -> Dict[str, Any]:
@@ -129,17 +129,17 @@ class StorageService:
             try:
                 self.storage_client = storage.Client()
                 self.bucket = self.storage_client.bucket(self.bucket_name)
-                logger.info(f"Storage client refreshed before generating signed URL")
+                logger.info("Storage client refreshed before generating signed URL")
             except Exception as e:
-                logger.warning(f"Failed to refresh storage client: {str(e)}")
+                logger.warning("Failed to refresh storage client: %s", e)
                 # Continue with existing client
                 
             blob = self.bucket.blob(blob_name)
-            logger.info(f"Generating signed URL for resource: {blob_name}")
+            logger.info("Generating signed URL for resource: %s", blob_name)
             
             # First check if the blob exists
             if not blob.exists():
-                logger.warning(f"Resource not found: {blob_name}")
+                logger.warning("Resource not found: %s", blob_name)
                 return {
                     "error": f"Resource not found: {blob_name}",
                     "suggestion": "Check if the file exists in your Cloud Storage bucket or create it"
@@ -154,7 +154,7 @@ class StorageService:
                     method="GET",
                     credentials=self.storage_client._credentials
                 )
-                logger.info(f"Generated signed URL for {blob_name}, valid for {expiration_minutes} minutes")
+                logger.info("Generated signed URL for %s, valid for %s minutes", blob_name, expiration_minutes)
                 
                 # Determine the content type for the response
                 content_type = "application/octet-stream"  # Default
@@ -177,14 +177,14 @@ class StorageService:
                     "file_name": blob_name.split('/')[-1]  # Extract filename from path
                 }
             except Exception as e:
-                logger.error(f"Error generating signed URL for {blob_name}: {str(e)}")
+                logger.error("Error generating signed URL for %s: %s", blob_name, e)
                 return {
                     "error": f"Could not generate signed URL: {str(e)}",
                     "suggestion": "Check your Google Cloud permissions and service account configuration"
                 }
                 
         except Exception as e:
-            logger.error(f"Error generating signed URL for {blob_name}: {str(e)}")
+            logger.error("Error generating signed URL for %s: %s", blob_name, e)
             return {
                 "error": f"Could not generate signed URL: {str(e)}",
                 "resource": blob_name,
@@ -207,11 +207,11 @@ class StorageService:
                 return {"error": "Storage service not properly initialized", "suggestion": "Check your Cloud Storage configuration"}
                 
             blob = self.bucket.blob(blob_name)
-            logger.info(f"Attempting to retrieve resource: {blob_name}")
+            logger.info("Attempting to retrieve resource: %s", blob_name)
             
             # First check if the blob exists
             if not blob.exists():
-                logger.warning(f"Resource not found: {blob_name}")
+                logger.warning("Resource not found: %s", blob_name)
                 return {
                     "error": f"Resource not found: {blob_name}",
                     "suggestion": "Check if the file exists in your Cloud Storage bucket or create it"
@@ -222,18 +222,18 @@ class StorageService:
                 blob.reload()
                 content_type = blob.content_type
                 size = blob.size
-                logger.info(f"Resource exists: {blob_name}, Type: {content_type}, Size: {size} bytes")
+                logger.info("Resource exists: %s, Type: %s, Size: %s bytes", blob_name, content_type, size)
             except Exception as e:
-                logger.warning(f"Could not get metadata for {blob_name}: {str(e)}")
+                logger.warning("Could not get metadata for %s: %s", blob_name, e)
                 content_type = "unknown"
                 size = "unknown"
             
             # Download as text
             try:
                 content = blob.download_as_text()
-                logger.info(f"Successfully downloaded content for {blob_name}")
+                logger.info("Successfully downloaded content for %s", blob_name)
             except Exception as e:
-                logger.error(f"Error downloading content for {blob_name}: {str(e)}")
+                logger.error("Error downloading content for %s: %s", blob_name, e)
                 return {
                     "error": f"Could not download resource content: {str(e)}",
                     "suggestion": "Check file permissions and file type"
@@ -269,7 +269,7 @@ class StorageService:
                         result["expires_in_minutes"] = signed_url_info["expires_in_minutes"]
                     return result
                 except json.JSONDecodeError as json_error:
-                    logger.error(f"Invalid JSON in {blob_name}: {str(json_error)}")
+                    logger.error("Invalid JSON in %s: %s", blob_name, json_error)
                     return {
                         "error": f"Invalid JSON in {blob_name}: {str(json_error)}",
                         "content_preview": content[:100] + "..." if len(content) > 100 else content,
@@ -291,7 +291,7 @@ class StorageService:
                         result["expires_in_minutes"] = signed_url_info["expires_in_minutes"]
                     return result
                 except Exception as csv_error:
-                    logger.error(f"Error parsing CSV in {blob_name}: {str(csv_error)}")
+                    logger.error("Error parsing CSV in %s: %s", blob_name, csv_error)
                     return {
                         "error": f"Error parsing CSV: {str(csv_error)}",
                         "content_preview": content[:100] + "..." if len(content) > 100 else content,
@@ -310,7 +310,7 @@ class StorageService:
                 return result
                 
         except Exception as e:
-            logger.error(f"Error retrieving resource {blob_name}: {str(e)}")
+            logger.error("Error retrieving resource %s: %s", blob_name, e)
             return {
                 "error": f"Could not retrieve resource: {str(e)}",
                 "resource": blob_name,
@@ -333,14 +333,14 @@ class StorageService:
                 return {"error": "Storage service not properly initialized", "suggestion": "Check your Cloud Storage configuration"}
                 
             policies_prefix = "policy_documents/"
-            logger.info(f"Looking for policy document with type: {policy_type}")
+            logger.info("Looking for policy document with type: %s", policy_type)
             
             # Try to list blobs to see if we have access
             try:
                 blobs = list(self.bucket.list_blobs(prefix=policies_prefix, max_results=10))
-                logger.info(f"Found {len(blobs)} policy document blobs")
+                logger.info("Found %s policy document blobs", len(blobs))
             except Exception as e:
-                logger.error(f"Error listing policy documents: {str(e)}")
+                logger.error("Error listing policy documents: %s", e)
                 return {"error": f"Could not access policy documents: {str(e)}", "suggestion": "Check your Google Cloud credentials and permissions"}
                 
             # Normalize policy type for searching
@@ -358,7 +358,7 @@ class StorageService:
                 # Check if policy type appears in the filename
                 if policy_type_lower in blob_name:
                     target_file = blob.name
-                    logger.info(f"Found direct policy match: {target_file}")
+                    logger.info("Found direct policy match: %s", target_file)
                     break
             
             # Try common policy synonyms if no direct match
@@ -388,7 +388,7 @@ class StorageService:
                         for term in search_terms:
                             if term in blob_name:
                                 target_file = blob.name
-                                logger.info(f"Found policy match via synonym {term}: {target_file}")
+                                logger.info("Found policy match via synonym %s: %s", term, target_file)
                                 break
                         
                         if target_file:
@@ -396,7 +396,7 @@ class StorageService:
             
             # If we found a matching file, get its content
             if target_file:
-                logger.info(f"Retrieving content for policy document: {target_file}")
+                logger.info("Retrieving content for policy document: %s", target_file)
                 result = self.get_resource_content(target_file)
                 # Add the file path to the result
                 result["file_path"] = target_file
@@ -408,7 +408,7 @@ class StorageService:
                     for blob in blobs 
                     if not blob.name.endswith('.keep') and blob.name != policies_prefix
                 ]
-                logger.warning(f"No policy document found for '{policy_type}'. Available policies: {available_policies}")
+                logger.warning("No policy document found for '%s'. Available policies: %s", policy_type, available_policies)
                 
                 return {
                     "message": f"No policy document found for '{policy_type}'",
@@ -417,7 +417,7 @@ class StorageService:
                 }
                 
         except Exception as e:
-            logger.error(f"Error finding policy document: {str(e)}")
+            logger.error("Error finding policy document: %s", e)
             return {"error": f"Could not find policy document: {str(e)}", 
                     "suggestion": "Check the logs for more details and ensure your Cloud Storage bucket is properly configured."}
     
@@ -437,14 +437,14 @@ class StorageService:
                 return {"error": "Storage service not properly initialized", "suggestion": "Check your Cloud Storage configuration"}
                 
             guides_prefix = "wellness_guides/"
-            logger.info(f"Looking for wellness guide with type: {guide_type}")
+            logger.info("Looking for wellness guide with type: %s", guide_type)
             
             # Try to list blobs to see if we have access
             try:
                 blobs = list(self.bucket.list_blobs(prefix=guides_prefix, max_results=10))
-                logger.info(f"Found {len(blobs)} wellness guide blobs")
+                logger.info("Found %s wellness guide blobs", len(blobs))
             except Exception as e:
-                logger.error(f"Error listing wellness guides: {str(e)}")
+                logger.error("Error listing wellness guides: %s", e)
                 return {"error": f"Could not access wellness guides: {str(e)}", "suggestion": "Check your Google Cloud credentials and permissions"}
                 
             # Look for guides that match the requested type
@@ -464,7 +464,7 @@ class StorageService:
             
             if direct_matches:
                 target_file = direct_matches[0]
-                logger.info(f"Found direct directory match: {target_file}")
+                logger.info("Found direct directory match: %s", target_file)
             
             # If no direct directory match, try to find a file with the guide type in its name
             if not target_file:
@@ -479,7 +479,7 @@ class StorageService:
                     # Prioritize filenames that explicitly mention guides
                     if guide_type_lower in blob_name and "guide" in blob_name:
                         target_file = blob.name
-                        logger.info(f"Found guide with type in filename: {target_file}")
+                        logger.info("Found guide with type in filename: %s", target_file)
                         break
             
             # If no guide with guide_type in name, try a more general approach
@@ -492,14 +492,14 @@ class StorageService:
                         for part in path_parts:
                             if part in blob_name and len(part) >= 4:  # Avoid matching too short terms
                                 target_file = blob.name
-                                logger.info(f"Found guide with partial match: {target_file}")
+                                logger.info("Found guide with partial match: %s", target_file)
                                 break
                         if target_file:
                             break
             
             # If we found a matching file, get its content
             if target_file:
-                logger.info(f"Retrieving content for wellness guide: {target_file}")
+                logger.info("Retrieving content for wellness guide: %s", target_file)
                 result = self.get_resource_content(target_file)
                 # Add the file path to the result
                 result["file_path"] = target_file
@@ -510,7 +510,7 @@ class StorageService:
                     generic_stress_guide = guides_prefix + "mental_health/stress_management_guide.md"
                     blob = self.bucket.blob(generic_stress_guide)
                     if blob.exists():
-                        logger.info(f"No specific guide found, using generic stress guide: {generic_stress_guide}")
+                        logger.info("No specific guide found, using generic stress guide: %s", generic_stress_guide)
                         result = self.get_resource_content(generic_stress_guide)
                         result["file_path"] = generic_stress_guide
                         return result
@@ -519,7 +519,7 @@ class StorageService:
                     generic_mental_guide = guides_prefix + "mental_health/mental_health_guide.md"
                     blob = self.bucket.blob(generic_mental_guide)
                     if blob.exists():
-                        logger.info(f"No specific guide found, using generic mental health guide: {generic_mental_guide}")
+                        logger.info("No specific guide found, using generic mental health guide: %s", generic_mental_guide)
                         result = self.get_resource_content(generic_mental_guide)
                         result["file_path"] = generic_mental_guide
                         return result
@@ -530,7 +530,7 @@ class StorageService:
                     for blob in blobs 
                     if not blob.name.endswith('.keep') and blob.name != guides_prefix
                 ]
-                logger.warning(f"No wellness guide found for '{guide_type}'. Available guides: {available_guides}")
+                logger.warning("No wellness guide found for '%s'. Available guides: %s", guide_type, available_guides)
                 
                 return {
                     "message": f"No wellness guide found for '{guide_type}'",
@@ -539,7 +539,7 @@ class StorageService:
                 }
                 
         except Exception as e:
-            logger.error(f"Error finding wellness guide: {str(e)}")
+            logger.error("Error finding wellness guide: %s", e)
             return {"error": f"Could not find wellness guide: {str(e)}", 
                     "suggestion": "Check the logs for more details and ensure your Cloud Storage bucket is properly configured."}
     
@@ -560,14 +560,14 @@ class StorageService:
                 return {"error": "Storage service not properly initialized", "suggestion": "Check your Cloud Storage configuration"}
                 
             reports_prefix = "aggregated_reports/"
-            logger.info(f"Looking for report with type: {report_type}")
+            logger.info("Looking for report with type: %s", report_type)
             
             # Try to list blobs to see if we have access
             try:
                 blobs = list(self.bucket.list_blobs(prefix=reports_prefix, max_results=10))
-                logger.info(f"Found {len(blobs)} report blobs")
+                logger.info("Found %s report blobs", len(blobs))
             except Exception as e:
-                logger.error(f"Error listing reports: {str(e)}")
+                logger.error("Error listing reports: %s", e)
                 return {"error": f"Could not access reports: {str(e)}", "suggestion": "Check your Google Cloud credentials and permissions"}
                 
             # Normalize report type for searching
@@ -585,7 +585,7 @@ class StorageService:
                 # Check if report type appears in the filename
                 if report_type_lower in blob_name:
                     target_file = blob.name
-                    logger.info(f"Found direct report match: {target_file}")
+                    logger.info("Found direct report match: %s", target_file)
                     break
             
             # If no direct match, try alternative terms
@@ -616,7 +616,7 @@ class StorageService:
                         for term in search_terms:
                             if term in blob_name:
                                 target_file = blob.name
-                                logger.info(f"Found report match via synonym {term}: {target_file}")
+                                logger.info("Found report match via synonym %s: %s", term, target_file)
                                 break
                         
                         if target_file:
@@ -624,7 +624,7 @@ class StorageService:
             
             # If we found a matching file, get its content
             if target_file:
-                logger.info(f"Retrieving content for report: {target_file}")
+                logger.info("Retrieving content for report: %s", target_file)
                 result = self.get_resource_content(target_file)
                 # Add the file path to the result
                 result["file_path"] = target_file
@@ -636,7 +636,7 @@ class StorageService:
                     for blob in blobs 
                     if not blob.name.endswith('.keep') and blob.name != reports_prefix
                 ]
-                logger.warning(f"No report found for '{report_type}'. Available reports: {available_reports}")
+                logger.warning("No report found for '%s'. Available reports: %s", report_type, available_reports)
                 
                 return {
                     "message": f"No report found for '{report_type}'",
@@ -645,6 +645,6 @@ class StorageService:
                 }
                 
         except Exception as e:
-            logger.error(f"Error finding report: {str(e)}")
+            logger.error("Error finding report: %s", e)
             return {"error": f"Could not find report: {str(e)}", 
                     "suggestion": "Check the logs for more details and ensure your Cloud Storage bucket is properly configured."} 
\ No newline at end of file
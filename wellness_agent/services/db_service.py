@@ -10,15 +10,24 @@ from wellness_agent.privacy.anonymizer import Anonymizer
 class DatabaseService:
     """Service to handle all database operations."""
     
-    def __init__(self, project_id: Optional[str] = None):
+    def __init__(
+        self,
+        project_id: Optional[str] = None,
+        firestore_client: Optional[FirestoreClient] = None,
+        bigquery_client: Optional[BigQueryClient] = None,
+        anonymizer: Optional[Anonymizer] = None
+    ):
         """Initialize the database service.
         
         Args:
             project_id: Google Cloud project ID.
+            firestore_client: Optional shared Firestore client instance
+            bigquery_client: Optional shared BigQuery client instance
+            anonymizer: Optional shared anonymizer instance
         """
-        self.firestore = FirestoreClient(project_id)
-        self.bigquery = BigQueryClient(project_id)
-        self.anonymizer = Anonymizer()
+        self.firestore = firestore_client or FirestoreClient(project_id)
+        self.bigquery = bigquery_client or BigQueryClient(project_id)
+        self.anonymizer = anonymizer or Anonymizer()
         
     # ---- User Management ----
     
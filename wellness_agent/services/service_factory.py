@@ -10,6 +10,7 @@ from wellness_agent.services.symptom_service import SymptomService
 from wellness_agent.services.db_service import DatabaseService
 from wellness_agent.services.db.leave_request_service import LeaveRequestService
 from wellness_agent.services.db.accommodation_plan_service import AccommodationPlanService
+from wellness_agent.services.db.memory_service import MemoryService
 
 class ServiceFactory:
     """
@@ -100,6 +101,25 @@ class ServiceFactory:
             })()
         return self._services["symptom_service"]
     
+    def get_memory_service(self) -> MemoryService:
+        """
+        Get or create the MemoryService instance.
+        
+        Uses the Redis-backed session store when REDIS_URL is set, so sessions
+        are shared between server workers; otherwise sessions stay in the
+        default in-process/Firestore MemoryService.
+        
+        Returns:
+            An initialized MemoryService
+        """
+        if "memory_service" not in self._services:
+            if os.getenv("REDIS_URL"):
+                from wellness_agent.services.db.redis_memory_service import RedisMemoryService
+                self._services["memory_service"] = RedisMemoryService.instance()
+            else:
+                self._services["memory_service"] = MemoryService.instance()
+        return self._services["memory_service"]
+    
     def get_database_service(self) -> DatabaseService:
         """Get the database service instance.
         
@@ -107,7 +127,12 @@ class ServiceFactory:
             DatabaseService instance
         """
         if "db_service" not in self._services:
-            self._services["db_service"] = DatabaseService(os.getenv("GOOGLE_CLOUD_PROJECT"))
+            self._services["db_service"] = DatabaseService(
+                os.getenv("GOOGLE_CLOUD_PROJECT"),
+                firestore_client=self.firestore_client,
+                bigquery_client=self.bigquery_client,
+                anonymizer=self.anonymizer
+            )
         return self._services["db_service"]
     
     def reset_services(self):
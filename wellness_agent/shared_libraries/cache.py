@@ -0,0 +1,125 @@
+"""In-process caching helpers for the Wellness Agent."""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A small thread-safe cache whose entries expire after a fixed time.
+    
+    When the cache is full, the least recently written entry is evicted.
+    """
+    
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0, timer: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Time in seconds before an entry expires
+            timer: Clock used for expiry (monotonic seconds by default)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, or the default if it is missing or expired."""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires_at, value = item
+            if expires_at <= self.timer():
+                del self._data[key]
+                return default
+            return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value."""
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (self.timer() + self.ttl, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a cached value and return it."""
+        with self._lock:
+            item = self._data.pop(key, _MISSING)
+            return default if item is _MISSING else item[1]
+    
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._data.clear()
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def ttl_cache(
+    maxsize: int = 128,
+    ttl: float = 300.0,
+    cache_if: Optional[Callable[[Any], bool]] = None
+) -> Callable:
+    """
+    Decorator caching a function's results for a limited time.
+    
+    Results are keyed by the call's arguments, which must be hashable.
+    Concurrent calls with the same arguments wait for the first one rather
+    than all computing the value. Exceptions are not cached.
+    
+    Args:
+        maxsize: Maximum number of cached results
+        ttl: Time in seconds before a result expires
+        cache_if: Optional predicate on a result; results it rejects (such as
+            error responses) are returned but not cached
+        
+    Returns:
+        The decorator; the wrapped function exposes ``cache`` and ``cache_clear()``
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        key_locks: Dict[Hashable, threading.Lock] = {}
+        key_locks_lock = threading.Lock()
+        
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            
+            with key_locks_lock:
+                key_lock = key_locks.setdefault(key, threading.Lock())
+            try:
+                with key_lock:
+                    # Another caller may have filled the cache while we waited
+                    value = cache.get(key, _MISSING)
+                    if value is _MISSING:
+                        value = func(*args, **kwargs)
+                        if cache_if is None or cache_if(value):
+                            cache.set(key, value)
+            finally:
+                # Drop the lock even if func raised, so key_locks cannot grow
+                with key_locks_lock:
+                    key_locks.pop(key, None)
+            return value
+        
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    
+    return decorator
@@ -1,10 +1,11 @@
 """Memory management system for the Wellness Agent."""
 
 from datetime import datetime
-import json
 import os
 from typing import Dict, Any, List, Optional, Union
 
+import orjson
+
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.sessions.state import State
 from google.adk.tools import ToolContext
@@ -159,11 +160,11 @@ def load_user_profile(callback_context: CallbackContext):
     if use_mock:
         # Load from a JSON file for mock mode
         try:
-            with open(profile_path, "r") as file:
-                data = json.load(file)
+            with open(profile_path, "rb") as file:
+                data = orjson.loads(file.read())
                 print(f"\nLoading Initial State for {user_role} from file: {profile_path}\n")
                 _set_initial_states(data, callback_context.state)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+        except (FileNotFoundError, orjson.JSONDecodeError) as e:
             print(f"Error loading profile: {str(e)}")
             # Set minimal default state
             _set_initial_states({"user_profile": {"user_role": user_role}}, callback_context.state)
@@ -11,7 +11,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 use_mock = os.getenv("USE_MOCK_SERVICES", "false").lower() == "true"
-logger.info(f"Initializing data tools with USE_MOCK_SERVICES={use_mock}")
+logger.info("Initializing data tools with USE_MOCK_SERVICES=%s", use_mock)
 
 
 class _MockFirestoreService:
@@ -88,7 +88,7 @@ def get_department_stats(department: Optional[str] = None, months: int = 3) -> D
     Returns:
         Aggregated department metrics with no individual employee data
     """
-    logger.info(f"Getting department stats for {department if department else 'all'} over {months} months")
+    logger.info("Getting department stats for %s over %s months", department or "all", months)
     return firestore_service.get_department_stats(department, months)
 
 def get_leave_trends(department: Optional[str] = None, months: int = 6) -> Dict[str, Any]:
@@ -102,7 +102,7 @@ def get_leave_trends(department: Optional[str] = None, months: int = 6) -> Dict[
     Returns:
         Aggregated leave data with no individual employee information
     """
-    logger.info(f"Getting leave trends for {department if department else 'all'} over {months} months")
+    logger.info("Getting leave trends for %s over %s months", department or "all", months)
     return firestore_service.get_leave_trends(department, months)
 
 def get_health_trends(trend_type: str = "stress_levels", months: int = 6) -> Dict[str, Any]:
@@ -116,7 +116,7 @@ def get_health_trends(trend_type: str = "stress_levels", months: int = 6) -> Dic
     Returns:
         Aggregated health trends with no individual employee information
     """
-    logger.info(f"Getting health trends for {trend_type} over {months} months")
+    logger.info("Getting health trends for %s over %s months", trend_type, months)
     return firestore_service.get_health_trends(trend_type, months)
 
 def get_wellness_programs() -> Dict[str, Any]:
@@ -149,7 +149,7 @@ def get_policy_document(policy_type: str) -> Dict[str, Any]:
     Returns:
         The content of the policy document with a signed URL for file access
     """
-    logger.info(f"Getting policy document for {policy_type}")
+    logger.info("Getting policy document for %s", policy_type)
     # Get the policy document content
     policy_result = storage_service.find_policy_document(policy_type)
     
@@ -163,11 +163,11 @@ def get_policy_document(policy_type: str) -> Dict[str, Any]:
             # Add the URL to the policy result
             policy_result["url"] = url_result["url"]
             policy_result["expires_in_minutes"] = url_result["expires_in_minutes"]
-            logger.info(f"Successfully generated signed URL for policy document: {policy_type}")
+            logger.info("Successfully generated signed URL for policy document: %s", policy_type)
         else:
             # Log the error but still return the policy content
             error_msg = url_result.get("error", "Unknown error generating signed URL")
-            logger.error(f"Failed to generate signed URL for policy {policy_type}: {error_msg}")
+            logger.error("Failed to generate signed URL for policy %s: %s", policy_type, error_msg)
             policy_result["url_error"] = error_msg
     
     return policy_result
@@ -184,7 +184,7 @@ def get_organization_report(report_type: str, filters: Optional[Dict[str, Any]]
         The report data
     """
     filters = filters or {}
-    logger.info(f"Getting organization report for {report_type} with filters {filters}")
+    logger.info("Getting organization report for %s with filters %s", report_type, filters)
     return storage_service.get_report(report_type, filters)
 
 def get_employee_metrics(employee_id: str, metric_type: str) -> Dict[str, Any]:
@@ -198,7 +198,7 @@ def get_employee_metrics(employee_id: str, metric_type: str) -> Dict[str, Any]:
     Returns:
         The employee metrics data
     """
-    logger.info(f"Getting employee metrics for {employee_id} of type {metric_type}")
+    logger.info("Getting employee metrics for %s of type %s", employee_id, metric_type)
     # For now we'll just return a placeholder. In the future, this would query a metrics service.
     return {
         "message": f"Retrieved {metric_type} metrics for employee {employee_id}",
@@ -225,7 +225,7 @@ def get_department_metrics(department_id: str, metric_type: str) -> Dict[str, An
     Returns:
         The department metrics data
     """
-    logger.info(f"Getting department metrics for {department_id} of type {metric_type}")
+    logger.info("Getting department metrics for %s of type %s", department_id, metric_type)
     # For now we'll just return a placeholder. In the future, this would query a metrics service.
     return {
         "message": f"Retrieved {metric_type} metrics for department {department_id}",
@@ -251,7 +251,7 @@ def get_wellness_guide(guide_type: str) -> Dict[str, Any]:
     Returns:
         The content of the wellness guide with a signed URL for file access
     """
-    logger.info(f"Getting wellness guide for {guide_type}")
+    logger.info("Getting wellness guide for %s", guide_type)
     # Get the guide content
     guide_result = storage_service.get_wellness_guide(guide_type)
     
@@ -265,11 +265,11 @@ def get_wellness_guide(guide_type: str) -> Dict[str, Any]:
             # Add the URL to the guide result
             guide_result["url"] = url_result["url"]
             guide_result["expires_in_minutes"] = url_result["expires_in_minutes"]
-            logger.info(f"Successfully generated signed URL for wellness guide: {guide_type}")
+            logger.info("Successfully generated signed URL for wellness guide: %s", guide_type)
         else:
             # Log the error but still return the guide content
             error_msg = url_result.get("error", "Unknown error generating signed URL")
-            logger.error(f"Failed to generate signed URL for wellness guide {guide_type}: {error_msg}")
+            logger.error("Failed to generate signed URL for wellness guide %s: %s", guide_type, error_msg)
             guide_result["url_error"] = error_msg
     
     return guide_result
@@ -284,14 +284,14 @@ def get_file_link(file_path: str) -> Dict[str, Any]:
     Returns:
         Dict containing the signed URL and metadata
     """
-    logger.info(f"Generating link for file: {file_path}")
+    logger.info("Generating link for file: %s", file_path)
     # Use a longer expiration time for more reliability (120 minutes)
     result = storage_service.generate_signed_url(file_path, expiration_minutes=120)
     
     if "error" in result:
-        logger.error(f"Failed to generate file link for {file_path}: {result.get('error')}")
+        logger.error("Failed to generate file link for %s: %s", file_path, result.get('error'))
     else:
-        logger.info(f"Successfully generated signed URL for file: {file_path}")
+        logger.info("Successfully generated signed URL for file: %s", file_path)
         
     return result
 
@@ -305,7 +305,7 @@ def get_wellness_report(report_type: str) -> Dict[str, Any]:
     Returns:
         The content of the report with a signed URL for file access
     """
-    logger.info(f"Getting wellness report for {report_type}")
+    logger.info("Getting wellness report for %s", report_type)
     # Get the report content
     report_result = storage_service.get_report(report_type)
     
@@ -319,11 +319,11 @@ def get_wellness_report(report_type: str) -> Dict[str, Any]:
             # Add the URL to the report result
             report_result["url"] = url_result["url"]
             report_result["expires_in_minutes"] = url_result["expires_in_minutes"]
-            logger.info(f"Successfully generated signed URL for wellness report: {report_type}")
+            logger.info("Successfully generated signed URL for wellness report: %s", report_type)
         else:
             # Log the error but still return the report content
             error_msg = url_result.get("error", "Unknown error generating signed URL")
-            logger.error(f"Failed to generate signed URL for report {report_type}: {error_msg}")
+            logger.error("Failed to generate signed URL for report %s: %s", report_type, error_msg)
             report_result["url_error"] = error_msg
     
     return report_result
@@ -339,7 +339,7 @@ def list_available_resources(resource_type: Optional[str] = None) -> Dict[str, A
         List of available resources
     """
     prefix = f"{resource_type}/" if resource_type else ""
-    logger.info(f"Listing resources with prefix: {prefix}")
+    logger.info("Listing resources with prefix: %s", prefix)
     return storage_service.list_resources(prefix)
 
 # Create function tools